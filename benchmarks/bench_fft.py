@@ -0,0 +1,90 @@
+"""Benchmark the stage vectorized FFT against a per-butterfly FixComplex implementation."""
+
+__author__ = "Samuele FAVAZZA"
+__copyright__ = "Copyright 2018, Samuele FAVAZZA"
+
+import sys
+import timeit
+
+import numpy as np
+
+from pyphix import fix
+from pyphix import dsp
+
+
+def fft_per_butterfly(frame, fft):
+    """Legacy radix-2 FFT: one FixComplex operation per butterfly (``Shift`` scaling).
+
+    :param frame: input frame.
+    :param fft: FFT engine providing the twiddles ROM and the stage fimath.
+
+    :type frame: fix.FixComplex
+    :type fft: dsp.Fft
+
+    :return: transformed frame.
+    :rtype: list[fix.FixComplex]"""
+
+    size, twiddles = fft.size, fft.twiddles
+    half = fix.FixScalar(.5, fix.FixFmt(False, 0, 1), *frame.fimath)
+    data = [frame[int(x)] for x in _bit_reverse(size)]
+    span = 1
+    while span < size:
+        for base in range(0, size, 2 * span):
+            for k in range(span):
+                twiddle = twiddles[k * size // (2 * span)].change_fix(twiddles.fmt, *frame.fimath)
+                prod = data[base + span + k] * twiddle
+                top, bottom = data[base + k] + prod, data[base + k] - prod
+                data[base + k] = (top * half).change_fix(frame.fmt, *frame.fimath)
+                data[base + span + k] = (bottom * half).change_fix(frame.fmt, *frame.fimath)
+        span *= 2
+
+    return data
+
+
+def _bit_reverse(size):
+    """Return the bit reversed order of *size* indexes."""
+
+    perm = np.zeros(1, dtype=np.intp)
+    while len(perm) < size:
+        perm = np.concatenate([perm * 2, perm * 2 + 1])
+
+    return perm
+
+
+def run(size=65536, repeat=3, legacy_size=1024):
+    """Time the per-butterfly and the stage vectorized FFT and print the results.
+
+    The per-butterfly implementation is timed on *legacy_size* points and extrapolated to *size* points
+    (N*log2(N) butterflies).
+
+    :param size: transform size.
+    :param repeat: number of timing repetitions, the best one is reported.
+    :param legacy_size: transform size of the per-butterfly implementation.
+
+    :type size: int
+    :type repeat: int
+    :type legacy_size: int"""
+
+    rand_gen = np.random.RandomState(122)
+    fmt, twiddle_fmt = fix.FixFmt(True, 0, 15), fix.FixFmt(True, 1, 16)
+
+    legacy_frame = fix.FixComplex(rand_gen.uniform(-.7, .7, legacy_size) + 1j * rand_gen.uniform(-.7, .7, legacy_size),
+                                  fmt, 'SymZero', 'Sat')
+    legacy_fft = dsp.Fft(legacy_size, twiddle_fmt, stage_over='Sat')
+    # both implementations must agree
+    assert np.array_equal([x.value[0] for x in fft_per_butterfly(legacy_frame, legacy_fft)],
+                          legacy_fft.process(legacy_frame).value)
+    t_legacy = min(timeit.repeat(lambda: fft_per_butterfly(legacy_frame, legacy_fft), number=1, repeat=1))
+    t_legacy *= (size * np.log2(size)) / (legacy_size * np.log2(legacy_size))
+
+    frame = fix.FixComplex(rand_gen.uniform(-.7, .7, size) + 1j * rand_gen.uniform(-.7, .7, size), fmt, 'SymZero',
+                           'Sat')
+    for radix in [2, 4]:
+        fft = dsp.Fft(size, twiddle_fmt, radix=radix, stage_over='Sat')
+        t_stage = min(timeit.repeat(lambda: fft.process(frame), number=1, repeat=repeat))  # pylint: disable=cell-var-from-loop
+        print("FFT %d points radix-%d: per-butterfly %.1f s (extrapolated), stage vectorized %.4f s (x%.0f)" %
+              (size, radix, t_legacy, t_stage, t_legacy / t_stage))
+
+
+if __name__ == '__main__':
+    run(*[int(x) for x in sys.argv[1:]])
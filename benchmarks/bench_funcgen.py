@@ -0,0 +1,90 @@
+"""Benchmark the vectorized CORDIC engine against a per-sample python integer implementation."""
+
+__author__ = "Samuele FAVAZZA"
+__copyright__ = "Copyright 2018, Samuele FAVAZZA"
+
+import sys
+import timeit
+
+import numpy as np
+
+from pyphix import fix
+from pyphix import funcgen
+
+
+def sincos_per_sample(angle, iterations, data_fmt, angle_fmt):
+    """Legacy CORDIC sine/cosine: python integer iterations on each sample (wrapping registers).
+
+    :param angle: angles in radians (*angle_fmt*).
+    :param iterations: number of iterations.
+    :param data_fmt: x and y registers format.
+    :param angle_fmt: z register format.
+
+    :type angle: fix.FixNum
+    :type iterations: int
+    :type data_fmt: fix.FixFmt
+    :type angle_fmt: fix.FixFmt
+
+    :return: tuple in the form (cos, sin) of the register mantissas.
+    :rtype: tuple[list, list]"""
+
+    def wrap(value, fmt):
+        return (value + 2**(fmt.bit_length - 1)) % 2**fmt.bit_length - 2**(fmt.bit_length - 1)
+
+    atan = [fix.FixScalar(np.arctan(2.**-x), angle_fmt).mant for x in range(iterations)]
+    half_pi = fix.FixScalar(np.pi / 2, angle_fmt).mant
+    inv_gain = fix.FixScalar(1 / funcgen.Cordic(iterations, data_fmt, angle_fmt).gain, data_fmt).mant
+
+    cos_out, sin_out = [], []
+    for scalar in angle.iter_scalars():
+        x_mant, y_mant, z_mant = inv_gain, 0, scalar.mant
+        if z_mant > half_pi:
+            x_mant, y_mant, z_mant = 0, inv_gain, z_mant - half_pi
+        elif z_mant < -half_pi:
+            x_mant, y_mant, z_mant = 0, -inv_gain, z_mant + half_pi
+        for idx in range(iterations):
+            direction = 1 if z_mant >= 0 else -1
+            x_mant, y_mant, z_mant = (wrap(x_mant - direction * (y_mant >> idx), data_fmt),
+                                      wrap(y_mant + direction * (x_mant >> idx), data_fmt),
+                                      wrap(z_mant - direction * atan[idx], angle_fmt))
+        cos_out.append(x_mant)
+        sin_out.append(y_mant)
+
+    return cos_out, sin_out
+
+
+def run(num_samples=100000, iterations=16, repeat=3, legacy_samples=10000):
+    """Time the per-sample and the vectorized CORDIC sine/cosine and print the results.
+
+    The per-sample implementation is timed on *legacy_samples* samples and extrapolated to *num_samples*.
+
+    :param num_samples: number of samples.
+    :param iterations: number of CORDIC iterations.
+    :param repeat: number of timing repetitions, the best one is reported.
+    :param legacy_samples: number of samples processed by the per-sample implementation.
+
+    :type num_samples: int
+    :type iterations: int
+    :type repeat: int
+    :type legacy_samples: int"""
+
+    data_fmt, angle_fmt = fix.FixFmt(True, 1, 16), fix.FixFmt(True, 2, 16)
+    angle = fix.FixNum(np.random.RandomState(122).uniform(-np.pi, np.pi, num_samples), angle_fmt)
+    cordic = funcgen.Cordic(iterations, data_fmt, angle_fmt)
+
+    # both implementations must agree
+    cos_fix, sin_fix = cordic.sincos(angle[:legacy_samples])
+    assert (np.array_equal(sincos_per_sample(angle[:legacy_samples], iterations, data_fmt, angle_fmt),
+                           [cos_fix.value * data_fmt.scale, sin_fix.value * data_fmt.scale]))
+
+    t_legacy = min(timeit.repeat(lambda: sincos_per_sample(angle[:legacy_samples], iterations, data_fmt, angle_fmt),
+                                 number=1, repeat=1)) * num_samples / legacy_samples
+    t_cordic = min(timeit.repeat(lambda: cordic.sincos(angle), number=1, repeat=repeat))
+    t_lut = min(timeit.repeat(lambda: (funcgen.sin(angle, data_fmt), funcgen.cos(angle, data_fmt)), number=1,
+                              repeat=repeat))
+    print("sin/cos, %d samples: per-sample CORDIC %.2f s (extrapolated), vectorized CORDIC %.3f s (x%.0f), "
+          "LUT %.3f s (x%.0f)" % (num_samples, t_legacy, t_cordic, t_legacy / t_cordic, t_lut, t_legacy / t_lut))
+
+
+if __name__ == '__main__':
+    run(*[int(x) for x in sys.argv[1:]])
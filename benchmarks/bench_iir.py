@@ -0,0 +1,80 @@
+"""Benchmark the biquad cascade kernel against a per-sample FixNum implementation."""
+
+__author__ = "Samuele FAVAZZA"
+__copyright__ = "Copyright 2018, Samuele FAVAZZA"
+
+import sys
+import timeit
+
+import numpy as np
+
+from pyphix import fix
+from pyphix import dsp
+
+
+def biquad_per_sample(sos, samples, out_fmt):
+    """Legacy DF1 biquad cascade: FixNum operations on each time sample of all the channels.
+
+    :param sos: second order sections coefficients, shape (sections, 6).
+    :param samples: input samples, shape (time, channels).
+    :param out_fmt: sections output format.
+
+    :type sos: fix.FixNum
+    :type samples: fix.FixNum
+    :type out_fmt: fix.FixFmt
+
+    :return: filtered samples.
+    :rtype: numpy.ndarray"""
+
+    coeffs = [[sos[section, x] for x in range(6)] for section in range(sos.shape[0])]
+    out = samples
+    for b_0, b_1, b_2, _, a_1, a_2 in coeffs:
+        x_1 = x_2 = fix.FixNum(np.zeros(samples.shape[1]), out.fmt, *samples.fimath)
+        y_1 = y_2 = fix.FixNum(np.zeros(samples.shape[1]), out_fmt, *samples.fimath)
+        out_rows = []
+        for idx in range(samples.shape[0]):
+            x_0 = out[idx]
+            y_0 = (x_0 * b_0 + x_1 * b_1 + x_2 * b_2 - y_1 * a_1 - y_2 * a_2).change_fix(out_fmt)
+            x_2, x_1, y_2, y_1 = x_1, x_0, y_1, y_0
+            out_rows.append(y_0.value)
+        out = fix.FixNum(np.array(out_rows), out_fmt, *samples.fimath)
+
+    return out.value
+
+
+def run(num_samples=10000, channels=1000, repeat=3, legacy_samples=500):
+    """Time the per-sample and the kernel based biquad cascade and print the results.
+
+    The per-sample implementation is timed on *legacy_samples* samples and extrapolated to *num_samples*.
+
+    :param num_samples: number of time samples.
+    :param channels: number of channels.
+    :param repeat: number of timing repetitions, the best one is reported.
+    :param legacy_samples: number of time samples processed by the per-sample implementation.
+
+    :type num_samples: int
+    :type channels: int
+    :type repeat: int
+    :type legacy_samples: int"""
+
+    sos = fix.FixNum([[.0675, .135, .0675, 1, -1.143, .4128], [.5, -.25, .5, 1, -1.4, .6]], fix.FixFmt(True, 1, 14))
+    out_fmt = fix.FixFmt(True, 2, 15)
+    in_fix = fix.FixNum(np.random.RandomState(122).uniform(-.9, .9, (num_samples, channels)), fix.FixFmt(True, 0, 15))
+
+    iir = dsp.BiquadCascade(sos, out_fmt, structure='DF1')
+    # both implementations must agree
+    assert np.array_equal(biquad_per_sample(sos, in_fix[:legacy_samples], out_fmt),
+                          iir.process(in_fix[:legacy_samples]).value)
+    t_legacy = min(timeit.repeat(lambda: biquad_per_sample(sos, in_fix[:legacy_samples], out_fmt), number=1,
+                                 repeat=1)) * num_samples / legacy_samples
+
+    for structure in ['DF1', 'DF2T']:
+        iir = dsp.BiquadCascade(sos, out_fmt, structure=structure)
+        t_kernel = min(timeit.repeat(lambda: (iir.reset(), iir.process(in_fix)),  # pylint: disable=cell-var-from-loop
+                                     number=1, repeat=repeat))
+        print("biquad cascade %s, %d samples x %d channels: per-sample %.1f s (extrapolated), kernel %.3f s (x%.0f)" %
+              (structure, num_samples, channels, t_legacy, t_kernel, t_legacy / t_kernel))
+
+
+if __name__ == '__main__':
+    run(*[int(x) for x in sys.argv[1:]])
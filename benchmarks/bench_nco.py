@@ -0,0 +1,73 @@
+"""Benchmark the block NCO against a per-sample FixNum phase accumulator loop."""
+
+__author__ = "Samuele FAVAZZA"
+__copyright__ = "Copyright 2018, Samuele FAVAZZA"
+
+import sys
+import timeit
+
+import numpy as np
+
+from pyphix import fix
+from pyphix import dsp
+
+
+def nco_per_sample(freq, num_samples, acc_fmt, phase_bits, out_fmt):
+    """Legacy NCO: FixNum addition and wrapping of the phase accumulator on each sample.
+
+    :param freq: frequency control word.
+    :param num_samples: number of samples.
+    :param acc_fmt: phase accumulator format.
+    :param phase_bits: truncated phase bits.
+    :param out_fmt: sine output format.
+
+    :type freq: fix.FixNum
+    :type num_samples: int
+    :type acc_fmt: fix.FixFmt
+    :type phase_bits: int
+    :type out_fmt: fix.FixFmt
+
+    :return: sine samples.
+    :rtype: numpy.ndarray"""
+
+    acc = fix.FixNum([0], acc_fmt)
+    phases = []
+    for _ in range(num_samples):
+        phases.append(acc.value)
+        acc = (acc + freq).change_fix(acc_fmt, 'SymZero', 'Wrap')
+    phases = np.floor(np.concatenate(phases) * 2**phase_bits) / 2**phase_bits
+
+    return fix.FixNum(np.sin(2 * np.pi * phases), out_fmt, 'SymZero', 'Sat').value
+
+
+def run(num_samples=1000000, repeat=3, legacy_samples=20000):
+    """Time the per-sample and the block NCO and print the results.
+
+    The per-sample implementation is timed on *legacy_samples* samples and extrapolated to *num_samples*.
+
+    :param num_samples: number of samples.
+    :param repeat: number of timing repetitions, the best one is reported.
+    :param legacy_samples: number of samples processed by the per-sample implementation.
+
+    :type num_samples: int
+    :type repeat: int
+    :type legacy_samples: int"""
+
+    acc_bits, phase_bits, out_fmt = 32, 12, fix.FixFmt(True, 1, 14)
+    nco = dsp.Nco(.1234567, acc_bits, phase_bits, out_fmt)
+    freq = fix.FixNum(nco.freq.value, nco.fcw_fmt)
+
+    # both implementations must agree
+    assert np.array_equal(nco_per_sample(freq, legacy_samples, fix.FixFmt(False, 0, acc_bits), phase_bits, out_fmt),
+                          nco.process(legacy_samples)[1].value)
+
+    t_legacy = min(timeit.repeat(
+        lambda: nco_per_sample(freq, legacy_samples, fix.FixFmt(False, 0, acc_bits), phase_bits, out_fmt),
+        number=1, repeat=1)) * num_samples / legacy_samples
+    t_block = min(timeit.repeat(lambda: (nco.reset(), nco.process(num_samples)), number=1, repeat=repeat))
+    print("NCO, %d samples: per-sample %.1f s (extrapolated), block %.3f s (x%.0f)" %
+          (num_samples, t_legacy, t_block, t_legacy / t_block))
+
+
+if __name__ == '__main__':
+    run(*[int(x) for x in sys.argv[1:]])
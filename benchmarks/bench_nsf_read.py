@@ -0,0 +1,66 @@
+"""Benchmark the block based nsf text reader against the legacy literal_eval implementation."""
+
+__author__ = "Samuele FAVAZZA"
+__copyright__ = "Copyright 2018, Samuele FAVAZZA"
+
+import ast
+import os
+import sys
+import tempfile
+import timeit
+
+import numpy as np
+
+from pyphix import fix
+from pyphix import io as fio
+
+
+def legacy_read(file_path):
+    """Original FixFile.read data section: the whole file evaluated as a single list literal.
+
+    :param file_path: file path.
+
+    :type file_path: str
+
+    :return: one row per column.
+    :rtype: numpy.ndarray"""
+
+    with open(file_path, mode='r', encoding='utf-8') as f:
+        for _ in range(3):
+            f.readline()
+        file_content = f.read()[:-1].replace('\n', '],[')
+        return np.array(ast.literal_eval('[[' + file_content.replace(' ', ',') + ']]')).T
+
+
+def run(num_samples=200000, repeat=3):
+    """Time both implementations and print the results.
+
+    :param num_samples: number of read rows.
+    :param repeat: number of timing repetitions, the best one is reported.
+
+    :type num_samples: int
+    :type repeat: int"""
+
+    rand_generator = np.random.RandomState(122)
+    obj_file = fio.FixFile() \
+        .add_column('din', 'fix', fix.FixNum(rand_generator.uniform(-1, 1, num_samples), fix.FixFmt(True, 0, 15))) \
+        .add_column('count', 'int', np.arange(num_samples)) \
+        .add_column('dout', 'fix', fix.FixNum(rand_generator.uniform(-1, 1, num_samples), fix.FixFmt(True, 3, 20)))
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        file_path = os.path.join(tmp_dir, 'bench.nsf')
+        obj_file.write(file_path)
+
+        # both implementations must agree
+        np.testing.assert_array_equal(legacy_read(file_path)[1],
+                                      np.concatenate([x['count'] for x in fio.FixFile.iter_blocks(file_path)]))
+
+        t_legacy = min(timeit.repeat(lambda: legacy_read(file_path), number=1, repeat=repeat))
+        t_new = min(timeit.repeat(lambda: fio.FixFile().read(file_path), number=1, repeat=repeat))
+
+    print("nsf read, %d rows: legacy %.4f s, block reader %.4f s (x%.1f)" %
+          (num_samples, t_legacy, t_new, t_legacy / t_new))
+
+
+if __name__ == '__main__':
+    run(*[int(x) for x in sys.argv[1:]])
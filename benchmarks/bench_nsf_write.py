@@ -0,0 +1,61 @@
+"""Benchmark the block based nsf text writer against the legacy row by row implementation."""
+
+__author__ = "Samuele FAVAZZA"
+__copyright__ = "Copyright 2018, Samuele FAVAZZA"
+
+import os
+import sys
+import tempfile
+import timeit
+
+import numpy as np
+
+from pyphix import fix
+from pyphix import io as fio
+
+
+def legacy_write(obj_file, file_path):
+    """Original FixFile.write data section: a 2-D string array formatted and written row by row.
+
+    :param obj_file: file object to write (float, int and fix columns only).
+    :param file_path: file path.
+
+    :type obj_file: io.FixFile
+    :type file_path: str"""
+
+    with open(file_path, mode='wb') as f:
+        data_to_write = np.array([obj_file.get_column(x[0]) if x[1] != 'fix' else
+                                  obj_file.get_column(x[0]).hexfmt
+                                  for x in obj_file.get_header(True)])
+        for line in data_to_write.T:
+            str_to_write = str(line)[2:-2].replace("' '", ' ') + '\n'
+            f.write(str_to_write.encode('ascii'))
+
+
+def run(num_samples=200000, repeat=3):
+    """Time both implementations and print the results.
+
+    :param num_samples: number of written rows.
+    :param repeat: number of timing repetitions, the best one is reported.
+
+    :type num_samples: int
+    :type repeat: int"""
+
+    rand_generator = np.random.RandomState(122)
+    obj_file = fio.FixFile() \
+        .add_column('din', 'fix', fix.FixNum(rand_generator.uniform(-1, 1, num_samples), fix.FixFmt(True, 0, 15))) \
+        .add_column('count', 'int', np.arange(num_samples)) \
+        .add_column('dout', 'fix', fix.FixNum(rand_generator.uniform(-1, 1, num_samples), fix.FixFmt(True, 3, 20)))
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        file_path = os.path.join(tmp_dir, 'bench.nsf')
+
+        t_legacy = min(timeit.repeat(lambda: legacy_write(obj_file, file_path), number=1, repeat=repeat))
+        t_new = min(timeit.repeat(lambda: obj_file.write(file_path), number=1, repeat=repeat))
+
+    print("nsf write, %d rows: legacy %.4f s, block writer %.4f s (x%.1f)" %
+          (num_samples, t_legacy, t_new, t_legacy / t_new))
+
+
+if __name__ == '__main__':
+    run(*[int(x) for x in sys.argv[1:]])
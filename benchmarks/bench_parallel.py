@@ -0,0 +1,63 @@
+"""Benchmark the chunked multi-thread quantization and arithmetic against the serial execution."""
+
+__author__ = "Samuele FAVAZZA"
+__copyright__ = "Copyright 2018, Samuele FAVAZZA"
+
+import os
+import sys
+import timeit
+
+import numpy as np
+
+from pyphix import fix
+
+
+def quantize_and_process(in_vec):
+    """Quantize the input, apply a gain and an offset and cast the result back to 16 bits.
+
+    :param in_vec: input values.
+
+    :type in_vec: numpy.ndarray
+
+    :return: processed fix-point object.
+    :rtype: FixNum"""
+
+    in_fix = fix.FixNum(in_vec, fix.FixFmt(True, 0, 15), 'ConvEven', 'Sat')
+    gain_fix = fix.FixNum(.7071, fix.FixFmt(False, 0, 16), 'ConvEven', 'Sat')
+    tmp_fix = in_fix.mult(gain_fix, out_rnd='ConvEven', out_over='Sat').add(in_fix)
+
+    return tmp_fix.change_fix(fix.FixFmt(True, 1, 14), 'ConvEven', 'Sat')
+
+
+def run(num_samples=10000000, repeat=3, workers=os.cpu_count(), chunk_size=65536):
+    """Time serial and parallel execution and print the results.
+
+    :param num_samples: number of processed samples.
+    :param repeat: number of timing repetitions, the best one is reported.
+    :param workers: number of worker threads of the parallel execution.
+    :param chunk_size: number of elements processed by each task.
+
+    :type num_samples: int
+    :type repeat: int
+    :type workers: int
+    :type chunk_size: int"""
+
+    in_vec = np.random.RandomState(122).uniform(-1, 1, num_samples)
+
+    exp_fix = quantize_and_process(in_vec)
+    t_serial = min(timeit.repeat(lambda: quantize_and_process(in_vec), number=1, repeat=repeat))
+
+    prev_settings = fix.set_parallel(workers, chunk_size)
+    try:
+        # both executions must agree
+        assert np.array_equal(quantize_and_process(in_vec).intfmt, exp_fix.intfmt)
+        t_par = min(timeit.repeat(lambda: quantize_and_process(in_vec), number=1, repeat=repeat))
+    finally:
+        fix.set_parallel(*prev_settings)
+
+    print("quantize/mult/add/cast, %d samples: serial %.4f s, %d workers %.4f s (x%.1f)" %
+          (num_samples, t_serial, workers, t_par, t_serial / t_par))
+
+
+if __name__ == '__main__':
+    run(*[int(x) for x in sys.argv[1:]])
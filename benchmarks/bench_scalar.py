@@ -0,0 +1,69 @@
+"""Benchmark a sample-by-sample feedback loop with FixScalar against 1-element FixNum objects."""
+
+__author__ = "Samuele FAVAZZA"
+__copyright__ = "Copyright 2018, Samuele FAVAZZA"
+
+import sys
+import timeit
+
+import numpy as np
+
+from pyphix import fix
+
+
+def first_order_iir(samples, coeff, state_fmt):
+    """Bit-true first order low-pass y[n] = y[n-1] + coeff*(x[n] - y[n-1]), returns the output values.
+
+    :param samples: input samples (FixNum 1-element objects or FixScalar objects).
+    :param coeff: filter coefficient (same type of samples).
+    :param state_fmt: format of the filter state.
+
+    :type samples: list
+    :type coeff: FixNum or FixScalar
+    :type state_fmt: FixFmt
+
+    :return: output values.
+    :rtype: list[float]"""
+
+    state = samples[0].change_fix(state_fmt)
+    out = []
+    for sample in samples:
+        state = state.add(coeff * (sample - state), out_fmt=state_fmt, out_rnd='ConvEven', out_over='Sat')
+        out.append(float(np.reshape(state.value, -1)[0]))
+
+    return out
+
+
+def run(num_samples=2000, repeat=3):
+    """Time both implementations and print the results.
+
+    :param num_samples: number of processed samples.
+    :param repeat: number of timing repetitions, the best one is reported.
+
+    :type num_samples: int
+    :type repeat: int"""
+
+    in_fmt, state_fmt = fix.FixFmt(True, 0, 15), fix.FixFmt(True, 1, 20)
+    in_vec = np.random.RandomState(122).uniform(-1, 1, num_samples)
+
+    fix_vec = fix.FixNum(in_vec, in_fmt, 'ConvEven', 'Sat')
+    num_samples_list = list(fix_vec)
+    sca_samples_list = list(fix_vec.iter_scalars())
+    num_coeff = fix.FixNum(0.125, fix.FixFmt(False, 0, 8), 'ConvEven', 'Sat')
+    sca_coeff = fix.FixScalar(0.125, fix.FixFmt(False, 0, 8), 'ConvEven', 'Sat')
+
+    # both implementations must agree
+    assert first_order_iir(num_samples_list, num_coeff, state_fmt) == \
+        first_order_iir(sca_samples_list, sca_coeff, state_fmt)
+
+    t_num = min(timeit.repeat(lambda: first_order_iir(num_samples_list, num_coeff, state_fmt),
+                              number=1, repeat=repeat))
+    t_sca = min(timeit.repeat(lambda: first_order_iir(sca_samples_list, sca_coeff, state_fmt),
+                              number=1, repeat=repeat))
+
+    print("first order IIR, %d samples: FixNum %.4f s, FixScalar %.4f s (x%.1f)" %
+          (num_samples, t_num, t_sca, t_num / t_sca))
+
+
+if __name__ == '__main__':
+    run(*[int(x) for x in sys.argv[1:]])
@@ -0,0 +1,54 @@
+"""Benchmark the FixNum bulk string formatting against the former per-element implementation."""
+
+__author__ = "Samuele FAVAZZA"
+__copyright__ = "Copyright 2018, Samuele FAVAZZA"
+
+import sys
+import timeit
+
+import numpy as np
+
+from pyphix import fix
+
+
+def legacy_hexfmt(fix_obj):
+    """Former hexfmt implementation: one hex() call and one zero padding per element."""
+
+    tmp_hex = np.array([hex(x) for x in fix_obj.intfmt])
+    return np.array(['0x' + (int(np.ceil(fix_obj.fmt.bit_length / 4)) - len(x[2:])) * '0' + x[2:]
+                     for x in tmp_hex])
+
+
+def legacy_binfmt(fix_obj):
+    """Former binfmt implementation: one bin() call and one zero padding per element."""
+
+    return np.array(['0b' + (fix_obj.fmt.bit_length - len(bin(x)[2:])) * '0' + bin(x)[2:]
+                     for x in fix_obj.intfmt])
+
+
+def run(num_samples=1000000, repeat=3):
+    """Time both implementations on a random vector and print the results.
+
+    :param num_samples: number of samples of the test vector.
+    :param repeat: number of timing repetitions, the best one is reported.
+
+    :type num_samples: int
+    :type repeat: int"""
+
+    rand_generator = np.random.RandomState(122)
+    fix_obj = fix.FixNum(rand_generator.uniform(-8, 8, num_samples), fix.FixFmt(True, 4, 27))
+
+    for name, legacy, vector in [('hex', legacy_hexfmt, lambda: fix_obj.strfmt('hex')),
+                                 ('bin', legacy_binfmt, lambda: fix_obj.strfmt('bin'))]:
+        # both implementations must agree
+        np.testing.assert_array_equal(legacy(fix_obj), vector().astype(str))
+
+        t_legacy = min(timeit.repeat(lambda: legacy(fix_obj), number=1, repeat=repeat))  # pylint: disable=cell-var-from-loop
+        t_vector = min(timeit.repeat(vector, number=1, repeat=repeat))
+
+        print("%s, %d samples: legacy %.4f s, vectorized %.4f s (x%.1f)" %
+              (name, num_samples, t_legacy, t_vector, t_legacy / t_vector))
+
+
+if __name__ == '__main__':
+    run(*[int(x) for x in sys.argv[1:]])
@@ -0,0 +1,47 @@
+"""Benchmark the FixNum integer representation against the former per-element implementation."""
+
+__author__ = "Samuele FAVAZZA"
+__copyright__ = "Copyright 2018, Samuele FAVAZZA"
+
+import sys
+import timeit
+
+import numpy as np
+
+from pyphix import fix
+
+
+def legacy_tmp_int(fix_obj):
+    """Former _tmp_int implementation: one python integer conversion and mask per element."""
+
+    tmp_value = np.reshape(fix_obj.value, -1) * 2**fix_obj.fmt.frac_bits
+    return np.array([int(x) if x >= 0 else (int(x) & fix_obj._fix_size_mask)  # pylint: disable=protected-access
+                     for x in tmp_value])
+
+
+def run(num_samples=1000000, repeat=3):
+    """Time both implementations on a random vector and print the results.
+
+    :param num_samples: number of samples of the test vector.
+    :param repeat: number of timing repetitions, the best one is reported.
+
+    :type num_samples: int
+    :type repeat: int"""
+
+    rand_generator = np.random.RandomState(122)
+    for fmt in [fix.FixFmt(True, 4, 27), fix.FixFmt(True, 8, 70)]:
+        fix_obj = fix.FixNum(rand_generator.uniform(-8, 8, num_samples), fmt)
+
+        # both implementations must agree (legacy is float based, thus exact only up to 53 bits)
+        if fmt.bit_length <= 53:
+            np.testing.assert_array_equal(legacy_tmp_int(fix_obj), fix_obj.intfmt)
+
+        t_legacy = min(timeit.repeat(lambda: legacy_tmp_int(fix_obj), number=1, repeat=repeat))
+        t_vector = min(timeit.repeat(fix_obj._tmp_int, number=1, repeat=repeat))  # pylint: disable=protected-access
+
+        print("fmt %s, %d samples: legacy %.4f s, vectorized %.4f s (x%.1f)" %
+              (fmt, num_samples, t_legacy, t_vector, t_legacy / t_vector))
+
+
+if __name__ == '__main__':
+    run(*[int(x) for x in sys.argv[1:]])
@@ -0,0 +1,754 @@
+"""Module implementing bit-true fix-point signal processing blocks."""
+
+__author__ = "Samuele FAVAZZA"
+__copyright__ = "Copyright 2018, Samuele FAVAZZA"
+
+from enum import Enum
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+from . import fix
+from . import funcgen
+from . import generalutil as gu
+from .fix import _as_work, _mant_of
+
+
+class FirFilter:
+    """Bit-true FIR filter.
+
+    The output is computed as y[n] = sum_k(coeffs[k] * x[n-k]) with three quantization points:
+
+    * each product is casted to *prod_fmt* (full precision if None)
+    * the sum of the products is casted to *acc_fmt* (full precision, i.e. with ceil(log2(taps)) guard
+      bits, if None)
+    * the accumulator is casted to *out_fmt* (accumulator format if None)
+
+    The accumulator round and overflow methods are applied once on the exact sum of the products: with ```Wrap```
+    overflow this is bit-identical to wrapping each partial sum.
+
+    The whole input is processed at once (sliding window over the integer mantissas, in blocks of *block_size*
+    samples to bound the memory), the filter state is kept between two :meth:`process` calls (streaming).
+
+    :param coeffs: filter coefficients.
+    :param prod_fmt: products format.
+    :param acc_fmt: accumulator format.
+    :param out_fmt: output format.
+    :param prod_rnd: products round method.
+    :param prod_over: products overflow method.
+    :param acc_rnd: accumulator round method.
+    :param acc_over: accumulator overflow method.
+    :param out_rnd: output round method.
+    :param out_over: output overflow method.
+    :param block_size: number of output samples computed at once.
+
+    :type coeffs: fix.FixNum (1-D)
+    :type prod_fmt: fix.FixFmt or None
+    :type acc_fmt: fix.FixFmt or None
+    :type out_fmt: fix.FixFmt or None
+    :type prod_rnd: str
+    :type prod_over: str
+    :type acc_rnd: str
+    :type acc_over: str
+    :type out_rnd: str
+    :type out_over: str
+    :type block_size: int
+    """
+
+    # pylint: disable=too-many-instance-attributes,too-many-arguments
+
+    def __init__(self, coeffs, prod_fmt=None, acc_fmt=None, out_fmt=None,
+                 prod_rnd="SymZero", prod_over="Wrap",
+                 acc_rnd="SymZero", acc_over="Wrap",
+                 out_rnd="SymZero", out_over="Wrap", block_size=65536):
+
+        self.coeffs = gu.check_args(coeffs, fix.FixNum)
+        if len(coeffs.shape) != 1:
+            raise ValueError("_ERROR_: coefficients must be a 1-D vector.")
+
+        self.prod_fmt = None if prod_fmt is None else gu.check_args(prod_fmt, fix.FixFmt)
+        self.acc_fmt = None if acc_fmt is None else gu.check_args(acc_fmt, fix.FixFmt)
+        self.out_fmt = None if out_fmt is None else gu.check_args(out_fmt, fix.FixFmt)
+        self.prod_fimath = (gu.check_enum(prod_rnd, fix.ERoundMethod), gu.check_enum(prod_over, fix.EOverMethod))
+        self.acc_fimath = (gu.check_enum(acc_rnd, fix.ERoundMethod), gu.check_enum(acc_over, fix.EOverMethod))
+        self.out_fimath = (gu.check_enum(out_rnd, fix.ERoundMethod), gu.check_enum(out_over, fix.EOverMethod))
+        self.block_size = gu.check_args(block_size, int)
+
+        # time reversed coefficients, to be applied on sliding windows
+        self._rev_coeffs = self.coeffs[::-1].copy()
+
+        # filter state: last (taps - 1) input samples
+        self._in_fmt = None
+        self._state = None
+
+    @property
+    def taps(self):
+        """Return the number of filter taps."""
+
+        return self.coeffs.shape[0]
+
+    def reset(self):
+        """Clear the filter state (the input history is zeroed)."""
+
+        self._in_fmt = None
+        self._state = None
+
+    def process(self, value):
+        """Filter a block of samples, the filter state is updated.
+
+        Processing a signal in consecutive blocks gives the same result as processing it at once.
+
+        :param value: input samples, all the blocks must share the same format.
+
+        :type value: fix.FixNum (1-D)
+
+        :return: filtered samples.
+        :rtype: fix.FixNum"""
+
+        value = gu.check_args(value, fix.FixNum)
+        if len(value.shape) != 1:
+            raise ValueError("_ERROR_: input must be a 1-D vector.")
+
+        if self._in_fmt is None:
+            self._in_fmt = value.fmt
+            self._state = np.zeros(self.taps - 1, dtype=_mant_of(value).dtype)
+        elif value.fmt != self._in_fmt:
+            raise ValueError("_ERROR_: input format %s differs from the previous blocks one %s." %
+                             (value.fmt, self._in_fmt))
+
+        # input history followed by the new samples (integer mantissas)
+        ext_mant = np.concatenate((self._state, _mant_of(value)))
+        self._state = ext_mant[ext_mant.shape[0] - (self.taps - 1):].copy()
+
+        # one row per output sample, processed in blocks to bound the memory
+        if value.shape[0]:
+            windows = sliding_window_view(ext_mant, self.taps)
+        else:
+            windows = np.zeros((0, self.taps), dtype=ext_mant.dtype)
+        out_blocks = [self._filter_windows(windows[start:start + self.block_size])
+                      for start in range(0, max(1, windows.shape[0]), self.block_size)]
+
+        return fix.FixNum.from_raw(np.concatenate([_mant_of(x) for x in out_blocks]),
+                                   out_blocks[0].fmt, *self.out_fimath)
+
+    # private methods
+    def _filter_windows(self, windows):
+        """Compute the filter output of each window (one row per output sample)."""
+
+        # windows share the coefficients round and overflow methods, so the operators never mismatch
+        windows_fix = fix.FixNum.from_raw(windows, self._in_fmt, *self._rev_coeffs.fimath)
+
+        if self.prod_fmt is None:
+            # full precision products: single vectorized dot product
+            acc_fix = windows_fix.dot(self._rev_coeffs, out_rnd=self.acc_fimath[0], out_over=self.acc_fimath[1])
+        else:
+            # exact products quantized once
+            prod_fix = windows_fix.mult(self._rev_coeffs, out_fmt=self.prod_fmt, out_rnd=self.prod_fimath[0],
+                                        out_over=self.prod_fimath[1])
+            acc_fix = fix.sum(prod_fix, axis=1, out_rnd=self.acc_fimath[0], out_over=self.acc_fimath[1])
+
+        if self.acc_fmt is not None:
+            acc_fix = acc_fix.change_fix(self.acc_fmt, *self.acc_fimath)
+
+        return acc_fix.change_fix(acc_fix.fmt if self.out_fmt is None else self.out_fmt, *self.out_fimath)
+
+
+class EFftScaling(Enum):
+    """Enum class for FFT scaling schedules."""
+    NONE = 'None'
+    SHIFT = 'Shift'
+    BFP = 'BFP'
+
+
+class Fft:
+    """Bit-true radix-2 / radix-4 decimation in time FFT (or IFFT).
+
+    The transform is computed in log_radix(size) stages (a radix-2 first stage completes the radix-4 ones when
+    *size* is not a power of 4), each stage computes all its butterflies at once on the integer mantissas:
+
+    * the input is read in digit reversed order, the output is in natural order
+    * the twiddle factors W^k = exp(-2j*pi*k/size) are read from a ROM quantized to *twiddle_fmt* with ```Sat```
+      overflow (i.e. W^0 = 1 saturates when *twiddle_fmt* has no integer bits), the ROM is cached per (size,
+      format, round method); the IFFT reads it backwards (W^-k = W^(size - k))
+    * the twiddle products and the butterfly sums are exact, the butterfly outputs are shifted right according to
+      the scaling schedule and quantized once to *data_fmt* with the stage round and overflow methods
+
+    Scaling schedules:
+
+    * ```None```: no scaling, the growth is handled by the stage overflow method
+    * ```Shift```: each stage divides by its radix (one bit per radix-2 stage), overall by *size*
+    * ```BFP```: block floating point, each stage shifts by the minimum number of bits making the largest output of
+      the frame fit *data_fmt* (only down-scaling, each frame has its own exponent)
+    * a sequence of right shifts, one per stage
+
+    The input frames lie on the last axis (the leading axes index independent frames). After :meth:`process` the
+    :attr:`exponent` attribute holds the total shift of each frame: the (unnormalized) transform is
+    ``out.value * 2**exponent``.
+
+    Ex:
+
+    >>> from pyphix import fix, dsp
+    >>> fft = dsp.Fft(1024, fix.FixFmt(True, 1, 16), fix.FixFmt(True, 0, 15), radix=4, scaling='BFP',
+                      stage_rnd='ConvEven')
+    >>> spectrum = fft.process(fix.FixComplex(capture, fix.FixFmt(True, 0, 15)))
+    >>> spectrum.value * 2.**fft.exponent
+
+    :param size: transform size (power of 2).
+    :param twiddle_fmt: twiddle factors format.
+    :param data_fmt: signed format of the stage outputs (input format if None).
+    :param radix: butterflies radix (2 or 4).
+    :param scaling: scaling schedule.
+    :param stage_rnd: round method of the stage outputs, one for all the stages or one per stage.
+    :param stage_over: overflow method of the stage outputs, one for all the stages or one per stage.
+    :param twiddle_rnd: twiddle factors round method.
+    :param inverse: compute the inverse transform (no 1/size factor, see the ```Shift``` schedule).
+
+    :type size: int
+    :type twiddle_fmt: fix.FixFmt
+    :type data_fmt: fix.FixFmt or None
+    :type radix: int
+    :type scaling: str or list[int]
+    :type stage_rnd: str or list[str]
+    :type stage_over: str or list[str]
+    :type twiddle_rnd: str
+    :type inverse: bool
+    """
+
+    # pylint: disable=too-many-instance-attributes,too-many-arguments
+
+    def __init__(self, size, twiddle_fmt, data_fmt=None, radix=2, scaling="Shift",
+                 stage_rnd="SymZero", stage_over="Wrap", twiddle_rnd="SymInf", inverse=False):
+
+        self.size = gu.check_args(size, int)
+        if size < 2 or size & (size - 1):
+            raise ValueError("_ERROR_: transform size must be a power of 2.")
+        if gu.check_args(radix, int) not in (2, 4):
+            raise ValueError("_ERROR_: radix must be 2 or 4.")
+
+        num_bits = size.bit_length() - 1
+        self.radices = [2] * num_bits if radix == 2 else [2] * (num_bits % 2) + [4] * (num_bits // 2)
+
+        self.twiddle_fmt = gu.check_args(twiddle_fmt, fix.FixFmt)
+        self.twiddle_rnd = gu.check_enum(twiddle_rnd, fix.ERoundMethod)
+        self.data_fmt = None if data_fmt is None else _check_signed(gu.check_args(data_fmt, fix.FixFmt))
+        self.stage_fimath = list(zip(_per_stage(stage_rnd, fix.ERoundMethod, len(self.radices)),
+                                     _per_stage(stage_over, fix.EOverMethod, len(self.radices))))
+        self.inverse = gu.check_args(inverse, bool)
+
+        if isinstance(scaling, (str, EFftScaling)):
+            self.scaling = gu.check_enum(scaling, EFftScaling)
+            self._shifts = [0 if self.scaling is EFftScaling.NONE else x.bit_length() - 1 for x in self.radices]
+        else:
+            self.scaling = [gu.check_args(x, int) for x in scaling]
+            if len(self.scaling) != len(self.radices) or min(self.scaling) < 0:
+                raise ValueError("_ERROR_: scaling must give a positive shift for each of the %d stages." %
+                                 len(self.radices))
+            self._shifts = self.scaling
+
+        # digit reversed input order
+        self._perm = np.zeros(1, dtype=np.intp)
+        for cur_radix in self.radices:
+            self._perm = np.concatenate([self._perm * cur_radix + x for x in range(cur_radix)])
+
+        # per stage twiddles, shape (radix, span, [real, imag]), the first group is not multiplied (exact unity)
+        rom = _twiddle_rom(size, self.twiddle_fmt, self.twiddle_rnd)
+        self._twiddles = []
+        span = 1
+        for cur_radix in self.radices:
+            rom_idx = np.arange(cur_radix)[:, None] * np.arange(span) * (size // (cur_radix * span)) % size
+            twiddle = _as_work(rom[-rom_idx % size if inverse else rom_idx], self.twiddle_fmt.bit_length + 1)
+            twiddle[0] = [1 << self.twiddle_fmt.frac_bits, 0]
+            self._twiddles.append(twiddle)
+            span *= cur_radix
+
+        # multiplication by -j (forward) or +j (inverse) of the radix-4 butterflies, applied on swapped parts
+        self._rot = np.array([-1, 1] if inverse else [1, -1])
+
+        # total shift of each frame of the last processed input
+        self.exponent = None
+
+    @property
+    def num_stages(self):
+        """Return the number of stages."""
+
+        return len(self.radices)
+
+    @property
+    def twiddles(self):
+        """Return the twiddle factors ROM content (W^k, k = 0, ..., size - 1)."""
+
+        return fix.FixComplex.from_raw(_twiddle_rom(self.size, self.twiddle_fmt, self.twiddle_rnd),
+                                       self.twiddle_fmt, self.twiddle_rnd, "Sat")
+
+    def process(self, value):
+        """Transform the input frames.
+
+        :param value: input frames (last axis of length *size*).
+
+        :type value: fix.FixComplex
+
+        :return: transformed frames (:attr:`exponent` holds their scaling).
+        :rtype: fix.FixComplex"""
+
+        value = gu.check_args(value, fix.FixComplex)
+        if not value.shape or value.shape[-1] != self.size:
+            raise ValueError("_ERROR_: input frames must hold %d samples." % self.size)
+        data_fmt = _check_signed(value.fmt) if self.data_fmt is None else self.data_fmt
+
+        # exact complex products (one bit more than the operands) and radix growth
+        work_bits = (max(value.fmt.bit_length, data_fmt.bit_length) + self.twiddle_fmt.bit_length + 1 +
+                     max(self.radices).bit_length() - 1)
+        mant = _as_work(_mant_of(value._parts), work_bits)[..., self._perm, :]  # pylint: disable=protected-access
+        frac_bits = value.fmt.frac_bits
+        exponent = np.zeros(value.shape[:-1], dtype=np.int64)
+
+        for stage, radix in enumerate(self.radices):
+            mant = self._butterflies(mant, stage, radix, work_bits)
+            frac_bits += self.twiddle_fmt.frac_bits
+
+            if self.scaling is EFftScaling.BFP:
+                frame_shift = _bfp_shift(mant, frac_bits - data_fmt.frac_bits, data_fmt.bit_length)
+                # align the frames to the largest shift, a single quantization serves all of them
+                shift = int(np.max(frame_shift, initial=0))
+                mant = mant << (shift - frame_shift)[..., None, None]
+                exponent += frame_shift
+            else:
+                shift = self._shifts[stage]
+                exponent += shift
+
+            mant = _as_work(_mant_of(fix.FixNum._from_int(mant, frac_bits + shift, work_bits, data_fmt,  # pylint: disable=protected-access
+                                                          *self.stage_fimath[stage])), work_bits)
+            frac_bits = data_fmt.frac_bits
+
+        self.exponent = exponent
+        return fix.FixComplex.from_raw(_as_work(mant, data_fmt.bit_length), data_fmt, *self.stage_fimath[-1])
+
+    # private methods
+    def _butterflies(self, mant, stage, radix, work_bits):
+        """Return the exact outputs of all the butterflies of a stage (interleaved mantissas)."""
+
+        twiddle = _as_work(self._twiddles[stage], work_bits)
+        # (frames, blocks, radix, span, [real, imag])
+        blocks = np.reshape(mant, mant.shape[:-2] + (-1, ) + twiddle.shape)
+        prod = np.stack((blocks[..., 0] * twiddle[..., 0] - blocks[..., 1] * twiddle[..., 1],
+                         blocks[..., 0] * twiddle[..., 1] + blocks[..., 1] * twiddle[..., 0]), axis=-1)
+        prod = [prod[..., x, :, :] for x in range(radix)]
+
+        if radix == 2:
+            out = (prod[0] + prod[1], prod[0] - prod[1])
+        else:
+            sum_02, diff_02, sum_13 = prod[0] + prod[2], prod[0] - prod[2], prod[1] + prod[3]
+            rot_13 = (prod[1] - prod[3])[..., ::-1] * self._rot
+            out = (sum_02 + sum_13, diff_02 + rot_13, sum_02 - sum_13, diff_02 - rot_13)
+
+        return np.reshape(np.stack(out, axis=-3), mant.shape)
+
+
+class EIirStructure(Enum):
+    """Enum class for IIR filter structures."""
+    DF1 = 'DF1'
+    DF2T = 'DF2T'
+
+
+class BiquadCascade:
+    """Bit-true cascade of second order IIR sections (biquads).
+
+    Each section computes y[n] = b0*x[n] + b1*x[n-1] + b2*x[n-2] - a1*y[n-1] - a2*y[n-2] in one of the structures:
+
+    * ```DF1```: direct form I, the exact sum of the five products is quantized once to *out_fmt*
+    * ```DF2T```: transposed direct form II, the output y[n] = b0*x[n] + s1 is quantized to *out_fmt*, the states
+      s1 = b1*x[n] - a1*y[n] + s2 and s2 = b2*x[n] - a2*y[n] are computed exactly and quantized to *state_fmt*
+
+    Round and overflow methods behave exactly as for :class:`pyphix.fix.FixNum`. The input of the first section has
+    the format of the processed samples, the other sections are fed by the previous section output.
+
+    The first axis of the input is the time, the other axes index independent channels: the feed-forward terms
+    of a section are computed at once on the whole block, the feedback recursion runs sample by sample on the
+    integer mantissas of all the channels at once (on python integers for a single channel). The filter state
+    is kept between two :meth:`process` calls (streaming).
+
+    :param sos: second order sections coefficients [b0, b1, b2, a0, a1, a2] (a0 must be 1), shape (sections, 6)
+                for all the channels or (sections, 6, channels...) for a filter bank.
+    :param out_fmt: sections output format.
+    :param state_fmt: ```DF2T``` states format (*out_fmt* if None).
+    :param structure: filter structure.
+    :param out_rnd: sections output round method.
+    :param out_over: sections output overflow method.
+    :param state_rnd: ```DF2T``` states round method.
+    :param state_over: ```DF2T``` states overflow method.
+
+    :type sos: fix.FixNum
+    :type out_fmt: fix.FixFmt
+    :type state_fmt: fix.FixFmt or None
+    :type structure: str
+    :type out_rnd: str
+    :type out_over: str
+    :type state_rnd: str
+    :type state_over: str
+    """
+
+    # pylint: disable=too-many-instance-attributes,too-many-arguments
+
+    def __init__(self, sos, out_fmt, state_fmt=None, structure="DF2T",
+                 out_rnd="SymZero", out_over="Wrap", state_rnd="SymZero", state_over="Wrap"):
+
+        self.sos = gu.check_args(sos, fix.FixNum)
+        if len(sos.shape) < 2 or sos.shape[1] != 6:
+            raise ValueError("_ERROR_: coefficients must be given as (sections, 6, ...) second order sections.")
+        if np.any(sos.value[:, 3] != 1):
+            raise ValueError("_ERROR_: a0 coefficients must be 1.")
+
+        self.out_fmt = gu.check_args(out_fmt, fix.FixFmt)
+        self.state_fmt = self.out_fmt if state_fmt is None else gu.check_args(state_fmt, fix.FixFmt)
+        self.structure = gu.check_enum(structure, EIirStructure)
+        self.out_fimath = (gu.check_enum(out_rnd, fix.ERoundMethod), gu.check_enum(out_over, fix.EOverMethod))
+        self.state_fimath = (gu.check_enum(state_rnd, fix.ERoundMethod), gu.check_enum(state_over, fix.EOverMethod))
+
+        # filter state: input format, channels shape and two mantissas per section
+        self._in_fmt = None
+        self._channels = None
+        self._state = None
+
+    @property
+    def sections(self):
+        """Return the number of sections."""
+
+        return self.sos.shape[0]
+
+    def reset(self):
+        """Clear the filter state (the sections history is zeroed)."""
+
+        self._in_fmt = None
+        self._channels = None
+        self._state = None
+
+    def process(self, value):
+        """Filter a block of samples, the filter state is updated.
+
+        Processing a signal in consecutive blocks gives the same result as processing it at once.
+
+        :param value: input samples (first axis is the time), all the blocks must share format and channels.
+
+        :type value: fix.FixNum
+
+        :return: filtered samples.
+        :rtype: fix.FixNum"""
+
+        value = gu.check_args(value, fix.FixNum)
+        channels = value.shape[1:]
+        if self._in_fmt is None:
+            self._in_fmt, self._channels = value.fmt, channels
+        elif value.fmt != self._in_fmt or channels != self._channels:
+            raise ValueError("_ERROR_: input format %s and channels %s differ from the previous blocks ones %s %s." %
+                             (value.fmt, channels, self._in_fmt, self._channels))
+
+        # common fractional bits of the exact sums
+        frac_bits = max(self._in_fmt.frac_bits, self.out_fmt.frac_bits) + self.sos.fmt.frac_bits
+        if self.structure is EIirStructure.DF2T:
+            frac_bits = max(frac_bits, self.state_fmt.frac_bits)
+        work_bits = self.sos.fmt.bit_length + 3 + max(
+            x.bit_length + frac_bits - self.sos.fmt.frac_bits - x.frac_bits for x in [self._in_fmt, self.out_fmt])
+        work_bits = max(work_bits, self.state_fmt.bit_length + frac_bits - self.state_fmt.frac_bits + 3)
+
+        if self.sos.shape[2:] not in [(), channels]:
+            raise ValueError("_ERROR_: coefficients channels %s differ from the input ones %s." %
+                             (self.sos.shape[2:], channels))
+        num_chan = int(np.prod(channels, dtype=np.int64))
+        coeffs = np.reshape(_as_work(_mant_of(self.sos), work_bits), (self.sections, 6, -1))
+
+        if self._state is None:
+            self._state = [np.zeros((4, num_chan), dtype=_as_work(0, work_bits).dtype) for _ in range(self.sections)]
+
+        mant = np.reshape(_as_work(_mant_of(value), work_bits), (value.shape[0], num_chan))
+        in_fmt = self._in_fmt
+        for section in range(self.sections):
+            mant = self._section(section, mant, in_fmt, coeffs[section], frac_bits, work_bits)
+            in_fmt = self.out_fmt
+
+        return fix.FixNum.from_raw(np.reshape(_as_work(mant, self.out_fmt.bit_length), value.shape), self.out_fmt,
+                                   *self.out_fimath)
+
+    # private methods
+    def _section(self, section, mant, in_fmt, coeffs, frac_bits, work_bits):
+        """Filter the (time, channels) input mantissas through a section, its state is updated."""
+
+        # feed-forward coefficients aligned to the sums fractional bits, feedback ones to the output
+        b_coeffs = coeffs[:3] << (frac_bits - self.sos.fmt.frac_bits - in_fmt.frac_bits)
+        a_coeffs = coeffs[4:] << (frac_bits - self.sos.fmt.frac_bits - self.out_fmt.frac_bits)
+        state = self._state[section]
+        # single channel: the recursion runs on python integers
+        single = mant.shape[1] == 1
+        quant = [fix.FixScalar.from_raw(0, fmt, *fimath) if single else
+                 fix.FixNum._new(fmt, *fimath)  # pylint: disable=protected-access
+                 for fmt, fimath in [(self.out_fmt, self.out_fimath), (self.state_fmt, self.state_fimath)]]
+        out = np.empty(mant.shape, dtype=_as_work(0, work_bits).dtype)
+
+        if self.structure is EIirStructure.DF1:
+            # state: x[n-2], x[n-1], y[n-2], y[n-1]
+            ext_mant = np.concatenate((state[:2], mant))
+            feed_fwd = b_coeffs[0] * ext_mant[2:] + b_coeffs[1] * ext_mant[1:-1] + b_coeffs[2] * ext_mant[:-2]
+            args = _kernel_args(single, [feed_fwd], a_coeffs, state[2:])
+            state[2:] = np.reshape(_df1_kernel(out, *args, quant[0], frac_bits - self.out_fmt.frac_bits), (2, -1))
+            state[:2] = ext_mant[ext_mant.shape[0] - 2:]
+        else:
+            # state: s1, s2
+            args = _kernel_args(single, [x * mant for x in b_coeffs], a_coeffs, state[:2])
+            state[:2] = np.reshape(_df2t_kernel(out, *args, quant, frac_bits - self.out_fmt.frac_bits,
+                                                frac_bits - self.state_fmt.frac_bits), (2, -1))
+
+        return out
+
+
+class Nco:
+    """Bit-true numerically controlled oscillator.
+
+    The phase accumulator is an unsigned *acc_bits* bits register holding the phase in cycles, it is incremented
+    by the frequency control word at each sample and wraps exactly as ```Wrap``` overflow method. Each sample:
+
+    * the accumulator content (before the increment) is optionally dithered by adding a uniform pseudo-random
+      integer of *dither_bits* bits aligned to the most significant truncated bit (wrapping)
+    * the phase is truncated to its *phase_bits* most significant bits
+    * cosine and sine are read from look-up tables of 2**addr_bits segments over a cycle, linearly interpolated
+      when *addr_bits* < *phase_bits* (see :class:`pyphix.funcgen.Lut`)
+
+    The phases of a whole block are computed at once as a cumulative sum of the increments on the integer
+    mantissas. The accumulator and the dither generator state are kept between two :meth:`process` calls
+    (streaming).
+
+    Ex:
+
+    >>> from pyphix import fix, dsp
+    >>> nco = dsp.Nco(.1, 32, 12, fix.FixFmt(True, 1, 14))
+    >>> cos_fix, sin_fix = nco.process(1000)
+
+    :param freq: frequency in cycles per sample, quantized to the *acc_bits* resolution.
+    :param acc_bits: phase accumulator bits.
+    :param phase_bits: truncated phase bits.
+    :param out_fmt: cosine and sine output format.
+    :param addr_bits: look-up table address bits (*phase_bits* if None).
+    :param table_fmt: look-up table entries format (*out_fmt* if None).
+    :param dither_bits: phase dither bits (0 disables the dithering).
+    :param phase: initial phase in cycles, quantized to the *acc_bits* resolution.
+    :param rnd: round method of the frequency, of the initial phase, of the table entries and of the output.
+    :param over: output overflow method.
+    :param seed: seed of the dither generator.
+
+    :type freq: float
+    :type acc_bits: int
+    :type phase_bits: int
+    :type out_fmt: fix.FixFmt
+    :type addr_bits: int or None
+    :type table_fmt: fix.FixFmt or None
+    :type dither_bits: int
+    :type phase: float
+    :type rnd: str
+    :type over: str
+    :type seed: int or None
+    """
+
+    # pylint: disable=too-many-instance-attributes,too-many-arguments
+
+    def __init__(self, freq, acc_bits, phase_bits, out_fmt, addr_bits=None, table_fmt=None, dither_bits=0,
+                 phase=0., rnd="SymZero", over="Sat", seed=0):
+
+        self.acc_fmt = fix.FixFmt(False, 0, gu.check_args(acc_bits, int))
+        self.phase_bits = gu.check_args(phase_bits, int)
+        if not 0 < phase_bits <= acc_bits:
+            raise ValueError("_ERROR_: phase bits must be between 1 and %d." % acc_bits)
+        self.dither_bits = gu.check_args(dither_bits, int)
+        if not 0 <= dither_bits <= acc_bits - phase_bits:
+            raise ValueError("_ERROR_: dither bits must be between 0 and %d." % (acc_bits - phase_bits))
+        self.rnd = gu.check_enum(rnd, fix.ERoundMethod)
+        self.seed = seed
+
+        # frequency control word: signed, one cycle range
+        self.fcw_fmt = fix.FixFmt(True, 0, acc_bits)
+        self._fcw = fix.FixScalar(freq, self.fcw_fmt, self.rnd, "Wrap").mant
+        self._init_phase = fix.FixScalar(phase, self.acc_fmt, self.rnd, "Wrap").mant
+
+        addr_bits = phase_bits if addr_bits is None else gu.check_args(addr_bits, int)
+        phase_fmt = fix.FixFmt(False, 0, phase_bits)
+        self._luts = [funcgen.Lut(fn, phase_fmt, addr_bits, out_fmt if table_fmt is None else table_fmt, out_fmt,
+                                  None, rnd, over, addr_bits < phase_bits) for fn in (_cos_cycle, _sin_cycle)]
+
+        # oscillator state: accumulator mantissa and dither generator
+        self._acc = None
+        self._dither = None
+        self.reset()
+
+    @property
+    def freq(self):
+        """Return the quantized frequency in cycles per sample."""
+
+        return fix.FixScalar.from_raw(self._fcw, self.fcw_fmt)
+
+    @property
+    def phase(self):
+        """Return the phase accumulator content in cycles."""
+
+        return fix.FixScalar.from_raw(self._acc, self.acc_fmt)
+
+    def reset(self):
+        """Set the phase accumulator to the initial phase and restart the dither generator."""
+
+        self._acc = self._init_phase
+        self._dither = np.random.RandomState(self.seed) if self.dither_bits else None
+
+    def process(self, num_samples, freq_mod=None):
+        """Generate a block of cosine and sine samples, the oscillator state is updated.
+
+        Generating a signal in consecutive blocks gives the same result as generating it at once.
+
+        :param num_samples: number of samples.
+        :param freq_mod: per-sample frequency offsets in cycles per sample (shape (num_samples,)), quantized to the
+                         *acc_bits* resolution and added to the frequency control word.
+
+        :type num_samples: int
+        :type freq_mod: fix.FixNum or None
+
+        :return: tuple in the form (cos, sin).
+        :rtype: tuple[fix.FixNum, fix.FixNum]"""
+
+        gu.check_args(num_samples, int)
+        work_bits = self.acc_fmt.bit_length + num_samples.bit_length() + 2
+        incr = np.full(num_samples, self._fcw, dtype=_as_work(0, work_bits).dtype)
+        if freq_mod is not None:
+            freq_mod = fix.FixNum(gu.check_args(freq_mod, fix.FixNum), self.fcw_fmt, self.rnd, "Wrap")
+            if freq_mod.shape != (num_samples,):
+                raise ValueError("_ERROR_: frequency offsets shape %s differs from (%d,)." %
+                                 (freq_mod.shape, num_samples))
+            incr += _as_work(_mant_of(freq_mod), work_bits)
+
+        # accumulator before each increment and after the last one, wrapped at once
+        acc_reg = fix.FixNum._new(self.acc_fmt, self.rnd, "Wrap")  # pylint: disable=protected-access
+        acc = acc_reg._over(self._acc + np.concatenate(([0], np.cumsum(incr))))  # pylint: disable=protected-access
+        self._acc = int(acc[-1])
+        acc = acc[:-1]
+
+        trunc_bits = self.acc_fmt.bit_length - self.phase_bits
+        if self._dither is not None:
+            dither = self._dither.randint(0, 1 << self.dither_bits, num_samples, dtype=np.int64)
+            dither = _as_work(dither, self.acc_fmt.bit_length + 1) << (trunc_bits - self.dither_bits)
+            acc = acc_reg._over(acc + dither)  # pylint: disable=protected-access
+
+        phase = fix.FixNum.from_raw(_as_work(acc >> trunc_bits, self.phase_bits), self._luts[0].in_fmt)
+        return tuple(x.process(phase) for x in self._luts)
+
+
+# private methods
+# twiddle factors ROMs, keyed on (size, fmt, rnd)
+_TWIDDLE_ROMS = {}
+
+
+def _cos_cycle(phase):
+    """Cosine of a phase in cycles."""
+
+    return np.cos(2 * np.pi * phase)
+
+
+def _sin_cycle(phase):
+    """Sine of a phase in cycles."""
+
+    return np.sin(2 * np.pi * phase)
+
+
+def _check_signed(fmt):
+    """Return a format if signed, raise ValueError otherwise."""
+
+    if not fmt.signed:
+        raise ValueError("_ERROR_: data format %s must be signed." % fmt)
+
+    return fmt
+
+
+def _per_stage(value, exp_enum, num_stages):
+    """Return a list of *num_stages* enums out of a single value or a list (one value per stage)."""
+
+    if isinstance(value, (str, exp_enum)):
+        return [gu.check_enum(value, exp_enum)] * num_stages
+
+    value = [gu.check_enum(x, exp_enum) for x in value]
+    if len(value) != num_stages:
+        raise ValueError("_ERROR_: %d values expected, one per stage." % num_stages)
+
+    return value
+
+
+def _twiddle_rom(size, fmt, rnd):
+    """Return the (cached, read-only) interleaved mantissas of the W^k = exp(-2j*pi*k/size) twiddle factors."""
+
+    try:
+        return _TWIDDLE_ROMS[(size, fmt, rnd)]
+    except KeyError:
+        pass
+
+    phase = np.arange(size)
+    rom = np.exp(-2j * np.pi * phase / size)
+    # exact values on the axes (the float residues, e.g. cos(pi/2), may be rounded to one LSB)
+    on_axes = (4 * phase) % size == 0
+    rom[on_axes] = np.array([1, -1j, -1, 1j])[4 * phase[on_axes] // size]
+
+    rom = _mant_of(fix.FixComplex(rom, fmt, rnd, "Sat")._parts)  # pylint: disable=protected-access
+    rom.flags.writeable = False
+
+    return _TWIDDLE_ROMS.setdefault((size, fmt, rnd), rom)
+
+
+def _kernel_args(single, feed_fwd, a_coeffs, state):
+    """Return the recursion kernel arguments (feed-forward terms, a1, a2, state), python integers for a single
+    channel."""
+
+    if single:
+        return ([x[:, 0].tolist() for x in feed_fwd], *[int(x[0]) for x in a_coeffs], [int(x[0]) for x in state])
+
+    return (feed_fwd, a_coeffs[0], a_coeffs[1], list(state))
+
+
+def _df1_kernel(out, feed_fwd, a_1, a_2, state, quant, shift):
+    """Run the direct form I recursion, fill *out* and return the final state [y[n-2], y[n-1]]."""
+
+    y_2, y_1 = state
+    for idx, ff_n in enumerate(feed_fwd[0]):
+        y_0 = quant._over(quant._shift_round(ff_n - a_1 * y_1 - a_2 * y_2, shift))  # pylint: disable=protected-access
+        out[idx] = y_0
+        y_2, y_1 = y_1, y_0
+
+    return [y_2, y_1]
+
+
+def _df2t_kernel(out, feed_fwd, a_1, a_2, state, quant, out_shift, state_shift):
+    """Run the transposed direct form II recursion, fill *out* and return the final state [s1, s2].
+
+    The states are aligned to the sums fractional bits (*out_shift* - *state_shift* bits more than *state_fmt*)."""
+
+    # pylint: disable=protected-access,too-many-arguments
+    out_quant, state_quant = quant
+    s_1, s_2 = state
+    for idx, (ff_0, ff_1, ff_2) in enumerate(zip(*feed_fwd)):
+        y_0 = out_quant._over(out_quant._shift_round(ff_0 + (s_1 << state_shift), out_shift))
+        out[idx] = y_0
+        s_1 = state_quant._over(state_quant._shift_round(ff_1 - a_1 * y_0 + (s_2 << state_shift), state_shift))
+        s_2 = state_quant._over(state_quant._shift_round(ff_2 - a_2 * y_0, state_shift))
+
+    return [s_1, s_2]
+
+
+def _bfp_shift(mant, excess_bits, bit_length):
+    """Return the block floating point shift of each frame.
+
+    :param mant: exact stage outputs, shape (frames, size, 2).
+    :param excess_bits: fractional bits of the mantissas beyond the data format ones.
+    :param bit_length: data format bit length.
+
+    :type mant: numpy.ndarray
+    :type excess_bits: int
+    :type bit_length: int
+
+    :return: minimum right shifts making the largest outputs of each frame fit the data format.
+    :rtype: numpy.ndarray"""
+
+    # largest magnitude of each frame, negative values as their one's complement
+    frame_max = np.max(np.maximum(mant, ~mant), axis=(-2, -1))
+    shift = [max(0, int(x).bit_length() + 1 - excess_bits - bit_length) for x in np.ravel(frame_max)]
+
+    return np.reshape(np.array(shift, dtype=np.int64), frame_max.shape)
@@ -0,0 +1,153 @@
+"""Module implementing word-length exploration facilities."""
+
+__author__ = "Samuele FAVAZZA"
+__copyright__ = "Copyright 2018, Samuele FAVAZZA"
+
+import itertools
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from . import fix
+from . import generalutil as gu
+
+
+SweepResult = namedtuple('SweepResult', ['fmt', 'rnd', 'over', 'sqnr', 'max_error', 'mean_error', 'rms_error'])
+SweepResult.__doc__ = """Error statistics of one sweep configuration (errors are expressed in real units, SQNR in dB)."""
+
+
+def sweep(fn, in_vec, formats, rnd=("SymZero", ), over=("Wrap", ), ref_out=None, workers=None):
+    """Run a fix-point algorithm on every (format, round method, overflow method) combination and measure the
+    error against the floating point reference.
+
+    The configurations are distributed over a pool of *workers* processes, the input and reference vectors are
+    shared through shared memory (they are not pickled for each task).
+    *fn* is called as ``fn(in_vec, fmt, rnd, over)`` and must return the algorithm output (FixNum or float
+    array with the same shape of *ref_out*), it must be picklable (i.e. a module level function) unless
+    *workers* is 1.
+
+    Ex:
+
+    >>> from pyphix import fix, explore
+    >>> def quantize(in_vec, fmt, rnd, over):
+            return fix.FixNum(in_vec, fmt, rnd, over)
+    >>> results = explore.sweep(quantize, capture, [fix.FixFmt(True, 0, x) for x in range(8, 17)],
+                                rnd=['SymZero', 'ConvEven'], over=['Sat'])
+    >>> print(explore.format_table(results))
+
+    :param fn: algorithm under test.
+    :param in_vec: floating point input.
+    :param formats: formats to explore.
+    :param rnd: round methods to explore.
+    :param over: overflow methods to explore.
+    :param ref_out: floating point reference output (*in_vec* if None, i.e. plain quantization).
+    :param workers: number of worker processes (CPU count if None), 1 runs the sweep in the calling process.
+
+    :type fn: callable
+    :type in_vec: numpy.ndarray
+    :type formats: iterable[fix.FixFmt]
+    :type rnd: iterable[str]
+    :type over: iterable[str]
+    :type ref_out: numpy.ndarray or None
+    :type workers: int or None
+
+    :return: one result per configuration, in the order given by itertools.product(formats, rnd, over).
+    :rtype: list[SweepResult]"""
+
+    in_vec = np.asarray(in_vec, dtype=np.float64)
+    ref_out = in_vec if ref_out is None else np.asarray(ref_out, dtype=np.float64)
+    configs = list(itertools.product(gu.check_args_list(list(formats), list, fix.FixFmt),
+                                     [gu.check_enum(x, fix.ERoundMethod) for x in _as_list(rnd)],
+                                     [gu.check_enum(x, fix.EOverMethod) for x in _as_list(over)]))
+    if workers is not None and gu.check_args(workers, int) < 1:
+        raise ValueError("_ERROR_: workers must be positive.")
+
+    if workers == 1:
+        stats = [_error_stats(fn(in_vec, *cfg), ref_out) for cfg in configs]
+        return [SweepResult(*cfg, *x) for cfg, x in zip(configs, stats)]
+
+    shm_list = [_to_shared(in_vec), _to_shared(ref_out)]
+    try:
+        shm_args = [(x.name, y.shape) for x, y in zip(shm_list, [in_vec, ref_out])]
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=shm_args) as pool:
+            chunk_size = max(1, len(configs) // (4 * pool._max_workers))  # pylint: disable=protected-access
+            stats = list(pool.map(_run_config, itertools.repeat(fn), configs, chunksize=chunk_size))
+    finally:
+        for shm in shm_list:
+            shm.close()
+            shm.unlink()
+
+    return [SweepResult(*cfg, *x) for cfg, x in zip(configs, stats)]
+
+
+def format_table(results):
+    """Format sweep results as a text table (one row per configuration).
+
+    :param results: sweep results.
+
+    :type results: list[SweepResult]
+
+    :return: table.
+    :rtype: str"""
+
+    rows = ["%-22s %-10s %-5s %9s %12s %12s %12s" % ('format', 'round', 'over', 'SQNR[dB]',
+                                                    'max error', 'mean error', 'rms error')]
+    for res in results:
+        rows.append("%-22s %-10s %-5s %9.2f %12.4e %12.4e %12.4e" %
+                    (res.fmt, res.rnd.value, res.over.value, res.sqnr, res.max_error, res.mean_error,
+                     res.rms_error))
+
+    return '\n'.join(rows)
+
+
+# private methods
+# worker process view of the shared vectors (see _init_worker)
+_SHARED = {}
+
+
+def _as_list(value):
+    """Turn a single method into a list."""
+
+    return [value] if isinstance(value, (str, fix.ERoundMethod, fix.EOverMethod)) else list(value)
+
+
+def _to_shared(value):
+    """Copy a float vector into a new shared memory block."""
+
+    shm = shared_memory.SharedMemory(create=True, size=max(1, value.nbytes))
+    np.ndarray(value.shape, dtype=np.float64, buffer=shm.buf)[...] = value
+
+    return shm
+
+
+def _init_worker(in_args, ref_args):
+    """Attach the worker process to the shared input and reference vectors."""
+
+    for key, (name, shape) in zip(['in_vec', 'ref_out'], [in_args, ref_args]):
+        shm = shared_memory.SharedMemory(name=name)
+        value = np.ndarray(shape, dtype=np.float64, buffer=shm.buf)
+        value.flags.writeable = False
+        # keep the shared memory object alive along with its view
+        _SHARED[key] = (shm, value)
+
+
+def _run_config(fn, cfg):
+    """Run one configuration in a worker process and return its error statistics."""
+
+    return _error_stats(fn(_SHARED['in_vec'][1], *cfg), _SHARED['ref_out'][1])
+
+
+def _error_stats(out, ref_out):
+    """Return (sqnr, max_error, mean_error, rms_error) of an output against its reference."""
+
+    out = out.value if isinstance(out, fix.FixNum) else np.asarray(out, dtype=np.float64)
+    error = np.reshape(out, ref_out.shape) - ref_out
+
+    err_pow = np.mean(error**2) if error.size else 0.
+    sig_pow = np.mean(ref_out**2) if ref_out.size else 0.
+    sqnr = np.inf if err_pow == 0 else 10 * np.log10(sig_pow / err_pow) if sig_pow else -np.inf
+
+    return (float(sqnr), float(np.max(np.abs(error), initial=0.)), float(np.mean(error)) if error.size else 0.,
+            float(np.sqrt(err_pow)))
@@ -1,8 +1,11 @@
+import math
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from enum import Enum
+from functools import partial
 
 import numpy as np
 from numpy import bitwise_and as np_and
-from numpy import bitwise_not as np_not
 from . import generalutil as gu
 
 __author__ = "Samuele FAVAZZA"
@@ -47,16 +50,66 @@ class FixFmt:
     :type signed: bool
     :type int_bits: int
     :type frac_bits: int
+
+    Format objects are immutable and interned: creating twice the same format returns the same object.
+    They are hashable (thus usable as dictionary keys) and all the derived constants (masks, limits, scale
+    factor) are computed once at creation.
     """
 
-    def __init__(self, signed, int_bits, frac_bits):
+    __slots__ = ('signed', 'int_bits', 'frac_bits',
+                 '_key', '_bit_length', '_mask', '_scale', '_intrange', '_fixrange')
+
+    # interned formats, keyed on (signed, int_bits, frac_bits)
+    _interned = {}
+
+    def __new__(cls, signed, int_bits, frac_bits):
+
+        # fast path: already created format (exact types only, avoid True == 1 and 2.0 == 2 matches)
+        if type(signed) is bool and type(int_bits) is int and type(frac_bits) is int:  # pylint: disable=unidiomatic-typecheck
+            try:
+                return cls._interned[(signed, int_bits, frac_bits)]
+            except KeyError:
+                pass
 
         if int_bits < 0 or frac_bits < 0:
             raise ValueError("Integer and fractional sizes must be positive.")
 
-        self.signed = gu.check_args(signed, bool)
-        self.int_bits = gu.check_args(int_bits, int)
-        self.frac_bits = gu.check_args(frac_bits, int)
+        obj = super().__new__(cls)
+        init_attr = partial(object.__setattr__, obj)
+        init_attr('signed', gu.check_args(signed, bool))
+        init_attr('int_bits', gu.check_args(int_bits, int))
+        init_attr('frac_bits', gu.check_args(frac_bits, int))
+        init_attr('_key', (obj.signed, obj.int_bits, obj.frac_bits))
+
+        # derived constants
+        init_attr('_bit_length', int(obj.signed) + obj.int_bits + obj.frac_bits)
+        init_attr('_mask', (1 << obj._bit_length) - 1)
+        init_attr('_scale', 1 << obj.frac_bits)
+        init_attr('_intrange', (-(1 << (obj._bit_length - 1)) if obj.signed else 0,
+                                (1 << (obj._bit_length - obj.signed)) - 1))
+        init_attr('_fixrange', (obj._intrange[0] / obj._scale, obj._intrange[1] / obj._scale))
+
+        # in case of concurrent creation the first stored object wins
+        return cls._interned.setdefault(obj._key, obj)
+
+    def __setattr__(self, name, value):
+        raise AttributeError("'%s' object is immutable" % gu.get_class_name(self))
+
+    def __delattr__(self, name):
+        raise AttributeError("'%s' object is immutable" % gu.get_class_name(self))
+
+    def __reduce__(self):
+        # unpickled/copied objects are interned as well
+        return (FixFmt, self._key)
+
+    def __eq__(self, other):
+        return isinstance(other, FixFmt) and self._key == other._key
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __hash__(self):
+        return hash(self._key)
 
     def __str__(self):
         return "(%s, %s, %s)" % (self.signed, self.int_bits, self.frac_bits)
@@ -81,12 +134,17 @@ class FixFmt:
         >>> bin(fmt.mask)
             '0b1111111111111'"""
 
-        return 2**self.bit_length - 1
+        return self._mask
 
     @property
     def bit_length(self):
         """Return the number of bits required to represent a number with current fix format."""
-        return int(self.signed) + self.int_bits + self.frac_bits
+        return self._bit_length
+
+    @property
+    def scale(self):
+        """Return the coefficient turning a value into its integer mantissa (2**frac_bits)."""
+        return self._scale
 
     def _minmaxvalueformatter(self, value, fmt):
         """Return value in desired expressed format.
@@ -123,31 +181,34 @@ class FixFmt:
 
         # ensure the given fmt is correct
         _fmt = gu.check_enum(fmt, EFormat)
-        maxvalue_int = (1 << (self.bit_length - 1)) - 1 if self.signed else \
-                       (1 << (self.bit_length)) - 1
 
-        return self._minmaxvalueformatter(maxvalue_int, _fmt)
+        return self._minmaxvalueformatter(self._intrange[1], _fmt)
 
     def minvalue(self, fmt='float'):
         """Return min representable value by current fix format objext."""
 
         # ensure the given fmt is correct
         _fmt = gu.check_enum(fmt, EFormat)
-        minvalue_int = -2**(self.bit_length - 1) if self.signed else 0
 
-        return self._minmaxvalueformatter(minvalue_int, _fmt)
+        return self._minmaxvalueformatter(self._intrange[0], _fmt)
+
+    @property
+    def intrange(self):
+        """Return the integer mantissa range representable by fix format object as tuple (min, max)."""
+
+        return self._intrange
 
     @property
     def fixrange(self):
         """Return the range representable by fix format object as tuple (min, max)."""
 
-        return (self.minvalue(), self.maxvalue())
+        return self._fixrange
 
     @property
     def tuplefmt(self):
         """Return object as a tuple."""
 
-        return (self.signed, self.int_bits, self.frac_bits)
+        return self._key
 
     @property
     def listfmt(self):
@@ -156,7 +217,7 @@ class FixFmt:
         return [self.signed, self.int_bits, self.frac_bits]
 
     def __contains__(self, elem):
-        return self.minvalue() <= elem <= self.maxvalue()
+        return self._fixrange[0] <= elem <= self._fixrange[1]
 
 
 class FixNum:
@@ -190,12 +251,15 @@ class FixNum:
     | ``Wrap``         | wrap around -- DEFAULT |
     +------------------+------------------------+
 
+    The number is stored as integer mantissa (``np.int64`` up to 63 bits, python integers beyond), arithmetic
+    and casting operate directly on it without any precision loss.
+
     :param value: value to represent in fix point
     :param fmt: fix point format
     :param rnd: round method
     :param over: overflow method
 
-    :type value: np.ndarray(ndim > 0) or float
+    :type value: np.ndarray(ndim > 0) or float or FixNum
     :type fmt: FixFmt
     :type rnd: str
     :type over: str
@@ -206,28 +270,107 @@ class FixNum:
     def __init__(self, value, fmt, rnd="SymZero", over="Wrap"):
 
         # init instance members
+        self._init_fimath(fmt, rnd, over)
+
+        try:
+            if isinstance(value, FixNum):
+                # re-quantize directly from the integer mantissas, no float round trip
+                self._mant = self._quantize_int(value._mant, value.fmt.frac_bits, value.fmt.bit_length)
+                self.shape = value.shape
+            else:
+                # turn into array
+                value, self.shape = self._to_array(value)
+                # round and overflow process in int format
+                self._mant = self._float2mant(value)
+
+        except ValueError:
+            print('Wrong input value type, only numeric list/np.arrays are allowed')
+            raise
+
+    def _init_fimath(self, fmt, rnd, over):
+        """Check and store format and fimath, derive the internal constants."""
+
         self.fmt = gu.check_args(fmt, FixFmt)
         self.rnd = gu.check_enum(rnd, ERoundMethod)
         self.over = gu.check_enum(over, EOverMethod)
-        self._index = 0         # for generator feature
 
         # internal constants
-        self._to_int_coeff = 2**self.fmt.frac_bits  # to integer representation coefficient
-        self._fix_size_mask = (1 << self.fmt.bit_length) - 1  # correct representation
+        self._to_int_coeff = self.fmt.scale  # to integer representation coefficient
+        self._fix_size_mask = self.fmt.mask  # correct representation
+
+    @classmethod
+    def _from_int(cls, mant, frac_bits, bit_length, fmt, rnd, over):
+        """Create a fix-point object out of an integer mantissa array.
+
+        The mantissa is re-quantized (rounded and overflowed) to the target format.
+
+        :param mant: integer mantissa (np.int64 or object array).
+        :param frac_bits: number of fractional bits the mantissa is expressed with.
+        :param bit_length: number of bits needed to represent the mantissa.
+        :param fmt: target fix point format.
+        :param rnd: round method.
+        :param over: overflow method.
+
+        :type mant: numpy.ndarray
+        :type frac_bits: int
+        :type bit_length: int
+        :type fmt: FixFmt
+        :type rnd: ERoundMethod or str
+        :type over: EOverMethod or str
+
+        :return: new fix-point object.
+        :rtype: FixNum"""
 
-        # always cast to np.float64
-        try:
-            # turn into array
-            self.value, self.shape = self._to_array(value)
-            # round and overflow process in int format
-            self.value = self._over(self._round(self.value * self._to_int_coeff))
+        obj = cls._new(fmt, rnd, over)
 
-            # back to float
-            self.value = self.value / self._to_int_coeff
+        mant = np.asarray(mant)
+        obj.shape = mant.shape if mant.shape else (1, )
+        obj._mant = obj._quantize_int(np.reshape(mant, obj.shape), frac_bits, bit_length)  # pylint: disable=protected-access
 
-        except ValueError:
-            print('Wrong input value type, only numeric list/np.arrays are allowed')
-            raise
+        return obj
+
+    @classmethod
+    def from_raw(cls, mant, fmt, rnd="SymZero", over="Wrap"):
+        """Create a fix-point object out of an already quantized integer mantissa.
+
+        This is the fast constructor: the mantissa is neither copied (when already in storage type) nor
+        rounded or overflowed, thus it **must** be representable by the given format.
+
+        Ex:
+
+        >>> from pyphix import fix
+        >>> fix.FixNum.from_raw([3, -4], fix.FixFmt(True, 2, 2)).value
+            array([ 0.75, -1.  ])
+
+        :param mant: integer mantissa, the value multiplied by 2**fmt.frac_bits.
+        :param fmt: fix point format.
+        :param rnd: round method.
+        :param over: overflow method.
+
+        :type mant: numpy.ndarray or int
+        :type fmt: FixFmt
+        :type rnd: ERoundMethod or str
+        :type over: EOverMethod or str
+
+        :return: new fix-point object.
+        :rtype: FixNum"""
+
+        obj = cls._new(fmt, rnd, over)
+
+        mant = _as_work(mant, obj.fmt.bit_length)
+        obj.shape = mant.shape if mant.shape else (1, )
+        obj._mant = np.reshape(mant, obj.shape)  # pylint: disable=protected-access
+
+        return obj
+
+    @classmethod
+    def _new(cls, fmt, rnd, over):
+        """Create an object with the given format and fimath but no value."""
+
+        obj = cls.__new__(cls)
+        obj._init_fimath(fmt, rnd, over)  # pylint: disable=protected-access
+
+        return obj
 
     # support methods
     @staticmethod
@@ -237,11 +380,12 @@ class FixNum:
         return np.reshape(value, -1)
 
     def _tmp_int(self):
-        """Geneate integer representation of the fix object."""
+        """Geneate integer representation of the fix object.
+
+        The two's complement representation is obtained masking the whole mantissa vector at once
+        (python integers object arrays are used beyond 63 bits)."""
 
-        tmp_value = self._value2line(self.value) * 2**self.fmt.frac_bits
-        return np.array([np.int(x) if x >= 0 else
-                         (np.int(x) & self._fix_size_mask) for x in tmp_value])
+        return np_and(self._value2line(self._mant), self._fix_size_mask)
 
     @staticmethod
     def _to_array(value):
@@ -261,78 +405,164 @@ class FixNum:
         return (np.reshape(value, shape), shape)
 
     # private methods
-    def _round(self, value):
+    def _round(self, value, out=None, bit_length=None):
         """Round input using object rounding method.
 
-        :param value: an indexable object.
+        The value is split into floor and remainder parts, the rounding carry is then computed in a
+        branch-free way (see :meth:`_round_carry`).
+
+        :param value: value scaled to integer representation, used as scratch buffer (its content is lost).
+        :param out: optional np.int64 buffer (same shape of value) the rounded mantissa is written to.
+        :param bit_length: bit length of the rounded value (object format one if None).
 
         :type value: numpy.ndarray
+        :type out: numpy.ndarray or None
+        :type bit_length: int or None
 
         :return: rounded value.
         :rtype: numpy.ndarray
         """
 
-        if self.rnd is ERoundMethod.SYM_INF:
-            value[value > 0] += .5
-            value[value < 0] -= .5
-        elif self.rnd is ERoundMethod.SYM_ZERO:
-            value[value > 0] += .4
-            value[value < 0] -= .4
-        elif self.rnd is ERoundMethod.NON_SYM_POS:
-            value[value > 0] += .5
-            value[value < 0] -= .4
-        elif self.rnd is ERoundMethod.NON_SYM_NEG:
-            value[value > 0] += .4
-            value[value < 0] -= .5
-        elif self.rnd in [ERoundMethod.CONV_EVEN, ERoundMethod.CONV_ODD]:
-            even_sel, odd_sel = value.astype(int) % 2 == 0, value.astype(int) % 2 != 0
-            # even
-            value[np.logical_and(even_sel, value > 0)] += .4 if self.rnd is ERoundMethod.CONV_EVEN else .5
-            value[np.logical_and(even_sel, value < 0)] -= .4 if self.rnd is ERoundMethod.CONV_EVEN else .5
-            # odd
-            value[np.logical_and(odd_sel, value > 0)] += .5 if self.rnd is ERoundMethod.CONV_EVEN else .4
-            value[np.logical_and(odd_sel, value < 0)] -= .5 if self.rnd is ERoundMethod.CONV_EVEN else .4
-        elif self.rnd is ERoundMethod.FLOOR:
-            # round to the previous largest
-            value = np.floor(value)
-        elif self.rnd is ERoundMethod.CEIL:
-            # round to the next smallest
-            value = np.ceil(value)
-        else:
-            raise ValueError("_ERROR_: %r is not valid round value." % self.rnd)
+        floor_part = np.floor(value)
+        carry = self._round_carry(floor_part, np.subtract(value, floor_part, out=value), .5)
+
+        bit_length = self.fmt.bit_length if bit_length is None else bit_length
+        if out is None and bit_length > _INT64_BITS:
+            return _float2mant(floor_part + carry, bit_length)
+
         # convert to integer
-        return value.astype(int)
+        return np.add(floor_part, carry, out=out, dtype=np.int64, casting='unsafe')
+
+    def _float2mant(self, value):
+        """Round and overflow float values into a mantissa in storage type.
+
+        Values whose scaled magnitude may not fit a np.int64 (as well as formats wider than it) are rounded to
+        python integers, so that saturation and wrapping stay exact."""
+
+        if self.fmt.bit_length <= _INT64_BITS and not np.max(np.abs(value), initial=0) * self._to_int_coeff >= 2.**62:
+            return _chunked(self._quantize_float, value.shape, value)
+
+        mant = self._round(value * self._to_int_coeff, bit_length=_INT64_BITS + 1)
+        return _as_work(self._over(mant, out=mant), self.fmt.bit_length)
+
+    def _quantize_float(self, out, value):
+        """Round and overflow a block of float values into the np.int64 *out* buffer (see :func:`_chunked`)."""
+
+        self._round(value * self._to_int_coeff, out=out)
+        self._over(out, out=out)
+
+    def _round_carry(self, floor_part, rem_part, half):
+        """Return the increment to apply on the floor part according to the object rounding method.
+
+        The rules are looked up in _ROUND_LUT, the same kernel serves float and integer values.
 
-    def _over(self, value):
+        :param floor_part: floor of the value to round.
+        :param rem_part: remainder of the value to round (value - floor_part).
+        :param half: half of the least significant bit kept after the rounding.
+
+        :type floor_part: numpy.ndarray
+        :type rem_part: numpy.ndarray
+        :type half: int or float
+
+        :return: rounding carry.
+        :rtype: numpy.ndarray(dtype=bool)"""
+
+        try:
+            threshold, tie_rule = _ROUND_LUT[self.rnd]
+        except KeyError:
+            raise ValueError("_ERROR_: %r is not valid round value." % self.rnd)
+
+        threshold = threshold * half
+        if tie_rule is True:
+            return np.greater_equal(rem_part, threshold)
+
+        carry = np.greater(rem_part, threshold)
+        if tie_rule is not None:
+            carry |= np.logical_and(rem_part == threshold, tie_rule(floor_part))
+
+        return carry
+
+    def _shift_round(self, mant, shift):
+        """Drop the *shift* least significant bits of an integer mantissa using object rounding method.
+
+        :param mant: integer mantissa.
+        :param shift: number of bits to drop, a negative value appends zeros instead (exact).
+
+        :type mant: numpy.ndarray
+        :type shift: int
+
+        :return: rounded mantissa.
+        :rtype: numpy.ndarray"""
+
+        if shift <= 0:
+            return mant << -shift
+
+        floor_part = mant >> shift
+        return floor_part + self._round_carry(floor_part, np_and(mant, (1 << shift) - 1), 1 << (shift - 1))
+
+    def _quantize_int(self, mant, frac_bits, bit_length):
+        """Round and overflow an integer mantissa to the object format.
+
+        :param mant: integer mantissa.
+        :param frac_bits: number of fractional bits the mantissa is expressed with.
+        :param bit_length: number of bits needed to represent the mantissa.
+
+        :type mant: numpy.ndarray
+        :type frac_bits: int
+        :type bit_length: int
+
+        :return: quantized mantissa in storage type.
+        :rtype: numpy.ndarray"""
+
+        shift = frac_bits - self.fmt.frac_bits
+        # left shifts grow the mantissa, wide right shifts are undefined on np.int64
+        work_bits = bit_length - shift if shift < 0 else bit_length
+        if shift >= _INT64_BITS:
+            work_bits = _INT64_BITS + 1
+        # the overflow masks of formats wider than np.int64 need python integers too
+        mant = _as_work(mant, max(work_bits, self.fmt.bit_length))
+
+        if max(work_bits, self.fmt.bit_length) <= _INT64_BITS:
+            return _chunked(partial(self._requantize, shift=shift), mant.shape, mant)
+
+        mant = self._shift_round(mant, shift)
+        return _as_work(self._over(mant, out=mant), self.fmt.bit_length)
+
+    def _requantize(self, out, mant, shift):
+        """Shift, round and overflow a block of np.int64 mantissas into the *out* buffer (see :func:`_chunked`)."""
+
+        self._over(self._shift_round(mant, shift), out=out)
+
+    def _over(self, value, out=None):
         """Apply current object overflow method on input value.
 
-        :param value: current object value.
+        Both methods are single ufunc passes: saturation clips to the format limits, wrap masks the value to
+        the format size and, for signed formats, sign extends it arithmetically ((value + sign) & mask) - sign.
 
-        :type value: numpy.ndarray or float
+        :param value: current object value (integer mantissa).
+        :param out: optional buffer the result is written to (same shape and type of value, value itself allowed).
+
+        :type value: numpy.ndarray
+        :type out: numpy.ndarray or None
 
         :return: overflowed value.
-        :rtype: numpy.ndarray or float"""
+        :rtype: numpy.ndarray"""
 
         if self.over is EOverMethod.SAT:
-            value = np.maximum(
-                np.minimum(value, self.fmt.maxvalue(fmt=EFormat.INT)),
-                self.fmt.minvalue(fmt=EFormat.INT))
-        elif self.over is EOverMethod.WRAP:
-            # selection masks
-            high_bit_mask = (1 << (self.fmt.bit_length-1))
-            # pos / neg selector
-            value = np_and(value, self._fix_size_mask)
-            pos_sel = np_and(value, high_bit_mask) == 0
-            neg_sel = np.logical_not(pos_sel)
-            if self.fmt.signed:
-                # non negative
-                value[pos_sel] = value[pos_sel]
-                # negative
-                value[neg_sel] = -np_and((np_not(value[neg_sel]) + 1), self._fix_size_mask)
-        else:
-            raise ValueError("_ERROR_: %r is not valid overflow value." % self.over)
+            min_int, max_int = self.fmt.intrange
+            value = np.minimum(value, max_int, out=out)
+            return np.maximum(value, min_int, out=value)
 
-        return value
+        if self.over is EOverMethod.WRAP:
+            if not self.fmt.signed:
+                return np_and(value, self._fix_size_mask, out=out)
+
+            sign_bit = 1 << (self.fmt.bit_length - 1)
+            value = np.add(value, sign_bit, out=out)
+            value = np_and(value, self._fix_size_mask, out=value)
+            return np.subtract(value, sign_bit, out=value)
+
+        raise ValueError("_ERROR_: %r is not valid overflow value." % self.over)
 
     # public methods
     def change_fix(self, new_fmt, new_rnd=None, new_over=None):
@@ -352,27 +582,95 @@ class FixNum:
         :rtype: FixFmt
         """
 
-        return FixNum(self.value, new_fmt,
-                      self.rnd if new_rnd is None else new_rnd,
-                      self.over if new_over is None else new_over)
+        tmp_rnd = self.rnd if new_rnd is None else new_rnd
+        tmp_over = self.over if new_over is None else new_over
+
+        if _fmt_includes(new_fmt, self.fmt):
+            # exact cast, only zeros are appended to the mantissa
+            tmp_mant = _as_work(self._mant, new_fmt.bit_length) << (new_fmt.frac_bits - self.fmt.frac_bits)
+            return FixNum.from_raw(tmp_mant, new_fmt, tmp_rnd, tmp_over)
+
+        return FixNum(self, new_fmt, tmp_rnd, tmp_over)
+
+    def copy(self):
+        """Return a copy of the object that does not share its mantissa buffer.
+
+        :return: copied fix-point object.
+        :rtype: FixNum"""
+
+        return FixNum.from_raw(self._mant.copy(), self.fmt, self.rnd, self.over)
+
+    @property
+    def value(self):
+        """Represent fix-point object in float format (np.float64)."""
+
+        return np.ldexp(self._mant.astype(np.float64), -self.fmt.frac_bits)
+
+    def strfmt(self, fmt='hex', prefix=True):
+        """Represent fix-point object as fixed width byte strings.
+
+        All the elements are formatted at once, the digits are extracted from the bytes of the two's complement
+        representation by means of lookup tables.
+
+        :param fmt: either hex or bin.
+        :param prefix: prepend '0x' or '0b' to each element.
+
+        :type fmt: EFormat or str
+        :type prefix: bool
+
+        :return: fixed width strings, same shape of the object.
+        :rtype: numpy.ndarray(dtype='S')"""
+
+        tmp_chars = self._digit_matrix(fmt, prefix, b'')
+        return np.reshape(tmp_chars.view('S%d' % tmp_chars.shape[1]), self.shape)
+
+    def bytesfmt(self, fmt='hex', prefix=True, sep=b'\n'):
+        """Represent fix-point object as a single bytes blob, each element is terminated by *sep*.
+
+        Elements are taken in row-major order. Useful to dump large vectors into test bench files.
+
+        :param fmt: either hex or bin.
+        :param prefix: prepend '0x' or '0b' to each element.
+        :param sep: element terminator.
+
+        :type fmt: EFormat or str
+        :type prefix: bool
+        :type sep: bytes
+
+        :return: formatted elements.
+        :rtype: bytes"""
+
+        return self._digit_matrix(fmt, prefix, sep).tobytes()
+
+    def _digit_matrix(self, fmt, prefix, sep):
+        """Return the ASCII characters (np.uint8 matrix, one row per element) representing the object."""
+
+        _fmt = gu.check_enum(fmt, EFormat)
+        if _fmt not in [EFormat.BIN, EFormat.HEX]:
+            raise ValueError("_ERROR_: %r is not a valid string format, only bin or hex are allowed." % _fmt)
+
+        tmp_digits = _int2digits(self._tmp_int(), self.fmt.bit_length, 1 if _fmt is EFormat.BIN else 4)
+        tmp_prefix = (b'0b' if _fmt is EFormat.BIN else b'0x') if prefix else b''
+
+        tmp_chars = np.empty((tmp_digits.shape[0], len(tmp_prefix) + tmp_digits.shape[1] + len(sep)),
+                             dtype=np.uint8)
+        tmp_chars[:, :len(tmp_prefix)] = np.frombuffer(tmp_prefix, dtype=np.uint8)
+        tmp_chars[:, len(tmp_prefix):tmp_chars.shape[1] - len(sep)] = tmp_digits
+        tmp_chars[:, tmp_chars.shape[1] - len(sep):] = np.frombuffer(sep, dtype=np.uint8)
+
+        return tmp_chars
 
     @property
     def binfmt(self):
         """Represent fix-point object in binary format."""
 
-        # correct string representation
-        tmp_bin = np.array([_bin2fixstring(x, self.fmt.bit_length) for x in self._tmp_int()])
-        return np.reshape(tmp_bin, self.shape)
+        return self.strfmt(EFormat.BIN).astype(str)
 
     @property
     def hexfmt(self):
         """Represent fix-point object in hexadecimal format."""
 
-        tmp_hex = np.array([hex(x) for x in self._value2line(self.intfmt)])
-        # correct string representation
-        tmp_hex = np.array(['0x' + (int(np.ceil(self.fmt.bit_length / 4)) - len(x[2:])) * '0' + x[2:]
-                            for x in tmp_hex])
-        return np.reshape(tmp_hex, self.shape)
+        return self.strfmt(EFormat.HEX).astype(str)
 
     @property
     def intfmt(self):
@@ -404,35 +702,92 @@ class FixNum:
     # # container methods
     def __contains__(self, elem):
         if isinstance(elem, FixNum):
-            return elem.value in self.value
+            return bool(np.any(self == elem))
         return elem in self.value
 
     def __getitem__(self, idx):
-        return FixNum(self.value[idx], self.fmt, self.rnd, self.over)
+        """Return the selected elements.
+
+        As for NumPy, basic slicing returns a view sharing the mantissa buffer with the parent object: writing
+        into the view (see ``__setitem__``) modifies the parent and vice-versa. Advanced indexing and single
+        element selection return a copy. Use :meth:`copy` to get an independent object out of a view."""
+
+        return FixNum.from_raw(self._mant[idx], self.fmt, self.rnd, self.over)
 
     def __setitem__(self, idx, repleace_value):
+        """Quantize the replacing value to the object format and fimath, then write it in place.
+
+        The write goes through to every object sharing the same mantissa buffer (views)."""
+
         if isinstance(repleace_value, FixNum):
-            self.value[idx] = self._over(self._round(
-                self._to_array(repleace_value.value)[0]*self._to_int_coeff))/self._to_int_coeff
+            tmp_mant = self._quantize_int(repleace_value._mant, repleace_value.fmt.frac_bits,
+                                          repleace_value.fmt.bit_length)
         else:
-            self.value[idx] = self._over(self._round(
-                self._to_array(repleace_value)[0]*self._to_int_coeff))/self._to_int_coeff
+            tmp_mant = self._float2mant(self._to_array(repleace_value)[0])
+        # single values are stored as 1-element arrays
+        self._mant[idx] = tmp_mant[0] if tmp_mant.size == 1 else tmp_mant
 
     def __len__(self):
-        return self.shape
+        return self.shape[0]
 
     # # generator
     def __iter__(self):
-        self._index = 0
-        return self
+        """Iterate over the first axis.
 
-    def __next__(self):
-        try:
-            ret = FixNum(self.value[self._index], self.fmt, self.rnd, self.over)
-            self._index += 1
-        except IndexError:
-            raise StopIteration
-        return ret
+        Each call returns an independent iterator, the elements are 1-element (or sub-array) views of the
+        object, no quantization is performed."""
+
+        for idx in range(self.shape[0]):
+            yield FixNum.from_raw(self._mant[idx:idx + 1] if len(self.shape) == 1 else self._mant[idx],
+                                  self.fmt, self.rnd, self.over)
+
+    def iter_raw(self, chunk_size=65536):
+        """Iterate over the integer mantissas (python integers) of all the elements in row-major order.
+
+        :param chunk_size: number of mantissas converted at once.
+
+        :type chunk_size: int
+
+        :return: generator of mantissas.
+        :rtype: generator[int]"""
+
+        tmp_line = self._value2line(self._mant)
+        for start in range(0, tmp_line.size, chunk_size):
+            yield from tmp_line[start:start + chunk_size].tolist()
+
+    def iter_scalars(self):
+        """Iterate over all the elements in row-major order as :class:`FixScalar` objects.
+
+        :return: generator of fix-point scalars.
+        :rtype: generator[FixScalar]"""
+
+        for mant in self.iter_raw():
+            yield FixScalar.from_raw(mant, self.fmt, self.rnd, self.over)
+
+    def item(self, *idx):
+        """Return the selected single element as :class:`FixScalar` (as ``numpy.ndarray.item``).
+
+        :param idx: element index (flat index or one index per dimension).
+
+        :type idx: int
+
+        :return: fix-point scalar.
+        :rtype: FixScalar"""
+
+        return FixScalar.from_raw(self._mant.item(*idx), self.fmt, self.rnd, self.over)
+
+    def iter_chunks(self, chunk_size):
+        """Iterate over chunks of *chunk_size* elements along the first axis (the last one may be shorter).
+
+        :param chunk_size: number of elements per chunk.
+
+        :type chunk_size: int
+
+        :return: generator of fix-point views.
+        :rtype: generator[FixNum]"""
+
+        for start in range(0, self.shape[0], chunk_size):
+            yield self[start:start + chunk_size]
 
     # # operators
     @staticmethod
@@ -459,18 +814,44 @@ class FixNum:
 
         return tmp_fix.change_fix(tmp_fmt, out_rnd, out_over)
 
+    def _aligned_mant(self, other):
+        """Return the mantissas of both operands aligned to the same number of fractional bits.
+
+        :param other: fix-point object.
+
+        :type other: FixNum or FixScalar
+
+        :return: tuple in the form (self mantissa, other mantissa, fractional bits, bits per mantissa).
+        :rtype: tuple[numpy.ndarray, numpy.ndarray, int, int]"""
+
+        other = _as_fixnum(other)
+        frac_bits = max(self.fmt.frac_bits, other.fmt.frac_bits)
+        # sign and integer bits of the widest operand
+        bit_length = frac_bits + max(self.fmt.int_bits, other.fmt.int_bits) + 1
+
+        # one more bit to host the result of an addition/subtraction
+        self_mant = _as_work(self._mant, bit_length + 1)
+        if frac_bits != self.fmt.frac_bits:
+            self_mant = self_mant << (frac_bits - self.fmt.frac_bits)
+        other_mant = _as_work(other._mant, bit_length + 1)
+        if frac_bits != other.fmt.frac_bits:
+            other_mant = other_mant << (frac_bits - other.fmt.frac_bits)
+
+        return (self_mant, other_mant, frac_bits, bit_length)
+
     # ## Addition methods
     def __add__(self, other):
         """x + y --> x.__add__(y)"""
 
-        tmp_val = self.value + other.value
+        self_mant, other_mant, frac_bits, bit_length = self._aligned_mant(other)
         tmp_fmt = FixFmt(self.fmt.signed or other.fmt.signed,
                          max(self.fmt.int_bits, other.fmt.int_bits)+1,
                          max(self.fmt.frac_bits, other.fmt.frac_bits))
         if (self.rnd != other.rnd) or (self.over != other.over):
             print('_WARNING_: operators have round and/or overflow methods ' +
                   'not equal, those of first operator will be considered')
-        return FixNum(tmp_val, tmp_fmt, self.rnd, self.over)
+        # full precision result is always representable
+        return FixNum.from_raw(_elementwise(np.add, self_mant, other_mant), tmp_fmt, self.rnd, self.over)
 
     def add(self, *args, **kwargs):
         """Addition method.
@@ -497,14 +878,18 @@ class FixNum:
 
     # ## Subtraction methods
     def __sub__(self, other):
-        tmp_val = self.value - other.value
+        self_mant, other_mant, frac_bits, bit_length = self._aligned_mant(other)
         tmp_fmt = FixFmt(self.fmt.signed or other.fmt.signed,
                          max(self.fmt.int_bits, other.fmt.int_bits)+1,
                          max(self.fmt.frac_bits, other.fmt.frac_bits))
         if (self.rnd != other.rnd) or (self.over != other.over):
             print('_WARNING_: operators have round and / or overflow methods ' +
                   'not equal, those of first operator will be considered')
-        return FixNum(tmp_val, tmp_fmt, self.rnd, self.over)
+        tmp_val = _elementwise(np.subtract, self_mant, other_mant)
+        if not tmp_fmt.signed:
+            # unsigned operands may lead to a negative result
+            return FixNum._from_int(tmp_val, frac_bits, bit_length + 1, tmp_fmt, self.rnd, self.over)
+        return FixNum.from_raw(tmp_val, tmp_fmt, self.rnd, self.over)
 
     def sub(self, *args, **kwargs):
         """Subtraction method.
@@ -531,14 +916,20 @@ class FixNum:
 
     # ## Multiplication methods
     def __mul__(self, other):
-        tmp_val = self.value * other.value
+        other = _as_fixnum(other)
+        bit_length = self.fmt.bit_length + other.fmt.bit_length
+        tmp_val = _elementwise(np.multiply, _as_work(self._mant, bit_length), _as_work(other._mant, bit_length))
         tmp_fmt = FixFmt(self.fmt.signed or other.fmt.signed,
                          self.fmt.int_bits + other.fmt.int_bits,
                          self.fmt.frac_bits + other.fmt.frac_bits)
         if (self.rnd != other.rnd) or (self.over != other.over):
             print('_WARNING_: operators have round and / or overflow methods ' +
                   'not equal, those of first operator will be considered')
-        return FixNum(tmp_val, tmp_fmt, self.rnd, self.over)
+        if self.fmt.signed and other.fmt.signed:
+            # the product of the two minimum values is not representable
+            return FixNum._from_int(tmp_val, self.fmt.frac_bits + other.fmt.frac_bits, bit_length,
+                                    tmp_fmt, self.rnd, self.over)
+        return FixNum.from_raw(tmp_val, tmp_fmt, self.rnd, self.over)
 
     def mult(self, *args, **kwargs):
         """Multiplication method.
@@ -563,34 +954,1033 @@ class FixNum:
 
         return self._op_out_casting(self.__mul__, *args, **kwargs)
 
+    # ## Multiply-accumulate methods
+    def dot(self, other, out_fmt=None, out_rnd="SymZero", out_over="Wrap"):
+        """Dot product (as ``numpy.dot``) accumulated at full precision.
+
+        The products are summed in a wide integer accumulator: the full precision format grows by
+        ceil(log2(N)) guard bits (plus one when both operands are signed) being N the number of accumulated
+        products, thus no overflow can occur before the final (single) cast to *out_fmt*.
+
+        :param other: fix-point object.
+        :param out_fmt: optional format the result is casted to.
+        :param out_rnd: round method adopted on result (default ```SymZero```).
+        :param out_over: overflow method adopted on result (default ```Wrap```).
+
+        :type other: FixNum or FixScalar
+        :type out_fmt: FixFmt
+        :type out_rnd: str
+        :type out_over: str
+
+        :return: dot product result.
+        :rtype: FixNum"""
+
+        other = _as_fixnum(other)
+        num_acc = other.shape[0] if len(other.shape) == 1 else other.shape[-2]
+        tmp_fmt = FixFmt(self.fmt.signed or other.fmt.signed,
+                         self.fmt.int_bits + other.fmt.int_bits +
+                         int(self.fmt.signed and other.fmt.signed) + _guard_bits(num_acc),
+                         self.fmt.frac_bits + other.fmt.frac_bits)
+
+        # single vectorized reduction over integer mantissas
+        tmp_mant = np.dot(_as_work(self._mant, tmp_fmt.bit_length), _as_work(other._mant, tmp_fmt.bit_length))
+        tmp_fix = FixNum.from_raw(tmp_mant, tmp_fmt, self.rnd, self.over)
+
+        return tmp_fix.change_fix(tmp_fmt if out_fmt is None else out_fmt, out_rnd, out_over)
+
+    @staticmethod
+    def mac(acc, a_op, b_op, out_fmt=None, out_rnd=None, out_over=None):
+        """Fused multiply-accumulate: acc + a_op*b_op.
+
+        The product and the addition are computed exactly, the result is quantized only once.
+        By default the result keeps the accumulator format and fimath.
+
+        :param acc: accumulator.
+        :param a_op: first product operand.
+        :param b_op: second product operand.
+        :param out_fmt: optional format the result is casted to (default accumulator one).
+        :param out_rnd: round method adopted on result (default accumulator one).
+        :param out_over: overflow method adopted on result (default accumulator one).
+
+        :type acc: FixNum or FixScalar
+        :type a_op: FixNum or FixScalar
+        :type b_op: FixNum or FixScalar
+        :type out_fmt: FixFmt
+        :type out_rnd: str
+        :type out_over: str
+
+        :return: updated accumulator.
+        :rtype: FixNum"""
+
+        acc, a_op, b_op = _as_fixnum(acc), _as_fixnum(a_op), _as_fixnum(b_op)
+
+        # exact product and alignment to the finest resolution
+        prod_frac_bits = a_op.fmt.frac_bits + b_op.fmt.frac_bits
+        frac_bits = max(acc.fmt.frac_bits, prod_frac_bits)
+        prod_bits = a_op.fmt.bit_length + b_op.fmt.bit_length + frac_bits - prod_frac_bits
+        acc_bits = acc.fmt.bit_length + frac_bits - acc.fmt.frac_bits
+        bit_length = max(prod_bits, acc_bits) + 1
+
+        tmp_prod = _as_work(a_op._mant, bit_length) * _as_work(b_op._mant, bit_length)
+        tmp_acc = _as_work(acc._mant, bit_length) << (frac_bits - acc.fmt.frac_bits)
+
+        return FixNum._from_int(tmp_acc + (tmp_prod << (frac_bits - prod_frac_bits)), frac_bits, bit_length,
+                                acc.fmt if out_fmt is None else out_fmt,
+                                acc.rnd if out_rnd is None else out_rnd,
+                                acc.over if out_over is None else out_over)
+
     # ## Negation method
     def __neg__(self):
-        return FixNum(-self.value, self.fmt, self.rnd, self.over)
+        return FixNum._from_int(-_as_work(self._mant, self.fmt.bit_length + 1),
+                                self.fmt.frac_bits, self.fmt.bit_length + 1,
+                                self.fmt, self.rnd, self.over)
 
     # ## Comparison methods
+    def _cmp_operands(self, other):
+        """Return comparable operands, fix-point objects are compared on aligned mantissas."""
+
+        if isinstance(other, FixNum):
+            return self._aligned_mant(other)[:2]
+        return (self.value, other)
+
     def __lt__(self, other):
-        return self.value < other
+        self_op, other_op = self._cmp_operands(other)
+        return self_op < other_op
 
     def __le__(self, other):
-        return self.value <= other
+        self_op, other_op = self._cmp_operands(other)
+        return self_op <= other_op
 
     def __eq__(self, other):
-        return self.value == other
+        self_op, other_op = self._cmp_operands(other)
+        return self_op == other_op
 
     def __ne__(self, other):
-        return self.value != other
+        self_op, other_op = self._cmp_operands(other)
+        return self_op != other_op
 
     def __gt__(self, other):
-        return self.value > other
+        self_op, other_op = self._cmp_operands(other)
+        return self_op > other_op
 
     def __ge__(self, other):
-        return self.value >= other
+        self_op, other_op = self._cmp_operands(other)
+        return self_op >= other_op
 
 
-# private methods
-def _bin2fixstring(value, out_length):
-    """Convert a number to bin format with leading zeros."""
+def sum(value, axis=None, out_fmt=None, out_rnd="SymZero", out_over="Wrap"):  # pylint: disable=redefined-builtin
+    """Sum of fix-point elements (as ``numpy.sum``) accumulated at full precision.
 
-    value_bin_no_prefix = bin(value)[2:]
+    The full precision format grows by ceil(log2(N)) guard bits being N the number of summed elements, thus
+    no overflow can occur before the final (single) cast to *out_fmt*.
 
-    return '0b' + (out_length - len(value_bin_no_prefix)) * '0' + value_bin_no_prefix
+    :param value: fix-point object.
+    :param axis: axis (or axes) along which the sum is performed, all the elements if None.
+    :param out_fmt: optional format the result is casted to.
+    :param out_rnd: round method adopted on result (default ```SymZero```).
+    :param out_over: overflow method adopted on result (default ```Wrap```).
+
+    :type value: FixNum
+    :type axis: int or tuple[int] or None
+    :type out_fmt: FixFmt
+    :type out_rnd: str
+    :type out_over: str
+
+    :return: sum result.
+    :rtype: FixNum"""
+
+    value = gu.check_args(value, FixNum)
+    tmp_mant = value._mant  # pylint: disable=protected-access
+
+    if axis is None:
+        num_acc = tmp_mant.size
+    else:
+        num_acc = int(np.prod([value.shape[x] for x in (axis if isinstance(axis, tuple) else (axis, ))]))
+    tmp_fmt = FixFmt(value.fmt.signed, value.fmt.int_bits + _guard_bits(num_acc), value.fmt.frac_bits)
+
+    tmp_mant = np.sum(_as_work(tmp_mant, tmp_fmt.bit_length), axis=axis)
+    tmp_fix = FixNum.from_raw(tmp_mant, tmp_fmt, value.rnd, value.over)
+
+    return tmp_fix.change_fix(tmp_fmt if out_fmt is None else out_fmt, out_rnd, out_over)
+
+
+def set_parallel(workers=1, chunk_size=65536):
+    """Configure the chunked multi-thread execution of the quantization and element-wise operations.
+
+    When *workers* is greater than 1, the :class:`FixNum` construction, :meth:`FixNum.change_fix` and the
+    add/sub/mult operations split the mantissa arrays (up to 63 bits) in blocks of about *chunk_size* elements
+    processed by a pool of *workers* threads (NumPy releases the GIL). The temporaries of each block stay in
+    cache and the results are bit-identical to the serial execution (*workers* = 1, the default).
+
+    Ex:
+
+    >>> from pyphix import fix
+    >>> prev_settings = fix.set_parallel(os.cpu_count(), 1 << 16)
+    >>> big_fix = fix.FixNum(capture, fix.FixFmt(True, 0, 15))
+    >>> fix.set_parallel(*prev_settings)
+
+    :param workers: number of worker threads.
+    :param chunk_size: number of elements processed by each task.
+
+    :type workers: int
+    :type chunk_size: int
+
+    :return: previous settings in the form (workers, chunk_size).
+    :rtype: tuple[int, int]"""
+
+    gu.check_args(workers, int)
+    gu.check_args(chunk_size, int)
+    if workers < 1 or chunk_size < 1:
+        raise ValueError("_ERROR_: workers and chunk size must be positive.")
+
+    with _PARALLEL_LOCK:
+        prev_settings = (_PARALLEL['workers'], _PARALLEL['chunk_size'])
+        if _PARALLEL['pool'] is not None and workers != prev_settings[0]:
+            # pending blocks already submitted to the old pool are completed before it is released
+            _PARALLEL['pool'].shutdown()
+            _PARALLEL['pool'] = None
+        _PARALLEL.update(workers=workers, chunk_size=chunk_size)
+
+    return prev_settings
+
+
+class FixScalar:
+    """Fixed point scalar class
+
+    Lightweight counterpart of :class:`FixNum` meant for sample-by-sample processing (feedback loops, NCOs,
+    etc...): the number is stored as a python integer mantissa and no NumPy array is involved.
+    Round and overflow methods behave exactly as for :class:`FixNum`, the full-precision formats of the operations
+    are the same. Any operation involving a :class:`FixNum` returns a :class:`FixNum`.
+
+    :param value: value to represent in fix point (python integers are converted exactly)
+    :param fmt: fix point format
+    :param rnd: round method
+    :param over: overflow method
+
+    :type value: float or int or FixScalar or FixNum(1 element)
+    :type fmt: FixFmt
+    :type rnd: str
+    :type over: str
+    """
+
+    __slots__ = ('mant', 'fmt', 'rnd', 'over')
+
+    def __init__(self, value, fmt, rnd="SymZero", over="Wrap"):
+
+        self.fmt = gu.check_args(fmt, FixFmt)
+        self.rnd = gu.check_enum(rnd, ERoundMethod)
+        self.over = gu.check_enum(over, EOverMethod)
+
+        if isinstance(value, FixNum):
+            value = value.item(0)
+
+        if isinstance(value, FixScalar):
+            self.mant = self._over(self._shift_round(value.mant, value.fmt.frac_bits - self.fmt.frac_bits))
+        elif isinstance(value, (int, np.integer)) and not isinstance(value, bool):
+            self.mant = self._over(int(value) << self.fmt.frac_bits)
+        else:
+            self.mant = self._over(self._round(float(value) * 2**self.fmt.frac_bits))
+
+    @classmethod
+    def from_raw(cls, mant, fmt, rnd=ERoundMethod.SYM_ZERO, over=EOverMethod.WRAP):
+        """Create a fix-point scalar out of an already quantized integer mantissa.
+
+        Fast constructor, no check is performed: the mantissa **must** be representable by the given format
+        and *rnd*/*over* **must** be enum members.
+
+        :param mant: integer mantissa, the value multiplied by 2**fmt.frac_bits.
+        :param fmt: fix point format.
+        :param rnd: round method.
+        :param over: overflow method.
+
+        :type mant: int
+        :type fmt: FixFmt
+        :type rnd: ERoundMethod
+        :type over: EOverMethod
+
+        :return: new fix-point scalar.
+        :rtype: FixScalar"""
+
+        obj = cls.__new__(cls)
+        obj.mant = mant
+        obj.fmt = fmt
+        obj.rnd = rnd
+        obj.over = over
+
+        return obj
+
+    # private methods
+    def _round(self, value):
+        """Round a value scaled to integer representation using object rounding method."""
+
+        floor_part = math.floor(value)
+        return floor_part + _scalar_round_carry(self.rnd, floor_part, value - floor_part, .5)
+
+    def _shift_round(self, mant, shift):
+        """Drop the *shift* least significant bits of an integer mantissa using object rounding method."""
+
+        if shift <= 0:
+            return mant << -shift
+
+        floor_part = mant >> shift
+        return floor_part + _scalar_round_carry(self.rnd, floor_part, mant & ((1 << shift) - 1), 1 << (shift - 1))
+
+    def _over(self, mant):
+        """Apply current object overflow method on an integer mantissa."""
+
+        if self.over is EOverMethod.SAT:
+            min_int, max_int = self.fmt.intrange
+            return min(max(mant, min_int), max_int)
+
+        if not self.fmt.signed:
+            return mant & self.fmt.mask
+
+        sign_bit = 1 << (self.fmt.bit_length - 1)
+        return ((mant + sign_bit) & self.fmt.mask) - sign_bit
+
+    # public methods
+    def change_fix(self, new_fmt, new_rnd=None, new_over=None):
+        """Change fix parameters of current object.
+
+        **WARNING**: this action may lead to information loss due to new format and round/overflow methods.
+
+        :param new_fmt: new format (mandatory).
+        :param new_rnd: new round method, if not specified current is used.
+        :param new_over: new saturation method, if not specified current is used.
+
+        :type new_fmt: FixFmt
+        :type new_rnd: str or None
+        :type new_over: str or None
+
+        :return: new formatted fix-point scalar.
+        :rtype: FixScalar
+        """
+
+        return FixScalar(self, new_fmt,
+                         self.rnd if new_rnd is None else new_rnd,
+                         self.over if new_over is None else new_over)
+
+    def to_fixnum(self):
+        """Return the scalar as 1-element :class:`FixNum`."""
+
+        return FixNum.from_raw(np.array([self.mant], dtype=_mant_dtype(self.fmt.bit_length)),
+                               self.fmt, self.rnd, self.over)
+
+    @property
+    def value(self):
+        """Represent fix-point scalar in float format."""
+
+        return self.mant / 2**self.fmt.frac_bits
+
+    @property
+    def intfmt(self):
+        """Represent fix-point scalar in integer format."""
+
+        return self.mant & self.fmt.mask
+
+    @property
+    def binfmt(self):
+        """Represent fix-point scalar in binary format."""
+
+        return _bin2fixstring(self.intfmt, self.fmt.bit_length)
+
+    @property
+    def hexfmt(self):
+        """Represent fix-point scalar in hexadecimal format."""
+
+        return '0x' + format(self.intfmt, '0%dx' % -(-self.fmt.bit_length // 4))
+
+    @property
+    def fimath(self):
+        """Return fix math as tuple (round method, overflow mode)."""
+
+        return (self.rnd, self.over)
+
+    # data model
+    # # representation
+    def __str__(self):
+        return """
+%s
+
+  fmt: %s
+  rnd: %s
+  over: %s""" % (self.value, self.fmt, self.rnd, self.over)
+
+    def __repr__(self):
+        return """%s
+
+  <%s at %s>""" % (self.__str__(), gu.get_class_name(self), hex(id(self)))
+
+    def __float__(self):
+        return self.value
+
+    # # operators
+    def _aligned_mant(self, other):
+        """Return the mantissas of both operands aligned to the same number of fractional bits.
+
+        :return: tuple in the form (self mantissa, other mantissa, fractional bits).
+        :rtype: tuple[int, int, int]"""
+
+        frac_bits = max(self.fmt.frac_bits, other.fmt.frac_bits)
+        return (self.mant << (frac_bits - self.fmt.frac_bits),
+                other.mant << (frac_bits - other.fmt.frac_bits),
+                frac_bits)
+
+    def _check_fimath(self, other):
+        if (self.rnd != other.rnd) or (self.over != other.over):
+            print('_WARNING_: operators have round and / or overflow methods ' +
+                  'not equal, those of first operator will be considered')
+
+    # ## Addition methods
+    def __add__(self, other):
+        if isinstance(other, FixNum):
+            return self.to_fixnum() + other
+
+        self_mant, other_mant, frac_bits = self._aligned_mant(other)
+        tmp_fmt = FixFmt(self.fmt.signed or other.fmt.signed,
+                         max(self.fmt.int_bits, other.fmt.int_bits)+1,
+                         frac_bits)
+        self._check_fimath(other)
+        # full precision result is always representable
+        return FixScalar.from_raw(self_mant + other_mant, tmp_fmt, self.rnd, self.over)
+
+    def add(self, *args, **kwargs):
+        """Addition method, see :meth:`FixNum.add`."""
+
+        return FixNum._op_out_casting(self.__add__, *args, **kwargs)  # pylint: disable=protected-access
+
+    # ## Subtraction methods
+    def __sub__(self, other):
+        if isinstance(other, FixNum):
+            return self.to_fixnum() - other
+
+        self_mant, other_mant, frac_bits = self._aligned_mant(other)
+        tmp_fmt = FixFmt(self.fmt.signed or other.fmt.signed,
+                         max(self.fmt.int_bits, other.fmt.int_bits)+1,
+                         frac_bits)
+        self._check_fimath(other)
+        tmp_fix = FixScalar.from_raw(self_mant - other_mant, tmp_fmt, self.rnd, self.over)
+        if not tmp_fmt.signed:
+            # unsigned operands may lead to a negative result
+            tmp_fix.mant = tmp_fix._over(tmp_fix.mant)  # pylint: disable=protected-access
+        return tmp_fix
+
+    def sub(self, *args, **kwargs):
+        """Subtraction method, see :meth:`FixNum.sub`."""
+
+        return FixNum._op_out_casting(self.__sub__, *args, **kwargs)  # pylint: disable=protected-access
+
+    # ## Multiplication methods
+    def __mul__(self, other):
+        if isinstance(other, FixNum):
+            return self.to_fixnum() * other
+
+        tmp_fmt = FixFmt(self.fmt.signed or other.fmt.signed,
+                         self.fmt.int_bits + other.fmt.int_bits,
+                         self.fmt.frac_bits + other.fmt.frac_bits)
+        self._check_fimath(other)
+        tmp_fix = FixScalar.from_raw(self.mant * other.mant, tmp_fmt, self.rnd, self.over)
+        if self.fmt.signed and other.fmt.signed:
+            # the product of the two minimum values is not representable
+            tmp_fix.mant = tmp_fix._over(tmp_fix.mant)  # pylint: disable=protected-access
+        return tmp_fix
+
+    def mult(self, *args, **kwargs):
+        """Multiplication method, see :meth:`FixNum.mult`."""
+
+        return FixNum._op_out_casting(self.__mul__, *args, **kwargs)  # pylint: disable=protected-access
+
+    # ## Negation method
+    def __neg__(self):
+        return FixScalar.from_raw(self._over(-self.mant), self.fmt, self.rnd, self.over)
+
+    # ## Comparison methods
+    def _cmp_operands(self, other):
+        """Return comparable operands, fix-point objects are compared on aligned mantissas."""
+
+        if isinstance(other, FixNum):
+            return (self.to_fixnum(), other)
+        if isinstance(other, FixScalar):
+            return self._aligned_mant(other)[:2]
+        return (self.value, other)
+
+    def __lt__(self, other):
+        self_op, other_op = self._cmp_operands(other)
+        return self_op < other_op
+
+    def __le__(self, other):
+        self_op, other_op = self._cmp_operands(other)
+        return self_op <= other_op
+
+    def __eq__(self, other):
+        self_op, other_op = self._cmp_operands(other)
+        return self_op == other_op
+
+    def __ne__(self, other):
+        self_op, other_op = self._cmp_operands(other)
+        return self_op != other_op
+
+    def __gt__(self, other):
+        self_op, other_op = self._cmp_operands(other)
+        return self_op > other_op
+
+    def __ge__(self, other):
+        self_op, other_op = self._cmp_operands(other)
+        return self_op >= other_op
+
+
+class FixComplex:
+    """Complex fixed point number class
+
+    Real and imaginary parts share the same format and fimath, their integer mantissas are stored interleaved
+    (last axis of the mantissa array, [real, imag]) so that every operation is a single vectorized pass over both
+    parts. Round and overflow methods behave exactly as for :class:`FixNum`.
+
+    The complex multiplication is fused: the four (or three, see :meth:`mult`) products and the two sums are
+    computed exactly on the integer mantissas and quantized once.
+
+    :param value: value to represent in fix point
+    :param fmt: fix point format of both real and imaginary parts
+    :param rnd: round method
+    :param over: overflow method
+
+    :type value: np.ndarray(dtype=complex) or complex or FixComplex
+    :type fmt: FixFmt
+    :type rnd: str
+    :type over: str
+    """
+
+    def __init__(self, value, fmt, rnd="SymZero", over="Wrap"):
+
+        if isinstance(value, FixComplex):
+            # re-quantize directly from the integer mantissas
+            self._parts = FixNum(value._parts, fmt, rnd, over)
+        else:
+            value = np.asarray(value, dtype=np.complex128)
+            value = np.reshape(value, value.shape if value.shape else (1, ))
+            self._parts = FixNum(np.stack((value.real, value.imag), axis=-1), fmt, rnd, over)
+
+    @classmethod
+    def from_raw(cls, mant, fmt, rnd="SymZero", over="Wrap"):
+        """Create a complex fix-point object out of already quantized interleaved integer mantissas.
+
+        As for :meth:`FixNum.from_raw`, the mantissas are neither copied nor quantized.
+
+        :param mant: integer mantissas, the last axis holds the real and imaginary parts.
+        :param fmt: fix point format.
+        :param rnd: round method.
+        :param over: overflow method.
+
+        :type mant: numpy.ndarray
+        :type fmt: FixFmt
+        :type rnd: ERoundMethod or str
+        :type over: EOverMethod or str
+
+        :return: new complex fix-point object.
+        :rtype: FixComplex"""
+
+        mant = np.asarray(mant)
+        if not mant.ndim or mant.shape[-1] != 2:
+            raise ValueError("_ERROR_: mantissa last axis must hold real and imaginary parts.")
+
+        return cls._wrap(FixNum.from_raw(np.reshape(mant, mant.shape if mant.ndim > 1 else (1, 2)), fmt, rnd, over))
+
+    @classmethod
+    def from_parts(cls, real, imag):
+        """Create a complex fix-point object out of its real and imaginary parts (same format and shape).
+
+        :param real: real part.
+        :param imag: imaginary part.
+
+        :type real: FixNum
+        :type imag: FixNum
+
+        :return: new complex fix-point object (fimath of the real part).
+        :rtype: FixComplex"""
+
+        real, imag = gu.check_args(real, FixNum), gu.check_args(imag, FixNum)
+        if real.fmt != imag.fmt or real.shape != imag.shape:
+            raise ValueError("_ERROR_: real and imaginary parts must share format and shape.")
+
+        return cls._wrap(FixNum.from_raw(np.stack((real._mant, imag._mant), axis=-1), real.fmt, real.rnd, real.over))
+
+    @classmethod
+    def _wrap(cls, parts):
+        """Create an object out of its interleaved parts (a FixNum whose last axis is [real, imag])."""
+
+        obj = cls.__new__(cls)
+        obj._parts = parts  # pylint: disable=protected-access
+
+        return obj
+
+    def _parts_index(self, idx):
+        """Turn an index of the complex object into an index of the interleaved parts.
+
+        The Ellipsis is expanded and a full slice is appended, so the index never selects along the [real, imag]
+        axis."""
+
+        idx = idx if isinstance(idx, tuple) else (idx, )
+        # number of dimensions consumed by each item (a boolean mask consumes one per mask dimension)
+        used_dims = int(np.sum([0 if item is None or item is Ellipsis else
+                                np.ndim(item) if isinstance(item, (np.ndarray, list)) and
+                                np.asarray(item).dtype == np.bool_ else 1 for item in idx]))
+        free_dims = len(self.shape) - used_dims
+        # identity test only, "in" would compare array items element-wise
+        is_ellipsis = [item is Ellipsis for item in idx]
+
+        if free_dims < 0:
+            raise IndexError("_ERROR_: too many indices, the object has %d dimension(s) but %d were indexed." %
+                             (len(self.shape), used_dims))
+        if is_ellipsis.count(True) > 1:
+            raise IndexError("_ERROR_: an index can only have a single ellipsis ('...').")
+
+        ell_pos = is_ellipsis.index(True) if any(is_ellipsis) else len(idx)
+        idx = idx[:ell_pos] + (slice(None), ) * free_dims + idx[ell_pos + 1:]
+
+        return idx + (slice(None), )
+
+    @property
+    def fmt(self):
+        """Return the format of real and imaginary parts."""
+
+        return self._parts.fmt
+
+    @property
+    def rnd(self):
+        """Return the round method."""
+
+        return self._parts.rnd
+
+    @property
+    def over(self):
+        """Return the overflow method."""
+
+        return self._parts.over
+
+    @property
+    def fimath(self):
+        """Return the fimath as (rnd, over)."""
+
+        return self._parts.fimath
+
+    @property
+    def shape(self):
+        """Return the object shape."""
+
+        return self._parts.shape[:-1]
+
+    @property
+    def real(self):
+        """Return the real part (view sharing the mantissa buffer)."""
+
+        return self._parts[..., 0]
+
+    @property
+    def imag(self):
+        """Return the imaginary part (view sharing the mantissa buffer)."""
+
+        return self._parts[..., 1]
+
+    @property
+    def value(self):
+        """Return the represented complex values."""
+
+        tmp_value = self._parts.value
+        return tmp_value[..., 0] + 1j * tmp_value[..., 1]
+
+    def change_fix(self, new_fmt, new_rnd=None, new_over=None):
+        """Change fix parameters of current object (see :meth:`FixNum.change_fix`).
+
+        :param new_fmt: new format (mandatory).
+        :param new_rnd: new round method, if not specified current is used.
+        :param new_over: new saturation method, if not specified current is used.
+
+        :type new_fmt: FixFmt
+        :type new_rnd: str or None
+        :type new_over: str or None
+
+        :return: new formatted complex fix-point object.
+        :rtype: FixComplex"""
+
+        return FixComplex._wrap(self._parts.change_fix(new_fmt, new_rnd, new_over))
+
+    def copy(self):
+        """Return a copy of the object that does not share its mantissa buffer."""
+
+        return FixComplex._wrap(self._parts.copy())
+
+    def __str__(self):
+        return """
+%s
+
+  fmt: %s
+  rnd: %s
+  over: %s""" % (self.value, self.fmt, self.rnd, self.over)
+
+    def __repr__(self):
+        return """%s
+
+  <%s at %s>""" % (self.__str__(), gu.get_class_name(self), hex(id(self)))
+
+    def __getitem__(self, idx):
+        """Return the selected elements (basic slicing returns a view, see :meth:`FixNum.__getitem__`)."""
+
+        tmp_mant = self._parts._mant[self._parts_index(idx)]  # pylint: disable=protected-access
+        return FixComplex.from_raw(tmp_mant, self.fmt, self.rnd, self.over)
+
+    def __len__(self):
+        return self.shape[0]
+
+    # # operators
+    # ## Addition methods
+    def __add__(self, other):
+        """x + y --> x.__add__(y)"""
+
+        return FixComplex._wrap(self._parts + gu.check_args(other, FixComplex)._parts)
+
+    def add(self, *args, **kwargs):
+        """Addition method (see :meth:`FixNum.add`).
+
+        *Usage: add(other, out_fmt=None, out_rnd="SymZero", out_over="Wrap")*
+
+        :return: addition result.
+        :rtype: FixComplex"""
+
+        return FixNum._op_out_casting(self.__add__, *args, **kwargs)
+
+    # ## Subtraction methods
+    def __sub__(self, other):
+        return FixComplex._wrap(self._parts - gu.check_args(other, FixComplex)._parts)
+
+    def sub(self, *args, **kwargs):
+        """Subtraction method (see :meth:`FixNum.sub`).
+
+        *Usage: sub(other, out_fmt=None, out_rnd="SymZero", out_over="Wrap")*
+
+        :return: operation result.
+        :rtype: FixComplex"""
+
+        return FixNum._op_out_casting(self.__sub__, *args, **kwargs)
+
+    # ## Multiplication methods
+    def __mul__(self, other):
+        return self._mult(other, None, self.rnd, self.over, False)
+
+    def mult(self, other, out_fmt=None, out_rnd="SymZero", out_over="Wrap",  # pylint: disable=too-many-arguments
+             prod_fmt=None, prod_rnd="SymZero", prod_over="Wrap", three_mult=False):
+        """Fused complex multiplication.
+
+        The complex result (ar*br - ai*bi) + j(ar*bi + ai*br) is computed on the integer mantissas with one
+        quantization point per product (*prod_fmt*, exact if None) and a final one on the sums (*out_fmt*, the
+        full precision format, i.e. one integer bit more than the products, if None). As for :meth:`FixNum.mult`,
+        the sum of two minimum value squares does not fit the full precision format and it is wrapped/saturated
+        by the object fimath.
+
+        The 3-multiplier variant computes k1 = br*(ar + ai), k2 = ar*(bi - br), k3 = ai*(br + bi) and the result
+        as (k1 - k3) + j(k1 + k2): with exact products it is bit-identical to the 4-multiplier one, with quantized
+        products it models the hardware implementation (pre-adders are exact).
+
+        A real operand (FixNum or FixScalar) scales both parts.
+
+        :param other: fix-point object.
+        :param out_fmt: optional format operation result can be casted to.
+        :param out_rnd: round method adopted on result (default ```SymZero```).
+        :param out_over: overflow method adopted on result (default ```Wrap```).
+        :param prod_fmt: optional format the products are casted to.
+        :param prod_rnd: round method adopted on the products.
+        :param prod_over: overflow method adopted on the products.
+        :param three_mult: use the 3-multiplier variant.
+
+        :type other: FixComplex or FixNum or FixScalar
+        :type out_fmt: FixFmt
+        :type out_rnd: str
+        :type out_over: str
+        :type prod_fmt: FixFmt
+        :type prod_rnd: str
+        :type prod_over: str
+        :type three_mult: bool
+
+        :return: operation result.
+        :rtype: FixComplex"""
+
+        return FixNum._op_out_casting(partial(self._mult, prod_fmt=prod_fmt, prod_rnd=prod_rnd, prod_over=prod_over,
+                                              three_mult=three_mult), other, out_fmt, out_rnd, out_over)
+
+    def _mult(self, other, prod_fmt, prod_rnd, prod_over, three_mult):
+        """Return the full precision complex product (see :meth:`mult`)."""
+
+        other = _as_fixnum(other)
+        if (self.rnd != other.rnd) or (self.over != other.over):
+            print('_WARNING_: operators have round and / or overflow methods ' +
+                  'not equal, those of first operator will be considered')
+
+        frac_bits = self.fmt.frac_bits + other.fmt.frac_bits
+        int_bits = self.fmt.int_bits + other.fmt.int_bits
+        # products, pre-adders and sums guard bits
+        bit_length = self.fmt.bit_length + other.fmt.bit_length + 3
+        if prod_fmt is not None:
+            bit_length = max(bit_length, prod_fmt.bit_length + 2)
+        self_mant = _as_work(self._parts._mant, bit_length)  # pylint: disable=protected-access
+
+        if isinstance(other, FixNum):
+            # real operand: scale both parts
+            products = [self_mant * _as_work(other._mant, bit_length)[..., None]]
+        else:
+            other_mant = _as_work(other._parts._mant, bit_length)  # pylint: disable=protected-access
+            a_re, a_im, b_re, b_im = self_mant[..., 0], self_mant[..., 1], other_mant[..., 0], other_mant[..., 1]
+            if three_mult:
+                products = [b_re * (a_re + a_im), a_re * (b_im - b_re), a_im * (b_re + b_im)]
+            else:
+                products = [a_re * b_re, a_im * b_im, a_re * b_im, a_im * b_re]
+
+        if prod_fmt is not None:
+            products = [FixNum._from_int(x, frac_bits, bit_length, prod_fmt, prod_rnd, prod_over)._mant
+                        for x in products]
+            products = [_as_work(x, bit_length) for x in products]
+            frac_bits, int_bits = prod_fmt.frac_bits, prod_fmt.int_bits
+
+        if len(products) == 1:
+            tmp_mant, tmp_fmt = products[0], FixFmt(True, int_bits, frac_bits)
+        else:
+            if three_mult:
+                tmp_mant = np.stack((products[0] - products[2], products[0] + products[1]), axis=-1)
+            else:
+                tmp_mant = np.stack((products[0] - products[1], products[2] + products[3]), axis=-1)
+            tmp_fmt = FixFmt(True, int_bits + 1, frac_bits)
+
+        return FixComplex._wrap(FixNum._from_int(tmp_mant, frac_bits, bit_length, tmp_fmt, self.rnd, self.over))
+
+    # ## Complex specific methods
+    def conj(self):
+        """Return the complex conjugate (same format, the imaginary part is negated as for :meth:`FixNum.__neg__`).
+
+        :return: conjugated object.
+        :rtype: FixComplex"""
+
+        tmp_mant = _as_work(self._parts._mant, self.fmt.bit_length + 1) * np.array([1, -1])
+        return FixComplex._wrap(FixNum._from_int(tmp_mant, self.fmt.frac_bits, self.fmt.bit_length + 1,
+                                                 self.fmt, self.rnd, self.over))
+
+    def mag2(self, out_fmt=None, out_rnd="SymZero", out_over="Wrap"):
+        """Magnitude squared real*real + imag*imag.
+
+        The full precision format is unsigned with one integer bit more than the products (as for
+        :meth:`FixNum.mult` the square of the minimum value is wrapped/saturated by the object fimath).
+
+        :param out_fmt: optional format operation result can be casted to.
+        :param out_rnd: round method adopted on result (default ```SymZero```).
+        :param out_over: overflow method adopted on result (default ```Wrap```).
+
+        :type out_fmt: FixFmt
+        :type out_rnd: str
+        :type out_over: str
+
+        :return: magnitude squared.
+        :rtype: FixNum"""
+
+        bit_length = 2 * self.fmt.bit_length + 1
+        tmp_mant = _as_work(self._parts._mant, bit_length)  # pylint: disable=protected-access
+        tmp_mant = np.sum(tmp_mant * tmp_mant, axis=-1)
+        tmp_fmt = FixFmt(False, 2 * self.fmt.int_bits + 1, 2 * self.fmt.frac_bits)
+        tmp_fix = FixNum._from_int(tmp_mant, 2 * self.fmt.frac_bits, bit_length, tmp_fmt, self.rnd, self.over)
+
+        return tmp_fix.change_fix(tmp_fmt if out_fmt is None else out_fmt, out_rnd, out_over)
+
+    def __neg__(self):
+        return FixComplex._wrap(-self._parts)
+
+
+# private methods
+# largest bit length whose two's complement mantissa fits in a np.int64
+_INT64_BITS = 63
+
+
+def _mant_dtype(bit_length):
+    """Return the mantissa storage type able to hold *bit_length* bits."""
+
+    return np.int64 if bit_length <= _INT64_BITS else object
+
+
+def _as_work(mant, bit_length):
+    """Cast an integer mantissa to the storage type able to hold *bit_length* bits (no copy if possible)."""
+
+    return np.asarray(mant).astype(_mant_dtype(bit_length), copy=False)
+
+
+def _mant_of(value):
+    """Return the integer mantissa (storage type) of a fix-point object, for the blocks built on this module."""
+
+    return value._mant  # pylint: disable=protected-access
+
+
+def _float2mant(value, bit_length):
+    """Convert an integer valued float array to a mantissa of *bit_length* bits."""
+
+    if bit_length <= _INT64_BITS:
+        return value.astype(np.int64)
+
+    return np.frompyfunc(int, 1, 1)(value).astype(object)
+
+
+# round methods as (carry threshold in half LSB units, tie rule): the floor part is incremented when the
+# remainder is above the threshold or equal to it and the tie rule holds (True: always, None: never)
+_ROUND_LUT = {
+    ERoundMethod.SYM_INF: (1, lambda floor_part: floor_part >= 0),
+    ERoundMethod.SYM_ZERO: (1, lambda floor_part: floor_part < 0),
+    ERoundMethod.NON_SYM_POS: (1, True),
+    ERoundMethod.NON_SYM_NEG: (1, None),
+    ERoundMethod.CONV_EVEN: (1, lambda floor_part: floor_part % 2 != 0),
+    ERoundMethod.CONV_ODD: (1, lambda floor_part: floor_part % 2 == 0),
+    ERoundMethod.FLOOR: (2, None),
+    ERoundMethod.CEIL: (0, None),
+}
+
+# ASCII digits lookup table
+_DIGITS_LUT = np.frombuffer(b'0123456789abcdef', dtype=np.uint8)
+
+
+def _int2bytes(value, bit_length):
+    """Split a non-negative integer vector into its big-endian bytes.
+
+    :param value: non-negative integers (np.int64 or python integers object array).
+    :param bit_length: number of bits to represent.
+
+    :type value: numpy.ndarray
+    :type bit_length: int
+
+    :return: one row of bytes per element, the most significant first.
+    :rtype: numpy.ndarray(dtype=np.uint8)"""
+
+    num_bytes = max(1, -(-bit_length // 8))
+
+    if value.dtype != object:
+        return value.astype('>u8').view(np.uint8).reshape(-1, 8)[:, 8 - num_bytes:]
+
+    # wide values are processed in 7-bytes limbs, each fitting a np.uint64
+    num_limbs = -(-num_bytes // 7)
+    tmp_bytes = np.empty((value.size, 8 * num_limbs), dtype=np.uint8)
+    for limb in range(num_limbs):
+        tmp_limb = np_and(value >> (56 * (num_limbs - limb - 1)), (1 << 56) - 1).astype('>u8')
+        tmp_bytes[:, 8 * limb:8 * (limb + 1)] = tmp_limb.view(np.uint8).reshape(-1, 8)
+
+    # drop the most significant byte of each limb (always zero)
+    tmp_bytes = tmp_bytes.reshape(-1, num_limbs, 8)[:, :, 1:].reshape(-1, 7 * num_limbs)
+    return tmp_bytes[:, 7 * num_limbs - num_bytes:]
+
+
+def _int2digits(value, bit_length, digit_bits):
+    """Convert a non-negative integer vector into its fixed width ASCII digits.
+
+    :param value: non-negative integers (np.int64 or python integers object array).
+    :param bit_length: number of bits to represent.
+    :param digit_bits: bits per digit, 1 (binary) or 4 (hexadecimal).
+
+    :type value: numpy.ndarray
+    :type bit_length: int
+    :type digit_bits: int
+
+    :return: one row of ASCII digits per element, the most significant first.
+    :rtype: numpy.ndarray(dtype=np.uint8)"""
+
+    tmp_bytes = _int2bytes(value, bit_length)
+    num_digits = -(-bit_length // digit_bits)
+
+    if digit_bits == 1:
+        tmp_digits = np.unpackbits(tmp_bytes, axis=1)
+    else:
+        tmp_digits = np.stack((tmp_bytes >> 4, tmp_bytes & 0xf), axis=2).reshape(tmp_bytes.shape[0], 2 * tmp_bytes.shape[1])
+
+    return _DIGITS_LUT[tmp_digits[:, tmp_digits.shape[1] - num_digits:]]
+
+
+def _scalar_round_carry(rnd, floor_part, rem_part, half):
+    """Scalar version of :meth:`FixNum._round_carry` (python numbers only)."""
+
+    threshold, tie_rule = _ROUND_LUT[rnd]
+    threshold = threshold * half
+    if tie_rule is True:
+        return int(rem_part >= threshold)
+    if rem_part > threshold:
+        return 1
+
+    return int(tie_rule is not None and rem_part == threshold and bool(tie_rule(floor_part)))
+
+
+def _guard_bits(num_acc):
+    """Return the number of bits needed to accumulate *num_acc* values without overflow (ceil(log2(num_acc)))."""
+
+    return max(0, num_acc - 1).bit_length()
+
+
+def _as_fixnum(value):
+    """Promote a :class:`FixScalar` operand to :class:`FixNum`, other objects are returned as they are."""
+
+    return value.to_fixnum() if isinstance(value, FixScalar) else value
+
+
+def _fmt_includes(outer, inner):
+    """Return True when every value of *inner* format is exactly representable with *outer* format."""
+
+    return (outer.signed or not inner.signed) and \
+        outer.int_bits >= inner.int_bits and outer.frac_bits >= inner.frac_bits
+
+
+def _bin2fixstring(value, out_length):
+    """Convert a number to bin format with leading zeros."""
+
+    value_bin_no_prefix = bin(value)[2:]
+
+    return '0b' + (out_length - len(value_bin_no_prefix)) * '0' + value_bin_no_prefix
+
+
+# parallel execution settings (see set_parallel), the thread pool is created on first use; the lock guards the
+# pool creation, replacement and task submission
+_PARALLEL = {'workers': 1, 'chunk_size': 65536, 'pool': None}
+_PARALLEL_LOCK = threading.Lock()
+
+
+def _chunked(kernel, shape, *arrays):
+    """Fill a new np.int64 array of the given shape calling kernel(out, *arrays) on blocks of rows.
+
+    The blocks are spread over the thread pool when the parallel execution is enabled (see :func:`set_parallel`),
+    the arrays must be broadcastable to *shape*."""
+
+    out = np.empty(shape, dtype=np.int64)
+    workers, chunk_size = _PARALLEL['workers'], _PARALLEL['chunk_size']
+    rows = max(1, chunk_size // max(1, int(np.prod(shape[1:]))))
+
+    if workers <= 1 or shape[0] <= rows:
+        kernel(out, *arrays)
+        return out
+
+    arrays = [np.broadcast_to(x, shape) for x in arrays]
+
+    def run_block(start):
+        kernel(out[start:start + rows], *[x[start:start + rows] for x in arrays])
+
+    # map submits all the blocks at once, so the pool cannot be shut down in between
+    with _PARALLEL_LOCK:
+        if _PARALLEL['pool'] is None:
+            _PARALLEL['pool'] = ThreadPoolExecutor(max_workers=_PARALLEL['workers'])
+        results = _PARALLEL['pool'].map(run_block, range(0, shape[0], rows))
+
+    # consume the results to propagate the exceptions
+    for _ in results:
+        pass
+
+    return out
+
+
+def _ufunc_kernel(ufunc, out, a_op, b_op):
+    """Apply a binary ufunc writing into *out* (see :func:`_chunked`)."""
+
+    ufunc(a_op, b_op, out=out)
+
+
+def _elementwise(ufunc, a_op, b_op):
+    """Apply a binary ufunc on two integer mantissas, chunked when both are np.int64."""
+
+    if a_op.dtype == object or b_op.dtype == object:
+        return ufunc(a_op, b_op)
+
+    return _chunked(partial(_ufunc_kernel, ufunc), np.broadcast_shapes(a_op.shape, b_op.shape), a_op, b_op)
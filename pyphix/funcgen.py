@@ -0,0 +1,533 @@
+"""Module implementing bit-true fix-point function generators (CORDIC and look-up tables)."""
+
+__author__ = "Samuele FAVAZZA"
+__copyright__ = "Copyright 2018, Samuele FAVAZZA"
+
+import numpy as np
+
+from . import fix
+from . import generalutil as gu
+from .fix import _as_work, _mant_dtype, _mant_of
+
+
+class Cordic:
+    """Bit-true CORDIC engine (circular coordinates), vectorized over whole arrays.
+
+    Each iteration i computes x' = x - d*(y >> i), y' = y + d*(x >> i), z' = z - d*atan(2**-i) on the integer
+    mantissas (arithmetic shifts, i.e. truncation toward -inf, as in hardware), with d = sign(z) in rotation mode
+    and d = -sign(y) in vectoring mode. x and y registers have *data_fmt* format, z register *angle_fmt* format
+    (radians), the registers overflow method is applied at each iteration.
+
+    A quadrant pre-rotation by +-pi/2 extends the convergence domain to the whole [-pi, pi] range. The outputs
+    carry the CORDIC gain K = prod(sqrt(1 + 2**-2i)) unless compensated by a multiplication by 1/K (quantized to
+    *data_fmt* with *rnd*).
+    The arctangent table (and the pi/2 constant) is quantized with *rnd* and cached per (iterations, angle_fmt,
+    rnd).
+
+    Ex:
+
+    >>> from pyphix import fix, funcgen
+    >>> cordic = funcgen.Cordic(16, fix.FixFmt(True, 1, 16), fix.FixFmt(True, 2, 16))
+    >>> cos_fix, sin_fix = cordic.sincos(fix.FixNum(np.linspace(-3, 3, 1000), fix.FixFmt(True, 2, 16)))
+    >>> mag_fix, angle_fix = cordic.vector(cos_fix, sin_fix)
+
+    :param iterations: number of iterations.
+    :param data_fmt: x and y registers format.
+    :param angle_fmt: z register format (radians).
+    :param rnd: round method of the inputs, of the constants and of the gain compensation.
+    :param over: overflow method of the registers.
+
+    :type iterations: int
+    :type data_fmt: fix.FixFmt
+    :type angle_fmt: fix.FixFmt
+    :type rnd: str
+    :type over: str
+    """
+
+    def __init__(self, iterations, data_fmt, angle_fmt, rnd="SymZero", over="Wrap"):
+
+        self.iterations = gu.check_args(iterations, int)
+        if iterations < 1:
+            raise ValueError("_ERROR_: iterations must be positive.")
+        self.data_fmt = gu.check_args(data_fmt, fix.FixFmt)
+        self.angle_fmt = gu.check_args(angle_fmt, fix.FixFmt)
+        if not (data_fmt.signed and angle_fmt.signed):
+            raise ValueError("_ERROR_: data and angle formats must be signed.")
+        self.rnd = gu.check_enum(rnd, fix.ERoundMethod)
+        self.over = gu.check_enum(over, fix.EOverMethod)
+
+        self._atan, self._half_pi = _cordic_angles(iterations, angle_fmt, self.rnd)
+        self._inv_gain = _const_mant(1 / self.gain, data_fmt.frac_bits, self.rnd)
+
+    @property
+    def gain(self):
+        """Return the CORDIC gain K."""
+
+        return float(np.prod(np.sqrt(1 + 2.**(-2 * np.arange(self.iterations)))))
+
+    def rotate(self, x_val, y_val, angle, gain_comp=True):
+        """Rotate the (x, y) vectors by *angle* (rotation mode).
+
+        :param x_val: x coordinates.
+        :param y_val: y coordinates (same shape of *x_val*).
+        :param angle: rotation angles in radians (same shape of *x_val*).
+        :param gain_comp: compensate the CORDIC gain.
+
+        :type x_val: fix.FixNum
+        :type y_val: fix.FixNum
+        :type angle: fix.FixNum
+        :type gain_comp: bool
+
+        :return: tuple in the form (x, y) of rotated coordinates (*data_fmt*).
+        :rtype: tuple[fix.FixNum, fix.FixNum]"""
+
+        x_mant, y_mant = self._data_mant(x_val), self._data_mant(y_val)
+        z_mant = self._angle_mant(angle)
+        if not x_mant.shape == y_mant.shape == z_mant.shape:
+            raise ValueError("_ERROR_: operands must have the same shape.")
+
+        x_mant, y_mant, _ = self._iterate(x_mant, y_mant, z_mant, False)
+
+        return tuple(self._data_out(x, gain_comp) for x in (x_mant, y_mant))
+
+    def sincos(self, angle):
+        """Return cosine and sine of *angle* (rotation of the (1/K, 0) vector).
+
+        :param angle: angles in radians.
+
+        :type angle: fix.FixNum
+
+        :return: tuple in the form (cos, sin) (*data_fmt*).
+        :rtype: tuple[fix.FixNum, fix.FixNum]"""
+
+        z_mant = self._angle_mant(angle)
+        x_mant = np.full(z_mant.shape, self._inv_gain, dtype=_mant_dtype(self._data_bits()))
+        x_mant, y_mant, _ = self._iterate(x_mant, np.zeros_like(x_mant), z_mant, False)
+
+        return tuple(self._data_out(x, False) for x in (x_mant, y_mant))
+
+    def vector(self, x_val, y_val, gain_comp=True):
+        """Rotate the (x, y) vectors onto the x axis (vectoring mode).
+
+        :param x_val: x coordinates.
+        :param y_val: y coordinates (same shape of *x_val*).
+        :param gain_comp: compensate the CORDIC gain.
+
+        :type x_val: fix.FixNum
+        :type y_val: fix.FixNum
+        :type gain_comp: bool
+
+        :return: tuple in the form (magnitude, angle), i.e. (sqrt(x**2 + y**2), atan2(y, x)).
+        :rtype: tuple[fix.FixNum, fix.FixNum]"""
+
+        x_mant, y_mant = self._data_mant(x_val), self._data_mant(y_val)
+        if x_mant.shape != y_mant.shape:
+            raise ValueError("_ERROR_: operands must have the same shape.")
+
+        x_mant, _, z_mant = self._iterate(x_mant, y_mant, np.zeros_like(x_mant), True)
+
+        return (self._data_out(x_mant, gain_comp),
+                fix.FixNum.from_raw(_as_work(z_mant, self.angle_fmt.bit_length), self.angle_fmt, self.rnd, self.over))
+
+    # private methods
+    def _data_bits(self):
+        """Return the bit length of the x/y working mantissas (pre-rotation and gain compensation)."""
+
+        return 2 * self.data_fmt.bit_length + 1
+
+    def _data_mant(self, value):
+        """Return the working mantissas of x/y operands quantized to the data format."""
+
+        value = fix.FixNum(gu.check_args(value, fix.FixNum), self.data_fmt, self.rnd, self.over)
+        return _as_work(_mant_of(value), self._data_bits())
+
+    def _angle_mant(self, value):
+        """Return the working mantissas of angle operands quantized to the angle format."""
+
+        value = fix.FixNum(gu.check_args(value, fix.FixNum), self.angle_fmt, self.rnd, self.over)
+        return _as_work(_mant_of(value), self.angle_fmt.bit_length + 1)
+
+    def _data_out(self, mant, gain_comp):
+        """Return the x/y register content as a fix-point object, optionally compensating the CORDIC gain."""
+
+        if gain_comp:
+            return fix.FixNum._from_int(mant * self._inv_gain, 2 * self.data_fmt.frac_bits,  # pylint: disable=protected-access
+                                        self._data_bits(), self.data_fmt, self.rnd, self.over)
+
+        return fix.FixNum.from_raw(_as_work(mant, self.data_fmt.bit_length), self.data_fmt, self.rnd, self.over)
+
+    def _iterate(self, x_mant, y_mant, z_mant, vectoring):
+        """Run the quadrant pre-rotation and the CORDIC iterations on all the elements at once."""
+
+        data_reg = fix.FixNum._new(self.data_fmt, self.rnd, self.over)  # pylint: disable=protected-access
+        angle_reg = fix.FixNum._new(self.angle_fmt, self.rnd, self.over)  # pylint: disable=protected-access
+
+        # pre-rotation of the vectors by -pi/2 (cw) or +pi/2 (ccw)
+        if vectoring:
+            cw, ccw = (x_mant < 0) & (y_mant >= 0), (x_mant < 0) & (y_mant < 0)
+            z_mant = np.where(cw, self._half_pi, np.where(ccw, -self._half_pi, z_mant))
+        else:
+            cw, ccw = z_mant < -self._half_pi, z_mant > self._half_pi
+            z_mant = np.where(cw, z_mant + self._half_pi, np.where(ccw, z_mant - self._half_pi, z_mant))
+        x_mant, y_mant = (np.where(cw, y_mant, np.where(ccw, -y_mant, x_mant)),
+                          np.where(cw, -x_mant, np.where(ccw, x_mant, y_mant)))
+        x_mant, y_mant, z_mant = data_reg._over(x_mant), data_reg._over(y_mant), angle_reg._over(z_mant)  # pylint: disable=protected-access
+
+        for idx, atan in enumerate(self._atan):
+            # rotation direction: +1 counterclockwise, -1 clockwise
+            direction = np.where(y_mant < 0 if vectoring else z_mant >= 0, 1, -1)
+            x_shift, y_shift = x_mant >> idx, y_mant >> idx
+            x_mant = data_reg._over(x_mant - direction * y_shift)  # pylint: disable=protected-access
+            y_mant = data_reg._over(y_mant + direction * x_shift)  # pylint: disable=protected-access
+            z_mant = angle_reg._over(z_mant - direction * atan)  # pylint: disable=protected-access
+
+        return x_mant, y_mant, z_mant
+
+
+class Lut:
+    """Bit-true look-up table function generator with linear interpolation.
+
+    The input range [low, high) (the whole *in_fmt* range if *in_range* is None) is split in 2**addr_bits
+    segments: the most significant bits of the input offset address the table, the least significant ones
+    interpolate between two consecutive entries. The interpolation is exact, the result is quantized once to
+    *out_fmt*. Inputs out of range are clipped to the range limits.
+
+    The table holds the function values on the 2**addr_bits + 1 segment boundaries quantized to *table_fmt* with
+    *rnd* (```Sat``` overflow), it is cached per (function, input range, addr_bits, table_fmt, rnd).
+
+    Ex:
+
+    >>> from pyphix import fix, funcgen
+    >>> lut = funcgen.Lut(np.exp, fix.FixFmt(True, 0, 12), 6, fix.FixFmt(False, 2, 14))
+    >>> lut.process(fix.FixNum(np.linspace(-1, 1, 100), fix.FixFmt(True, 0, 12)))
+
+    :param fn: function to tabulate (evaluated on float arrays).
+    :param in_fmt: input format.
+    :param addr_bits: number of address bits.
+    :param table_fmt: table entries format.
+    :param out_fmt: output format (*table_fmt* if None).
+    :param in_range: input range (low, high), high - low must be a power of 2 multiple of the input resolution.
+    :param rnd: round method of the table entries and of the output.
+    :param over: overflow method of the output.
+    :param interp: interpolate between the table entries (the entry addressed by the truncated input otherwise).
+
+    :type fn: callable
+    :type in_fmt: fix.FixFmt
+    :type addr_bits: int
+    :type table_fmt: fix.FixFmt
+    :type out_fmt: fix.FixFmt or None
+    :type in_range: tuple[float, float] or None
+    :type rnd: str
+    :type over: str
+    :type interp: bool
+    """
+
+    # pylint: disable=too-many-instance-attributes,too-many-arguments
+
+    def __init__(self, fn, in_fmt, addr_bits, table_fmt, out_fmt=None, in_range=None, rnd="SymZero", over="Sat",
+                 interp=True):
+
+        if not callable(fn):
+            raise ValueError("_ERROR_: %s is not a function." % gu.get_class_name(fn))
+        self.fn = fn
+        self.in_fmt = gu.check_args(in_fmt, fix.FixFmt)
+        self.addr_bits = gu.check_args(addr_bits, int)
+        self.table_fmt = gu.check_args(table_fmt, fix.FixFmt)
+        self.out_fmt = self.table_fmt if out_fmt is None else gu.check_args(out_fmt, fix.FixFmt)
+        self.rnd = gu.check_enum(rnd, fix.ERoundMethod)
+        self.over = gu.check_enum(over, fix.EOverMethod)
+        self.interp = gu.check_args(interp, bool)
+
+        # input range as mantissas [low, low + 2**span_bits)
+        if in_range is None:
+            self._low, span = in_fmt.intrange[0], 1 << in_fmt.bit_length
+        else:
+            self._low, high = [int(x * in_fmt.scale) for x in in_range]
+            span = high - self._low
+            if self._low != in_range[0] * in_fmt.scale or high != in_range[1] * in_fmt.scale:
+                raise ValueError("_ERROR_: input range %s is not representable with %s." % (in_range, in_fmt))
+        if span <= 0 or span & (span - 1):
+            raise ValueError("_ERROR_: input range width must be a power of 2 multiple of the input resolution.")
+        self._seg_bits = span.bit_length() - 1 - addr_bits
+        if addr_bits < 0 or self._seg_bits < 0:
+            raise ValueError("_ERROR_: address bits must be between 0 and %d." % (span.bit_length() - 1))
+
+        self._table = _lut_table(fn, in_fmt, self._low, span, addr_bits, self.table_fmt, self.rnd)
+
+    @property
+    def table(self):
+        """Return the table content."""
+
+        return fix.FixNum.from_raw(self._table, self.table_fmt, self.rnd, "Sat")
+
+    def process(self, value):
+        """Evaluate the function.
+
+        :param value: function arguments.
+
+        :type value: fix.FixNum (*in_fmt*)
+
+        :return: function values.
+        :rtype: fix.FixNum"""
+
+        value = gu.check_args(value, fix.FixNum)
+        if value.fmt != self.in_fmt:
+            raise ValueError("_ERROR_: input format %s differs from the table one %s." % (value.fmt, self.in_fmt))
+
+        mant, frac_bits, bit_length = self._interpolate(_mant_of(value))
+        return fix.FixNum._from_int(mant, frac_bits, bit_length, self.out_fmt, self.rnd, self.over)  # pylint: disable=protected-access
+
+    # private methods
+    def _interpolate(self, mant):
+        """Return the exact interpolated values of input mantissas as (mantissas, fractional bits, bit length)."""
+
+        bit_length = self.table_fmt.bit_length + self._seg_bits + 2
+        span = (self._table.shape[0] - 1) << self._seg_bits
+        offset = np.clip(_as_work(mant, max(self.in_fmt.bit_length + 1, bit_length)) - self._low, 0, span)
+        addr = np.minimum(offset >> self._seg_bits, self._table.shape[0] - 2)
+        base = _as_work(self._table[addr], bit_length)
+
+        if not self.interp:
+            return base, self.table_fmt.frac_bits, bit_length
+
+        # base + (next - base) * frac / segment, exact
+        delta = _as_work(self._table[addr + 1], bit_length) - base
+        return ((base << self._seg_bits) + delta * (offset - (addr << self._seg_bits)),
+                self.table_fmt.frac_bits + self._seg_bits, bit_length)
+
+
+def sin(value, out_fmt, addr_bits=10, table_fmt=None, rnd="SymZero", over="Sat"):
+    """Sine of the input (radians) by interpolated look-up table (see :class:`Lut`).
+
+    :param value: angles in radians.
+    :param out_fmt: output format.
+    :param addr_bits: table address bits (limited to the input bit length).
+    :param table_fmt: table entries format (*out_fmt* if None).
+    :param rnd: round method of the table entries and of the output.
+    :param over: overflow method of the output.
+
+    :type value: fix.FixNum
+    :type out_fmt: fix.FixFmt
+    :type addr_bits: int
+    :type table_fmt: fix.FixFmt or None
+    :type rnd: str
+    :type over: str
+
+    :return: sine values.
+    :rtype: fix.FixNum"""
+
+    value = gu.check_args(value, fix.FixNum)
+    return Lut(np.sin, value.fmt, min(addr_bits, value.fmt.bit_length), _table_fmt(table_fmt, out_fmt),
+               out_fmt, None, rnd, over).process(value)
+
+
+def cos(value, out_fmt, addr_bits=10, table_fmt=None, rnd="SymZero", over="Sat"):
+    """Cosine of the input (radians) by interpolated look-up table (see :func:`sin`).
+
+    :return: cosine values.
+    :rtype: fix.FixNum"""
+
+    value = gu.check_args(value, fix.FixNum)
+    return Lut(np.cos, value.fmt, min(addr_bits, value.fmt.bit_length), _table_fmt(table_fmt, out_fmt),
+               out_fmt, None, rnd, over).process(value)
+
+
+def atan2(y_val, x_val, out_fmt, addr_bits=10, table_fmt=None, rnd="SymZero", over="Sat"):
+    """Four quadrant arctangent (radians) by interpolated look-up table.
+
+    The ratio min(|x|, |y|) / max(|x|, |y|) is computed by an integer divider (truncated to the input bit length),
+    the arctangent of the ratio is interpolated from the table and mapped to its octant; atan2(0, 0) is 0.
+
+    :param y_val: y coordinates.
+    :param x_val: x coordinates (same format and shape of *y_val*).
+    :param out_fmt: output format.
+    :param addr_bits: table address bits (limited to the input bit length).
+    :param table_fmt: table entries format (*out_fmt* if None).
+    :param rnd: round method of the table entries, of the octant constants and of the output.
+    :param over: overflow method of the output.
+
+    :type y_val: fix.FixNum
+    :type x_val: fix.FixNum
+    :type out_fmt: fix.FixFmt
+    :type addr_bits: int
+    :type table_fmt: fix.FixFmt or None
+    :type rnd: str
+    :type over: str
+
+    :return: angles in [-pi, pi].
+    :rtype: fix.FixNum"""
+
+    y_val, x_val = gu.check_args(y_val, fix.FixNum), gu.check_args(x_val, fix.FixNum)
+    if y_val.fmt != x_val.fmt or y_val.shape != x_val.shape:
+        raise ValueError("_ERROR_: operands must have the same format and shape.")
+
+    # ratio in [0, 1] with one integer bit
+    ratio_bits = y_val.fmt.bit_length
+    ratio_fmt = fix.FixFmt(False, 1, ratio_bits)
+    y_mant, x_mant = [_as_work(_mant_of(x), 2 * ratio_bits + 1) for x in (y_val, x_val)]
+    num, den = np.minimum(abs(y_mant), abs(x_mant)), np.maximum(abs(y_mant), abs(x_mant))
+    ratio = (num << ratio_bits) // np.where(den == 0, 1, den)
+
+    lut = Lut(np.arctan, ratio_fmt, min(addr_bits, ratio_bits), _table_fmt(table_fmt, out_fmt), out_fmt,
+              (0, 1), rnd, over)
+    mant, frac_bits, bit_length = lut._interpolate(ratio)  # pylint: disable=protected-access
+
+    # octant mapping
+    half_pi, one_pi = [_const_mant(x, frac_bits, lut.rnd) for x in (np.pi / 2, np.pi)]
+    bit_length = max(bit_length, half_pi.bit_length() + 2)
+    mant = np.where(abs(y_mant) > abs(x_mant), half_pi - mant, mant)
+    mant = np.where(x_mant < 0, one_pi - mant, mant)
+    mant = np.where(y_mant < 0, -mant, mant)
+
+    return fix.FixNum._from_int(mant, frac_bits, bit_length, out_fmt, rnd, over)  # pylint: disable=protected-access
+
+
+def sqrt(value, out_fmt, addr_bits=10, table_fmt=None, rnd="SymZero", over="Sat"):
+    """Square root by range reduction and interpolated look-up table.
+
+    The input is normalized to [0.25, 1) by an even left shift (leading one detection), the square root of the
+    normalized value is interpolated from the table and shifted back by half the normalization shift.
+
+    :param value: non-negative arguments.
+    :param out_fmt: output format.
+    :param addr_bits: table address bits (limited to the input bit length).
+    :param table_fmt: table entries format (*out_fmt* if None).
+    :param rnd: round method of the table entries and of the output.
+    :param over: overflow method of the output.
+
+    :type value: fix.FixNum
+    :type out_fmt: fix.FixFmt
+    :type addr_bits: int
+    :type table_fmt: fix.FixFmt or None
+    :type rnd: str
+    :type over: str
+
+    :return: square roots.
+    :rtype: fix.FixNum"""
+
+    value = gu.check_args(value, fix.FixNum)
+    mant = _as_work(_mant_of(value), 2 * value.fmt.bit_length + 2)
+    if np.any(mant < 0):
+        raise ValueError("_ERROR_: square root of negative values.")
+
+    # value = norm * 2**(2 * exponent), norm in [0.25, 1) with norm_bits fractional bits
+    norm_bits = value.fmt.bit_length + 1
+    int_exp = _bit_length(mant) - value.fmt.frac_bits
+    exponent = (int_exp + (int_exp & 1)) // 2
+    norm = mant << (norm_bits - value.fmt.frac_bits - 2 * exponent)
+
+    lut = Lut(np.sqrt, fix.FixFmt(False, 0, norm_bits), min(addr_bits, norm_bits), _table_fmt(table_fmt, out_fmt),
+              out_fmt, None, rnd, over)
+    return _denormalize(lut, norm, exponent)
+
+
+def reciprocal(value, out_fmt, addr_bits=10, table_fmt=None, rnd="SymZero", over="Sat"):
+    """Reciprocal by range reduction and interpolated look-up table.
+
+    The input magnitude is normalized to [0.5, 1) by a left shift (leading one detection), the reciprocal of the
+    normalized value is interpolated from the table and shifted back. The sign is applied before the output
+    quantization, the reciprocal of zero is the maximum output value.
+
+    :param value: arguments.
+    :param out_fmt: output format.
+    :param addr_bits: table address bits (limited to the input bit length - 1).
+    :param table_fmt: table entries format (*out_fmt* if None).
+    :param rnd: round method of the table entries and of the output.
+    :param over: overflow method of the output.
+
+    :type value: fix.FixNum
+    :type out_fmt: fix.FixFmt
+    :type addr_bits: int
+    :type table_fmt: fix.FixFmt or None
+    :type rnd: str
+    :type over: str
+
+    :return: reciprocals.
+    :rtype: fix.FixNum"""
+
+    value = gu.check_args(value, fix.FixNum)
+    mant = _as_work(_mant_of(value), 2 * value.fmt.bit_length + 2)
+
+    # |value| = norm * 2**(-exponent), norm in [0.5, 1) with norm_bits fractional bits
+    norm_bits = value.fmt.bit_length
+    abs_bits = _bit_length(abs(mant))
+    norm = abs(mant) << (norm_bits - abs_bits)
+
+    lut = Lut(np.reciprocal, fix.FixFmt(False, 0, norm_bits), min(addr_bits, norm_bits - 1),
+              _table_fmt(table_fmt, out_fmt), out_fmt, (.5, 1), rnd, over)
+    out_fix = _denormalize(lut, norm, value.fmt.frac_bits - abs_bits, mant < 0)
+
+    out_mant = _mant_of(out_fix)
+    out_mant[mant == 0] = out_fmt.intrange[1]
+
+    return out_fix
+
+
+# private methods
+# cached tables, keyed on the generator parameters
+_TABLES = {}
+
+
+def _table_fmt(table_fmt, out_fmt):
+    """Return the table format (output one if None)."""
+
+    return gu.check_args(out_fmt if table_fmt is None else table_fmt, fix.FixFmt)
+
+
+def _const_mant(value, frac_bits, rnd):
+    """Return the mantissa of a constant quantized with *frac_bits* fractional bits."""
+
+    return fix.FixScalar(value, fix.FixFmt(bool(value < 0), max(0, int(abs(value)).bit_length()), frac_bits), rnd).mant
+
+
+def _bit_length(mant):
+    """Return the bit length of non-negative integer mantissas (element-wise)."""
+
+    if mant.dtype == object:
+        return np.frompyfunc(int.bit_length, 1, 1)(mant).astype(np.int64)
+
+    # float exponent, corrected when the conversion rounds up to the next power of 2
+    bit_length = np.frexp(mant.astype(np.float64))[1].astype(np.int64)
+    return bit_length - ((mant >> np.maximum(bit_length - 1, 0)) == 0) * (mant > 0)
+
+
+def _denormalize(lut, norm, exponent, negative=None):
+    """Interpolate normalized arguments and scale the results by 2**exponent (element-wise) before the
+    output quantization."""
+
+    mant, frac_bits, bit_length = lut._interpolate(norm)  # pylint: disable=protected-access
+
+    # align all the elements to the smallest exponent, a single quantization serves all of them
+    min_exp = int(np.min(exponent, initial=0))
+    shift = exponent - min_exp
+    bit_length += int(np.max(shift, initial=0))
+    mant = _as_work(mant, bit_length) << shift
+    if negative is not None:
+        mant = np.where(negative, -mant, mant)
+
+    return fix.FixNum._from_int(mant, frac_bits - min_exp, bit_length, lut.out_fmt, lut.rnd, lut.over)  # pylint: disable=protected-access
+
+
+def _cordic_angles(iterations, fmt, rnd):
+    """Return the (cached) CORDIC arctangent table mantissas and the pi/2 mantissa."""
+
+    key = ('cordic', iterations, fmt, rnd)
+    if key not in _TABLES:
+        atan = [_const_mant(np.arctan(2.**-x), fmt.frac_bits, rnd) for x in range(iterations)]
+        _TABLES[key] = (tuple(atan), _const_mant(np.pi / 2, fmt.frac_bits, rnd))
+
+    return _TABLES[key]
+
+
+def _lut_table(fn, in_fmt, low, span, addr_bits, fmt, rnd):
+    """Return the (cached, read-only) table mantissas of *fn* on the segment boundaries."""
+
+    key = (fn, in_fmt, low, span, addr_bits, fmt, rnd)
+    if key not in _TABLES:
+        bounds = (low + np.arange((1 << addr_bits) + 1) * (span >> addr_bits)) / in_fmt.scale
+        with np.errstate(divide='ignore'):
+            table = _mant_of(fix.FixNum(fn(bounds), fmt, rnd, "Sat"))
+        table.flags.writeable = False
+        _TABLES[key] = table
+
+    return _TABLES[key]
@@ -1,14 +1,39 @@
 import ast
+import itertools
+import lzma
+import zlib
+from collections import namedtuple
 import numpy as np
 
-import nsf_fix as fi
-import nsf_fix_util as fu
+from . import fix
+from .fix import _mant_of
 
 dataType = {'float': '%s',
             'fix': '%d',
             'int': '%d',
             'bool': '%d'}
 
+# binary file (nsb) column storage types, fix columns store the integer mantissa
+binDataType = {'float': '<f8',
+               'fix': '<i8',
+               'int': '<i8',
+               'bool': '|b1'}
+
+# binary file (nsb) data alignment in bytes
+binAlignment = 64
+
+# packed file (nsz) compression methods as (compress, decompress)
+packCompression = {None: (bytes, bytes),
+                   'zlib': (zlib.compress, zlib.decompress),
+                   'lzma': (lzma.compress, lzma.decompress)}
+
+# number of values packed at once (must be a multiple of 8)
+packBlockSize = 65536
+
+# number of rows formatted (parsed) at once by the text file writer (reader)
+writerBlockSize = 65536
+readerBlockSize = 65536
+
 
 class FixFile:
     """Class defining a file format used in vhdl test benches.
@@ -25,6 +50,38 @@ class FixFile:
     NOTE: data written in the file can be used as stimuli in the test benches
     only if data channels are synchronous.
     Otherwise separate files should be used.
+
+    Binary file format (Python to Python handoff of large data sets):
+    ---------- header
+    nsb <numColumns> <numSamples>
+    <colName_1>,<colName_2>, .. <colName_numColumns>
+    <colType_1>,<colType_2>, .. <colType_numColumns>
+    <padding spaces up to the next 64 bytes boundary>
+    ---------- data
+    <column_1 samples>
+    ..
+    <column_numColumns samples>
+
+    Each column is stored as contiguous little-endian words (see binDataType),
+    fix columns store the integer mantissa.
+
+    Packed file format (archives):
+    ---------- header
+    nsz <numColumns> <numSamples>
+    <colName_1>,<colName_2>, .. <colName_numColumns>
+    <colType_1>,<colType_2>, .. <colType_numColumns>
+    <colCoding_1>,<colCoding_2>, .. <colCoding_numColumns>
+    ---------- data
+    <column_1 payload>
+    ..
+    <column_numColumns payload>
+
+    Each column coding is a (bits, delta, compression, payloadBytes) tuple:
+    the integer columns are bit-packed (MSB first) to exactly *bits* bits per
+    sample (fix format bit length, 1 for bool columns, the minimum two's
+    complement length for int columns), optionally delta coded (modulo
+    2**bits) and compressed (see packCompression).
+    Float columns store little-endian 64-bit words (compression only).
     """
 
     def __init__(self):
@@ -41,79 +98,219 @@ class FixFile:
         If a file is read, write method will through an exceptions.
         File path has to be a relative/absolute path plus file name (extension,
         if any, included).
+        The data are parsed a block of rows at a time (see iter_blocks).
+        """
+        with open(filePath, mode='rb') as f:
+            self._column, self._sample, self._orderedColName, colType = \
+                _read_nsf_header(f, filePath)
+            # data extraction, one list of blocks per column
+            colBlocks = [[_convert_str2data(x, np.zeros(0, dtype='S1'))]
+                         for x in colType]
+            for block in _iter_nsf_blocks(f, colType, self._sample,
+                                          readerBlockSize):
+                for colList, colData in zip(colBlocks, block):
+                    colList.append(colData)
+
+        # store into file descriptor (use default fimath)
+        self._colStruct = {
+            colKey: np.concatenate(colList) if colKey[1] != 'fix' else
+            fix.FixNum.from_raw(np.concatenate([_mant_of(x) for x in colList]),
+                                colList[0].fmt)
+            for colKey, colList in zip(self._orderedColName, colBlocks)}
+
+    @staticmethod
+    def iter_blocks(filePath: str, blockSize: int=readerBlockSize):
+        """Iterate over the samples of a fix formatted file a block at a time.
+
+        The header is parsed once, then each block of rows is tokenized and
+        converted with vectorized operations, so files larger than the
+        memory can be processed (e.g. compared against a golden model).
+        The number of samples is validated against the header one.
+
+        Ex:
+
+        >>> for block in FixFile.iter_blocks('dut_output.txt', 100000):
+                golden.process(block['din'])
+
+        :param filePath: file path.
+        :param blockSize: number of rows per block.
+        :return: generator of blocks, each one a dictionary of column blocks
+            (FixNum for fix columns, np.array otherwise) by column name.
+        :rtype: generator[dict]
+        """
+        with open(filePath, mode='rb') as f:
+            _, numSamples, orderedColName, colType = \
+                _read_nsf_header(f, filePath)
+            colNames = [x[0] for x in orderedColName]
+            for block in _iter_nsf_blocks(f, colType, numSamples, blockSize):
+                yield dict(zip(colNames, block))
+
+    def write(self, filePath: str=None):
+        """Write fix formatted file.
+
+        If a file is written, read method will through an exceptions.
+        File path has to be a relative/absolute path plus file name (extension,
+        if any, included).
+        """
+        with FixFile.open_writer(filePath, self._get_writer_header(),
+                                 self._sample) as writer:
+            # write data, a block of rows at a time
+            for start in range(0, self._sample, writerBlockSize):
+                writer.write_block([self._colStruct[x][start:start +
+                                                        writerBlockSize]
+                                    for x in self._orderedColName])
+
+    @staticmethod
+    def open_writer(filePath: str, header, numSamples: int=None):
+        """Open a streaming writer of fix formatted file.
+
+        The data are appended block by block (see FixFileWriter.write_block),
+        thus the whole data set never has to be in memory.
+
+        Ex:
+
+        >>> with FixFile.open_writer('stimuli.txt',
+                                     [('din', fix.FixFmt(True, 0, 15)),
+                                      ('valid', 'bool')]) as writer:
+                for dinBlock, validBlock in generator:
+                    writer.write_block([dinBlock, validBlock])
+
+        :param filePath: file path.
+        :param header: list of (colName, colType) tuples, the type of fix
+            columns is their FixFmt.
+        :param numSamples: number of samples, if given it is verified on
+            close, otherwise the header is updated on close.
+        :type header: list[tuple[str, str or fix.FixFmt]]
+        :return: file writer.
+        :rtype: FixFileWriter
+        """
+        return FixFileWriter(filePath, header, numSamples)
+
+    def read_bin(self, filePath: str=None):
+        """Read binary fix formatted file (nsb).
+
+        The columns are memory mapped (read-only) and wrapped as FixNum
+        objects or np.arrays without copying them: only the accessed
+        samples are loaded from the disk.
         """
-        with open(filePath, mode='r', encoding='utf-8') as f:
+        with open(filePath, mode='rb') as f:
             # identify file type
-            header = f.readline().split(' ')
-            if header[0] != 'nsf':
-                raise ValueError("_ERROR_: file '", filePath,
-                                 "' is not valid nsf fix format file.")
+            header = f.readline().decode('ascii').split(' ')
+            if header[0] != 'nsb':
+                raise ValueError("_ERROR_: file '%s' is not valid nsb fix "
+                                 "format file." % filePath)
 
             # info on data
             self._column = int(header[1])
             self._sample = int(header[2])
             # column names and types
-            lineContent = f.readline()[:-1].replace(' ', ',')
-            colName = ast.literal_eval('[' + lineContent + ']')
-            lineContent = f.readline()[:-1].replace(' ', ',')
-            colType = ast.literal_eval('[' + lineContent + ']')
-            self._orderedColName = [(colName[i], colType[i])
-                                    if type(colType[i]) is not tuple else
-                                    (colName[i], 'fix')
-                                    for i in range(0, self._column)]
-            # data extraction
-            fileContent = f.read()[:-1].replace('\n', '],[')
-            rawData = ast.literal_eval('[[' +
-                                       fileContent.replace(' ', ',') +
-                                       ']]')
-            shapedData = np.array(rawData).T
+            colType = self._parse_col_header(f.readline().decode('ascii'),
+                                             f.readline().decode('ascii'))
+            dataOffset = -(-f.tell() // binAlignment) * binAlignment
+
+        self._colStruct = dict()
+        for k, colKey in enumerate(self._orderedColName):
+            dtype = np.dtype(binDataType[colKey[1]])
+            if self._sample:
+                colData = np.memmap(filePath, dtype=dtype, mode='r',
+                                    offset=dataOffset, shape=(self._sample, ))
+            else:
+                colData = np.zeros(0, dtype=dtype)
+            dataOffset += self._sample * dtype.itemsize
+
             # store into file descriptor (use default fimath)
-            self._colStruct = {self._orderedColName[k]:
-                               fi.FixNum(
-                                   shapedData[k] * 2**(-colType[k][2]),
-                                   fu.FixFmt(colType[k][0],
-                                             colType[k][1],
-                                             colType[k][2]))
-                               if self._orderedColName[k][1] == 'fix' else
-                               shapedData[k] > 0
-                               if self._orderedColName[k][1] == 'bool' else
-                               shapedData[k]
-                               for k in range(0, self._column)}
+            if colKey[1] == 'fix':
+                colData = fix.FixNum.from_raw(colData, fix.FixFmt(*colType[k]))
+            self._colStruct[colKey] = colData
 
-    def write(self, filePath: str=None):
-        """Write fix formatted file.
+    def write_bin(self, filePath: str=None):
+        """Write binary fix formatted file (nsb).
 
-        If a file is written, read method will through an exceptions.
-        File path has to be a relative/absolute path plus file name (extension,
-        if any, included).
+        Fix columns must be at most 63 bits long (a 64-bit word holds the
+        mantissa).
         """
+        for colKey in self._orderedColName:
+            if colKey[1] == 'fix' and \
+                    self._colStruct[colKey].fmt.bit_length > 63:
+                raise ValueError("_ERROR_: '%s' column is wider than 63 "
+                                 "bits." % colKey[0])
+
         with open(filePath, mode='wb') as f:
-            # global info
-            strToWrite = "nsf {} {}".format(self._column, self._sample)
+            # global info, column names and types
+            strToWrite = "nsb {} {}\n".format(self._column, self._sample)
             f.write(strToWrite.encode('ascii'))
-            f.write(b'\n')
-            # column names and type (write them as literal string with apices)
-            strToWrite = ' '.join(["'" + x[0] + "'"
-                                   for x in self._orderedColName])
-            f.write(strToWrite.encode('ascii'))
-            f.write(b'\n')
-            strToWrite = ' '.join(["'" + x[1] + "'" if x[1] != 'fix' else
-                                   str(self._colStruct[x].fmt.tuple())
-                                   .replace(' ', '')
-                                   for x in self._orderedColName])
-            # remove spaces
-            # strToWrite = strToWrite.replace(' ', '')
+            f.write(self._format_col_header())
+            # align the data section
+            f.write(b' ' * (-f.tell() % binAlignment))
+            # write data, one column after the other
+            for colKey in self._orderedColName:
+                colData = self._colStruct[colKey]
+                if colKey[1] == 'fix':
+                    colData = _mant_of(colData)
+                np.asarray(colData, dtype=binDataType[colKey[1]]).tofile(f)
+
+    def read_packed(self, filePath: str=None):
+        """Read packed fix formatted file (nsz).
+        """
+        with open(filePath, mode='rb') as f:
+            # identify file type
+            header = f.readline().decode('ascii').split()
+            if not header or header[0] != 'nsz':
+                raise ValueError("_ERROR_: file '%s' is not valid nsz fix "
+                                 "format file." % filePath)
+
+            # info on data
+            self._column = int(header[1])
+            self._sample = int(header[2])
+            # column names, types and coding
+            colType = self._parse_col_header(f.readline().decode('ascii'),
+                                             f.readline().decode('ascii'))
+            colCoding = ast.literal_eval(
+                '[' + f.readline().decode('ascii').strip().replace(' ', ',') +
+                ']')
+
+            # store into file descriptor (use default fimath)
+            self._colStruct = {
+                colKey: _unpack_column(colType[k], colCoding[k],
+                                       f.read(colCoding[k][3]), self._sample)
+                for k, colKey in enumerate(self._orderedColName)}
+
+    def write_packed(self, filePath: str=None, compression: str=None,
+                     delta: bool=False):
+        """Write packed fix formatted file (nsz).
+
+        Fix columns must be at most 63 bits long.
+
+        :param compression: compression method (None, 'zlib' or 'lzma').
+        :param delta: delta code the integer columns before compressing
+            them (effective on slowly changing signals).
+        """
+        if compression not in packCompression:
+            raise ValueError("_ERROR_: compression can assume only %s "
+                             "values." % list(packCompression.keys()))
+        for colKey in self._orderedColName:
+            if colKey[1] == 'fix' and \
+                    self._colStruct[colKey].fmt.bit_length > 63:
+                raise ValueError("_ERROR_: '%s' column is wider than 63 "
+                                 "bits." % colKey[0])
+
+        colCoding, colPayload = [], []
+        for colKey in self._orderedColName:
+            coding, payload = _pack_column(colKey[1],
+                                           self._colStruct[colKey],
+                                           delta, compression)
+            colCoding.append(str(coding).replace(' ', ''))
+            colPayload.append(payload)
+
+        with open(filePath, mode='wb') as f:
+            # global info, column names, types and coding
+            strToWrite = "nsz {} {}\n".format(self._column, self._sample)
             f.write(strToWrite.encode('ascii'))
-            f.write(b'\n')
-            # prepare data to be written into file
-            dataToWrite = np.array([self._colStruct[x] if x[1] != 'fix' else
-                                    [str(fixHex) for fixHex in
-                                     self._colStruct[x].hex()]
-                                    for x in self._orderedColName])
-            # write data
-            for line in dataToWrite.T:
-                strToWrite = str(line)[2:-2].replace("' '", ' ') + '\n'
-                f.write(strToWrite.encode('ascii'))
+            f.write(self._format_col_header())
+            f.write((' '.join(colCoding) + '\n').encode('ascii'))
+            # write data, one column after the other
+            for payload in colPayload:
+                f.write(payload)
 
     # methods
 
@@ -197,6 +394,27 @@ equal to previously added columns (%d). Column not added." % self._sample)
 
     # private methods
 
+    def _get_writer_header(self):
+        """Get data header in the form accepted by the file writer.
+        """
+        return [(x[0], x[1] if x[1] != 'fix' else self._colStruct[x].fmt)
+                for x in self._orderedColName]
+
+    def _format_col_header(self):
+        """Format column names and types header lines.
+        """
+        return _format_col_header(self._get_writer_header())
+
+    def _parse_col_header(self, nameLine, typeLine):
+        """Parse column names and types header lines.
+
+        The ordered column names are stored, the list of column types (format
+        tuple for fix columns) is returned.
+        """
+        self._orderedColName, colType = _parse_col_header(
+            nameLine, typeLine, self._column)
+        return colType
+
     def _get_col_names(self):
         """Extract only column names without data type.
         """
@@ -206,38 +424,552 @@ equal to previously added columns (%d). Column not added." % self._sample)
         colNameTypeTuple = self._get_col_names().index(colName)
         return self._orderedColName[colNameTypeTuple]
 
-    def _convert_str2data(self, colParams, colData):
-        """Convert read string data.
 
-        Each data column is converted according to the column type.
-        If not valid type is found an Error exception is thrown.
-        """
-        if colParams[1] == 'float':
-            return self._str2float(colData)
-        elif colParams[1] == 'int':
-            return self._str2int(colData)
-        elif colParams[1] == 'bool':
-            return self._str2int(colData)
+class FixFileWriter:
+    """Streaming writer of fix formatted file (see FixFile.open_writer).
+
+    The rows are formatted a block at a time with vectorized operations and
+    each block is written with a single call.
+    When the number of samples is not known in advance, the header sample
+    count is reserved and updated when the writer is closed.
+    """
+
+    def __init__(self, filePath: str, header, numSamples: int=None):
+        # check header validity
+        self._header = list(header)
+        for colName, colType in self._header:
+            if not isinstance(colType, fix.FixFmt) and \
+                    colType not in dataType.keys():
+                raise ValueError("_ERROR_: column type can assume only "
+                                 "FixFmt, 'float', 'int', 'bool' values")
+        if len(set(self._get_col_names())) != len(self._header):
+            raise KeyError("_ERROR_: column names must be unique")
+
+        self._numSamples = numSamples
+        self._sample = 0
+        self._f = open(filePath, mode='wb')
+        # global info, the sample count is reserved if unknown
+        strToWrite = "nsf {} {}".format(
+            len(self._header),
+            ' ' * 20 if numSamples is None else numSamples)
+        self._f.write(strToWrite.encode('ascii'))
+        self._countEnd = self._f.tell()
+        self._f.write(b'\n')
+        # column names and type
+        self._f.write(_format_col_header(self._header))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, excType, excValue, traceback):
+        # on errors the file is closed without the sample count check, the
+        # original exception propagates
+        if excType is None:
+            self.close()
         else:
-            return self._str2fix(colParams, colParams)
+            self._close_file()
+
+    def write_block(self, block):
+        """Append a block of rows.
+
+        :param block: column blocks, either in header order or by name.
+            All the blocks must have the same length, fix columns must have
+            the header format.
+        :type block: list or dict
+        """
+        if isinstance(block, dict):
+            block = [block[x] for x in self._get_col_names()]
+        if len(block) != len(self._header):
+            raise ValueError("_ERROR_: expected %d columns, found %d." %
+                             (len(self._header), len(block)))
+
+        colChars = []
+        for (colName, colType), colData in zip(self._header, block):
+            if isinstance(colType, fix.FixFmt):
+                if colData.fmt != colType:
+                    raise ValueError("_ERROR_: '%s' column format %s "
+                                     "differs from header one %s." %
+                                     (colName, colData.fmt, colType))
+                colChars.append(colData.strfmt())
+            else:
+                colChars.append(_to_bytes(colType, colData))
 
-    def _str2float(self, colData):
-        return np.array([float(x) for x in colData])
+        numRows = colChars[0].shape[0]
+        if any(x.shape != (numRows, ) for x in colChars):
+            raise ValueError("_ERROR_: data shape must be 1xN or Nx1 and "
+                             "all the column blocks must have the same "
+                             "length.")
+
+        self._f.write(_format_rows(colChars))
+        self._sample += numRows
+
+    def close(self):
+        """Complete the header and close the file.
+        """
+        if self._f.closed:
+            return
+
+        self._close_file()
+        if self._numSamples not in (None, self._sample):
+            raise ValueError("_ERROR_: %d samples written, %d expected." %
+                             (self._sample, self._numSamples))
+
+    # private methods
+
+    def _close_file(self):
+        """Complete the header sample count (if not declared) and close the
+        file."""
+        if self._f.closed:
+            return
 
-    def _str2fix(self, colParams, colData):
-        intData = np.array([int(x) for x in colData])
-        # verify tuple format
         try:
-            signed, intBits, fracBits = colParams[1]
-            print("ciao io sono un apix ' ")
-        except ValueError:
-            print("_ERROR_: current column data isn't of fix type")
+            if self._numSamples is None:
+                self._f.seek(self._countEnd - 20)
+                self._f.write("{:<20}".format(self._sample).encode('ascii'))
+        finally:
+            self._f.close()
 
-        fmt = fu.FixFmt(signed, fracBits, colParams)
-        return fi.FixNum(intData*2**(-fracBits), fmt)
+    def _get_col_names(self):
+        return [x[0] for x in self._header]
+
+
+ColumnCompare = namedtuple('ColumnCompare', ['colName', 'numSamples',
+                                             'numMismatch', 'maxError',
+                                             'mismatches'])
+ColumnCompare.__doc__ = """Comparison result of one column (see compare).
+
+Fix columns are compared on their mantissas aligned to the finest LSB of the
+two formats, errors and mismatching values are expressed in that LSB unit.
+*mismatches* lists the first mismatches as (sampleIdx, dutValue,
+goldenValue) tuples.
+"""
+
+
+def compare(dutPath: str, golden, columns=None, maxMismatch: int=10,
+            blockSize: int=readerBlockSize):
+    """Compare a fix formatted file against golden results, column by column.
+
+    Both data sets are streamed a block at a time and compared with
+    vectorized operations, so files larger than the memory can be compared.
+
+    Ex:
+
+    >>> results = compare('dut_output.txt', 'golden_output.txt')
+    >>> results = compare('dut_output.txt', golden_fix, columns='dout')
+    >>> print(format_report(results))
+
+    :param dutPath: path of the file under test.
+    :param golden: golden results: nsf file path, dictionary of columns by
+        name (FixNum or np.array) or a single FixNum.
+    :param columns: names of the columns to compare (all the golden ones if
+        None), a single name is required for a FixNum golden unless the file
+        holds one column only.
+    :param maxMismatch: number of mismatches reported per column.
+    :param blockSize: number of rows compared at once.
+    :type golden: str or dict or fix.FixNum
+    :type columns: list[str] or str or None
+    :return: comparison result by column name.
+    :rtype: dict[str, ColumnCompare]
+    """
+    if isinstance(columns, str):
+        columns = [columns]
+
+    with open(dutPath, mode='rb') as f:
+        _, numSamples, dutHeader, _ = _read_nsf_header(f, dutPath)
+    dutCols = [x[0] for x in dutHeader]
+
+    if isinstance(golden, fix.FixNum):
+        if columns is None and len(dutCols) == 1:
+            columns = dutCols
+        if columns is None or len(columns) != 1:
+            raise ValueError("_ERROR_: a single column must be selected to "
+                             "compare against a FixNum.")
+        golden = {columns[0]: golden}
+
+    if isinstance(golden, dict):
+        goldenCols = list(golden.keys())
+        if any(len(x) != numSamples for x in golden.values()):
+            raise ValueError("_ERROR_: golden columns must hold %d samples." %
+                             numSamples)
+        goldenBlocks = ({x: y[start:start + blockSize]
+                         for x, y in golden.items()}
+                        for start in range(0, numSamples, blockSize))
+    else:
+        goldenBlocks = FixFile.iter_blocks(golden, blockSize)
+        with open(golden, mode='rb') as f:
+            goldenCols = [x[0] for x in _read_nsf_header(f, golden)[2]]
+
+    columns = goldenCols if columns is None else columns
+    for colName in columns:
+        if colName not in dutCols or colName not in goldenCols:
+            raise KeyError("_ERROR_: '%s' column is missing." % colName)
+
+    colStat = {x: [0, 0, []] for x in columns}
+    start = 0
+    for dutBlock, goldenBlock in itertools.zip_longest(
+            FixFile.iter_blocks(dutPath, blockSize), goldenBlocks):
+        if dutBlock is None or goldenBlock is None:
+            raise ValueError("_ERROR_: compared data have different number "
+                             "of samples.")
+
+        for colName in columns:
+            dutMant, goldenMant = _aligned_mant(dutBlock[colName],
+                                                goldenBlock[colName])
+            errorVal = np.abs(dutMant - goldenMant)
+            mismatchIdx = np.flatnonzero(errorVal != 0)
+            if not mismatchIdx.size:
+                continue
+
+            stat = colStat[colName]
+            stat[0] += mismatchIdx.size
+            stat[1] = max(stat[1],
+                          errorVal[mismatchIdx].max(keepdims=True).tolist()[0])
+            mismatchIdx = mismatchIdx[:maxMismatch - len(stat[2])]
+            stat[2] += zip((start + mismatchIdx).tolist(),
+                           dutMant[mismatchIdx].tolist(),
+                           goldenMant[mismatchIdx].tolist())
+
+        start += len(dutBlock[dutCols[0]])
+
+    return {x: ColumnCompare(x, start, *colStat[x]) for x in columns}
+
+
+def format_report(results):
+    """Format comparison results as text (one line per column, followed by
+    the reported mismatches).
+
+    :param results: comparison results (see compare).
+    :type results: dict[str, ColumnCompare]
+    :return: report.
+    :rtype: str
+    """
+    lines = []
+    for res in results.values():
+        lines.append("%s: %d/%d mismatches, max error %s" %
+                     (res.colName, res.numMismatch, res.numSamples,
+                      res.maxError))
+        lines += ["    sample %d: dut %s, golden %s" % x
+                  for x in res.mismatches]
+    return '\n'.join(lines)
+
+
+def _format_col_header(header):
+    """Format column names and types header lines.
+
+    Names are written as literal strings with apices, fix columns type as
+    format tuple.
+    """
+    strToWrite = ' '.join(["'" + x[0] + "'" for x in header]) + '\n'
+    strToWrite += ' '.join(["'" + x[1] + "'"
+                            if not isinstance(x[1], fix.FixFmt) else
+                            str(x[1].tuplefmt).replace(' ', '')
+                            for x in header]) + '\n'
+    return strToWrite.encode('ascii')
+
+
+def _to_bytes(colType, colData):
+    """Format a float, int or bool column as byte strings.
+    """
+    colData = np.asarray(colData)
+    if colType == 'float':
+        return colData.astype(np.float64).astype('S')
+    # bool columns are written as 0/1
+    return colData.astype(np.int64).astype('S')
 
-    def _str2int(self, colData):
-        return np.array([int(x) for x in colData])
 
-    def _str2bool(self, colData):
-        return np.array([x != '0' for x in colData])
+def _format_rows(colChars):
+    """Join the byte strings of each column into space separated rows.
+
+    The fixed width strings are viewed as byte matrices (shorter strings
+    are padded with NUL bytes), laid side by side with the separators and
+    the padding is finally dropped.
+    """
+    if not colChars[0].shape[0]:
+        return b''
+
+    sepChars = np.full((colChars[0].shape[0], 1), ord(' '), dtype=np.uint8)
+    rowChars = []
+    for colStr in colChars:
+        colStr = np.ascontiguousarray(colStr)
+        rowChars.append(colStr.view(np.uint8).reshape(colStr.shape[0], -1))
+        rowChars.append(sepChars)
+    # the last separator is replaced with the line terminator
+    rowChars[-1] = np.full_like(sepChars, ord('\n'))
+
+    rowChars = np.concatenate(rowChars, axis=1)
+    return rowChars[rowChars != 0].tobytes()
+
+
+def _parse_col_header(nameLine, typeLine, numColumns):
+    """Parse column names and types header lines.
+
+    Return the ordered list of (colName, colType) tuples and the list of
+    column types (format tuple for fix columns).
+    """
+    colName = ast.literal_eval('[' + nameLine.strip().replace(' ', ',') + ']')
+    colType = ast.literal_eval('[' + typeLine.strip().replace(' ', ',') + ']')
+    if len(colName) != numColumns or len(colType) != numColumns:
+        raise ValueError("_ERROR_: header declares %d columns, found %d "
+                         "names and %d types." %
+                         (numColumns, len(colName), len(colType)))
+    orderedColName = [(colName[i], colType[i])
+                      if type(colType[i]) is not tuple else
+                      (colName[i], 'fix')
+                      for i in range(0, numColumns)]
+    return orderedColName, colType
+
+
+def _read_nsf_header(f, filePath):
+    """Read the header of a text file opened in binary mode.
+
+    Return the number of columns and samples, the ordered column names and
+    the column types (see _parse_col_header).
+    """
+    header = f.readline().decode('ascii').split()
+    if not header or header[0] != 'nsf':
+        raise ValueError("_ERROR_: file '%s' is not valid nsf fix format "
+                         "file." % filePath)
+
+    numColumns, numSamples = int(header[1]), int(header[2])
+    orderedColName, colType = _parse_col_header(
+        f.readline().decode('ascii'), f.readline().decode('ascii'),
+        numColumns)
+    return numColumns, numSamples, orderedColName, colType
+
+
+def _iter_nsf_blocks(f, colType, numSamples, blockSize):
+    """Parse the data section of a text file a block of rows at a time.
+
+    Yield the list of the converted column blocks, each block holds
+    blockSize rows (blank lines excluded) but the last one, the total number
+    of rows is checked against the header sample count.
+    """
+    numRead = 0
+    while True:
+        # read until the block is full, blank lines hold no row
+        tokenBlocks, numRows = [], 0
+        while numRows < blockSize:
+            rawLines = list(itertools.islice(f, blockSize - numRows))
+            if not rawLines:
+                break
+            tokenBlocks.append(_tokenize(b''.join(rawLines), len(colType)))
+            numRows += tokenBlocks[-1].shape[0]
+        if not tokenBlocks:
+            break
+
+        tokens = np.concatenate(tokenBlocks)
+        numRead += tokens.shape[0]
+        if numRead > numSamples:
+            raise ValueError("_ERROR_: file holds more than the %d samples "
+                             "declared in the header." % numSamples)
+        if tokens.shape[0]:
+            yield [_convert_str2data(colType[k], tokens[:, k])
+                   for k in range(len(colType))]
+
+    if numRead != numSamples:
+        raise ValueError("_ERROR_: file holds %d samples, %d declared in the "
+                         "header." % (numRead, numSamples))
+
+
+def _tokenize(chunk, numColumns):
+    """Split a text chunk into a (rows, numColumns) array of byte strings.
+
+    Token boundaries are found on the whole chunk at once, the tokens are
+    then gathered into a NUL padded byte matrix viewed as fixed width strings.
+    """
+    buf = np.frombuffer(chunk, dtype=np.uint8)
+    isTok = np.ones(buf.shape, dtype=bool)
+    for sepChar in b' \t\r\n':
+        isTok &= buf != sepChar
+
+    edges = np.diff(np.concatenate(([0], isTok.view(np.int8), [0])))
+    tokStart = np.flatnonzero(edges == 1)
+    tokLength = np.flatnonzero(edges == -1) - tokStart
+
+    # every non empty line must hold one token per column
+    tokLine = np.cumsum(buf == ord('\n'), dtype=np.int64)[tokStart]
+    tokPerLine = np.bincount(tokLine)
+    if np.any((tokPerLine != 0) & (tokPerLine != numColumns)):
+        raise ValueError("_ERROR_: each row must hold %d values." % numColumns)
+
+    width = max(1, int(tokLength.max(initial=0)))
+    charIdx = np.arange(width)
+    tokChars = np.where(charIdx < tokLength[:, None],
+                        buf[np.minimum(tokStart[:, None] + charIdx,
+                                       max(0, buf.size - 1))], 0)
+    tokChars = np.ascontiguousarray(tokChars, dtype=np.uint8)
+    return tokChars.view('S%d' % width).reshape(-1, numColumns)
+
+
+def _convert_str2data(colType, colData):
+    """Convert read string data.
+
+    Each data column is converted according to the column type.
+    If not valid type is found an Error exception is thrown.
+    """
+    if colType == 'float':
+        return colData.astype(np.float64)
+    elif colType == 'int':
+        return colData.astype(np.int64)
+    elif colType == 'bool':
+        return _str2bool(colData)
+    elif isinstance(colType, tuple):
+        return _str2fix(colData, fix.FixFmt(*colType))
+    raise ValueError("_ERROR_: unknown column type %r." % (colType, ))
+
+
+def _str2bool(colData):
+    """Both 0/1 and False/True values are accepted."""
+    return (colData != b'0') & (colData != b'False')
+
+
+def _str2fix(colData, fmt):
+    """Convert two's complement mantissas to a fix-point column.
+
+    Hexadecimal values (as written by FixFile) up to 63 bits are converted
+    with vectorized operations, any other python integer literal is
+    accepted as well. Out of range values are wrapped.
+    """
+    if fmt.bit_length <= 63 and colData.size and \
+            np.all(np.char.startswith(colData, b'0x')):
+        colData = np.ascontiguousarray(colData)
+        hexChars = colData.view(np.uint8).reshape(colData.shape[0], -1)[:, 2:]
+        hexDigits = _HEX_LUT[hexChars]
+        if np.any(hexDigits > 15):
+            raise ValueError("_ERROR_: invalid hexadecimal value.")
+
+        # digits are left aligned, weight them from the last one of each row
+        numDigits = np.count_nonzero(hexChars, axis=1)
+        digitExp = numDigits[:, None] - 1 - np.arange(hexChars.shape[1])
+        mant = np.sum(np.where(digitExp >= 0, hexDigits.astype(np.uint64) <<
+                               (4 * np.maximum(digitExp, 0)).astype(np.uint64),
+                               np.uint64(0)), axis=1, dtype=np.uint64)
+        mant = mant.astype(np.int64) & fmt.mask
+    else:
+        mant = np.frompyfunc(lambda x: int(x, 0), 1, 1)(
+            colData.astype(str)).astype(object) & fmt.mask
+
+    if fmt.signed:
+        signBit = 1 << (fmt.bit_length - 1)
+        mant = ((mant + signBit) & fmt.mask) - signBit
+
+    return fix.FixNum.from_raw(mant, fmt)
+
+
+# hexadecimal digit values by ASCII code (NUL padding is 0, invalid is 255)
+_HEX_LUT = np.full(256, 255, dtype=np.uint8)
+_HEX_LUT[0] = 0
+_HEX_LUT[np.frombuffer(b'0123456789', dtype=np.uint8)] = np.arange(10)
+_HEX_LUT[np.frombuffer(b'abcdef', dtype=np.uint8)] = np.arange(10, 16)
+_HEX_LUT[np.frombuffer(b'ABCDEF', dtype=np.uint8)] = np.arange(10, 16)
+
+
+def _aligned_mant(dutData, goldenData):
+    """Return the compared values as arrays of the same type.
+
+    The mantissas of fix-point columns are aligned to the finest LSB.
+    """
+    if not isinstance(dutData, fix.FixNum) and \
+            not isinstance(goldenData, fix.FixNum):
+        # booleans are compared as 0/1
+        return [np.asarray(x) if np.asarray(x).dtype != bool else
+                np.asarray(x).astype(np.int64) for x in (dutData, goldenData)]
+    if not isinstance(dutData, fix.FixNum) or \
+            not isinstance(goldenData, fix.FixNum):
+        raise ValueError("_ERROR_: fix-point columns can be compared to "
+                         "fix-point columns only.")
+
+    fracBits = max(dutData.fmt.frac_bits, goldenData.fmt.frac_bits)
+    bitLength = fracBits + max(dutData.fmt.int_bits,
+                               goldenData.fmt.int_bits) + 2
+    mantType = np.int64 if bitLength <= 63 else object
+    return [_mant_of(x).astype(mantType) << (fracBits - x.fmt.frac_bits)
+            for x in (dutData, goldenData)]
+
+
+def _pack_column(colType, colData, delta, compression):
+    """Encode a column for the packed file format.
+
+    Return the column coding tuple and the payload.
+    """
+    if colType == 'float':
+        payload = np.asarray(colData, dtype='<f8').tobytes()
+        bits, delta = 64, False
+    else:
+        if colType == 'fix':
+            bits = colData.fmt.bit_length
+            colData = _mant_of(colData)
+        colData = np.asarray(colData).astype(np.int64)
+        if colType == 'bool':
+            bits = 1
+        elif colType == 'int':
+            # minimum two's complement length
+            maxMag = max(colData.max(initial=0), -colData.min(initial=0) - 1)
+            bits = int(maxMag).bit_length() + 1
+
+        colData = colData.view(np.uint64)
+        if delta:
+            colData = np.diff(colData, prepend=np.uint64(0))
+        payload = _pack_bits(colData, bits)
+
+    payload = packCompression[compression][0](payload)
+    return (bits, bool(delta), compression, len(payload)), payload
+
+
+def _unpack_column(colType, colCoding, payload, numSamples):
+    """Decode a column of the packed file format.
+    """
+    bits, delta, compression, _ = colCoding
+    payload = packCompression[compression][1](payload)
+    if colType == 'float':
+        return np.frombuffer(payload, dtype='<f8', count=numSamples) \
+            .astype(np.float64)
+
+    colData = _unpack_bits(payload, bits, numSamples)
+    if delta:
+        colData = np.cumsum(colData, dtype=np.uint64)
+    colData &= np.uint64((1 << bits) - 1)
+
+    if colType == 'bool':
+        return colData != 0
+    if colType == 'int' or colType[0]:
+        # sign extension
+        signBit = np.uint64(1 << (bits - 1))
+        colData = (colData ^ signBit) - signBit
+    colData = colData.view(np.int64)
+
+    if colType == 'int':
+        return colData
+    return fix.FixNum.from_raw(colData, fix.FixFmt(*colType))
+
+
+def _pack_bits(value, bits):
+    """Pack the *bits* least significant bits of each value (MSB first).
+
+    The values are viewed as big-endian bytes, expanded to a bit matrix whose
+    leading columns are dropped before packing. Blocks of a multiple of 8
+    values are packed at a time to bound the memory.
+    """
+    payload = []
+    for start in range(0, value.shape[0], packBlockSize):
+        valueBits = np.unpackbits(
+            value[start:start + packBlockSize].astype('>u8').view(np.uint8)
+            .reshape(-1, 8), axis=1)
+        payload.append(np.packbits(valueBits[:, 64 - bits:]).tobytes())
+    return b''.join(payload)
+
+
+def _unpack_bits(payload, bits, numSamples):
+    """Unpack *numSamples* values of *bits* bits (see _pack_bits).
+    """
+    payload = np.frombuffer(payload, dtype=np.uint8)
+    value = np.empty(numSamples, dtype=np.uint64)
+    for start in range(0, numSamples, packBlockSize):
+        numBlock = min(packBlockSize, numSamples - start)
+        valueBits = np.zeros((numBlock, 64), dtype=np.uint8)
+        valueBits[:, 64 - bits:] = np.unpackbits(
+            payload[start * bits // 8:], count=numBlock * bits) \
+            .reshape(numBlock, bits)
+        value[start:start + numBlock] = \
+            np.packbits(valueBits, axis=1).view('>u8').reshape(-1)
+    return value
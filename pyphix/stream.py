@@ -0,0 +1,187 @@
+"""Module implementing streaming (block based) fix-point processing pipelines."""
+
+__author__ = "Samuele FAVAZZA"
+__copyright__ = "Copyright 2018, Samuele FAVAZZA"
+
+from abc import ABC, abstractmethod
+
+from . import fix
+from . import generalutil as gu
+
+
+class Stage(ABC):
+    """Abstract base class of the pipeline stages.
+
+    A stage is any object implementing ``process(block)`` (return the processed block) and ``reset()`` (clear
+    the state kept between two blocks), e.g. :class:`pyphix.dsp.FirFilter`.
+    Subclasses must implement :meth:`process`, stateless stages inherit the empty :meth:`reset`.
+    """
+
+    @abstractmethod
+    def process(self, block):
+        """Process a block of samples.
+
+        :param block: input block.
+
+        :type block: fix.FixNum
+
+        :return: processed block.
+        :rtype: fix.FixNum"""
+
+    def reset(self):
+        """Clear the stage state (nothing to do for stateless stages)."""
+
+
+class Quantize(Stage):
+    """Stage turning numeric blocks (lists or np.ndarray) into fix-point objects.
+
+    :param fmt: fix point format.
+    :param rnd: round method.
+    :param over: overflow method.
+
+    :type fmt: fix.FixFmt
+    :type rnd: str
+    :type over: str
+    """
+
+    def __init__(self, fmt, rnd="SymZero", over="Wrap"):
+        self.fmt = gu.check_args(fmt, fix.FixFmt)
+        self.rnd = gu.check_enum(rnd, fix.ERoundMethod)
+        self.over = gu.check_enum(over, fix.EOverMethod)
+
+    def process(self, block):
+        return fix.FixNum(block, self.fmt, self.rnd, self.over)
+
+
+class Cast(Stage):
+    """Stage changing the format and fimath of the blocks (see :meth:`pyphix.fix.FixNum.change_fix`).
+
+    :param fmt: new format.
+    :param rnd: new round method.
+    :param over: new overflow method.
+
+    :type fmt: fix.FixFmt
+    :type rnd: str
+    :type over: str
+    """
+
+    def __init__(self, fmt, rnd="SymZero", over="Wrap"):
+        self.fmt = gu.check_args(fmt, fix.FixFmt)
+        self.rnd = gu.check_enum(rnd, fix.ERoundMethod)
+        self.over = gu.check_enum(over, fix.EOverMethod)
+
+    def process(self, block):
+        return block.change_fix(self.fmt, self.rnd, self.over)
+
+
+class _ConstOperation(Stage):
+    """Stage applying an arithmetic operation between the blocks and a constant operand.
+
+    :param operand: constant operand.
+    :param out_fmt: optional format operation result can be casted to.
+    :param out_rnd: round method adopted on result (default ```SymZero```).
+    :param out_over: overflow method adopted on result (default ```Wrap```).
+
+    :type operand: fix.FixScalar or fix.FixNum (1 element)
+    :type out_fmt: fix.FixFmt or None
+    :type out_rnd: str
+    :type out_over: str
+    """
+
+    # name of the FixNum method implementing the operation
+    _op_name = None
+
+    def __init__(self, operand, out_fmt=None, out_rnd="SymZero", out_over="Wrap"):
+        self.operand = gu.check_args(operand, [fix.FixScalar, fix.FixNum])
+        if isinstance(operand, fix.FixNum) and operand.shape != (1, ):
+            raise ValueError("_ERROR_: operand must be a single value.")
+
+        self.out_fmt = None if out_fmt is None else gu.check_args(out_fmt, fix.FixFmt)
+        self.out_rnd = gu.check_enum(out_rnd, fix.ERoundMethod)
+        self.out_over = gu.check_enum(out_over, fix.EOverMethod)
+
+    def process(self, block):
+        return getattr(block, self._op_name)(self.operand, out_fmt=self.out_fmt,
+                                             out_rnd=self.out_rnd, out_over=self.out_over)
+
+
+class Add(_ConstOperation):
+    """Stage adding a constant to the blocks (see :meth:`pyphix.fix.FixNum.add`)."""
+
+    _op_name = 'add'
+
+
+class Sub(_ConstOperation):
+    """Stage subtracting a constant from the blocks (see :meth:`pyphix.fix.FixNum.sub`)."""
+
+    _op_name = 'sub'
+
+
+class Mult(_ConstOperation):
+    """Stage multiplying the blocks by a constant (see :meth:`pyphix.fix.FixNum.mult`)."""
+
+    _op_name = 'mult'
+
+
+class Pipeline:
+    """Chain of processing stages applied block by block.
+
+    Each stage keeps its state across the block boundaries, thus the concatenation of the output blocks is
+    bit-identical to the processing of the concatenated input, while the memory is bound to the block size.
+
+    Ex:
+
+    >>> from pyphix import fix, dsp, stream
+    >>> chain = stream.Pipeline(stream.Quantize(fix.FixFmt(True, 0, 15)),
+                                dsp.FirFilter(coeffs, out_fmt=fix.FixFmt(True, 0, 15)),
+                                stream.Mult(fix.FixScalar(.5, fix.FixFmt(False, 0, 1))))
+    >>> for out_block in chain.run(np.array_split(capture, 1000)):
+            ...
+
+    :param stages: processing stages, applied in the given order.
+
+    :type stages: Stage
+    """
+
+    def __init__(self, *stages):
+
+        for stage in stages:
+            if not callable(getattr(stage, 'process', None)):
+                raise ValueError("_ERROR_: %s is not a valid pipeline stage." % gu.get_class_name(stage))
+
+        self.stages = list(stages)
+
+    def process(self, block):
+        """Push a block through all the stages.
+
+        :param block: input block.
+
+        :type block: any (as accepted by the first stage)
+
+        :return: output block.
+        :rtype: fix.FixNum"""
+
+        for stage in self.stages:
+            block = stage.process(block)
+
+        return block
+
+    def run(self, blocks):
+        """Process an iterable of blocks lazily.
+
+        :param blocks: input blocks.
+
+        :type blocks: iterable
+
+        :return: generator of output blocks.
+        :rtype: generator[fix.FixNum]"""
+
+        for block in blocks:
+            yield self.process(block)
+
+    def reset(self):
+        """Clear the state of all the stages."""
+
+        for stage in self.stages:
+            if callable(getattr(stage, 'reset', None)):
+                stage.reset()
@@ -11,10 +11,24 @@ sys.path.insert(0, os.path.abspath('../'))
 
 import test_fixfmt as t_fmt     # noqa
 import test_fixnum as t_num     # noqa
+import test_fixscalar as t_sca  # noqa
+import test_fixcomplex as t_cpx # noqa
+import test_dsp as t_dsp        # noqa
+import test_funcgen as t_fgen   # noqa
+import test_stream as t_str     # noqa
+import test_explore as t_exp    # noqa
+import test_io as t_io          # noqa
 
 # refresh test definitions
 imp.reload(t_fmt)
 imp.reload(t_num)
+imp.reload(t_sca)
+imp.reload(t_cpx)
+imp.reload(t_dsp)
+imp.reload(t_fgen)
+imp.reload(t_str)
+imp.reload(t_exp)
+imp.reload(t_io)
 
 
 # **
@@ -30,7 +44,8 @@ def test_suite_fixfmt():
     for test_name in ['test_bit_length',
                       'test_minmax',
                       'test_formats',
-                      'test_inclusion']:
+                      'test_inclusion',
+                      'test_interning']:
         test_suite.addTest(t_fmt.TestFixFmtMethods(test_name))
 
     return test_suite
@@ -47,6 +62,7 @@ def test_suite_fixnum():
                       'test_known_unsigned_round',
                       'test_known_signed_overflow',
                       'test_known_unsigned_overflow',
+                      'test_round_table',
                       'test_change_fix']:
         test_suite.addTest(t_num.TestFixRoundOverMethods(test_name))
 
@@ -55,12 +71,139 @@ def test_suite_fixnum():
                       'test_generator',
                       'test_addsub',
                       'test_mult',
+                      'test_from_raw',
+                      'test_mac',
+                      'test_wide_mantissa',
+                      'test_parallel',
                       'test_logic_operations']:
         test_suite.addTest(t_num.TestFixNumMethods(test_name))
 
     return test_suite
 
 
+def test_suite_fixscalar():
+    """Create FixScalar test suite."""
+
+    # create test suite
+    test_suite = utst.TestSuite()
+
+    # add tests
+    for test_name in ['test_quantization',
+                      'test_operations',
+                      'test_fixnum_interop']:
+        test_suite.addTest(t_sca.TestFixScalarMethods(test_name))
+
+    return test_suite
+
+
+def test_suite_fixcomplex():
+    """Create FixComplex test suite."""
+
+    # create test suite
+    test_suite = utst.TestSuite()
+
+    # add tests
+    for test_name in ['test_quantization',
+                      'test_operations',
+                      'test_wide_mantissa']:
+        test_suite.addTest(t_cpx.TestFixComplexMethods(test_name))
+
+    return test_suite
+
+
+def test_suite_dsp():
+    """Create dsp blocks test suite."""
+
+    # create test suite
+    test_suite = utst.TestSuite()
+
+    # add tests
+    for test_name in ['test_full_precision',
+                      'test_quantized',
+                      'test_streaming']:
+        test_suite.addTest(t_dsp.TestFirFilter(test_name))
+
+    for test_name in ['test_precision',
+                      'test_bit_true',
+                      'test_scaling']:
+        test_suite.addTest(t_dsp.TestFft(test_name))
+
+    for test_name in ['test_precision',
+                      'test_quantized',
+                      'test_streaming']:
+        test_suite.addTest(t_dsp.TestBiquadCascade(test_name))
+
+    for test_name in ['test_bit_true',
+                      'test_streaming']:
+        test_suite.addTest(t_dsp.TestNco(test_name))
+
+    return test_suite
+
+
+def test_suite_funcgen():
+    """Create function generators test suite."""
+
+    # create test suite
+    test_suite = utst.TestSuite()
+
+    # add tests
+    for test_name in ['test_precision',
+                      'test_bit_true']:
+        test_suite.addTest(t_fgen.TestCordic(test_name))
+
+    for test_name in ['test_functions',
+                      'test_interpolation']:
+        test_suite.addTest(t_fgen.TestLut(test_name))
+
+    return test_suite
+
+
+def test_suite_stream():
+    """Create streaming pipeline test suite."""
+
+    # create test suite
+    test_suite = utst.TestSuite()
+
+    # add tests
+    for test_name in ['test_blocks',
+                      'test_stages']:
+        test_suite.addTest(t_str.TestPipeline(test_name))
+
+    return test_suite
+
+
+def test_suite_explore():
+    """Create word-length exploration test suite."""
+
+    # create test suite
+    test_suite = utst.TestSuite()
+
+    # add tests
+    for test_name in ['test_quantization',
+                      'test_reference']:
+        test_suite.addTest(t_exp.TestSweep(test_name))
+
+    return test_suite
+
+
+def test_suite_io():
+    """Create fix-point file test suite."""
+
+    # create test suite
+    test_suite = utst.TestSuite()
+
+    # add tests
+    for test_name in ['test_text_write_read',
+                      'test_stream_write',
+                      'test_iter_blocks',
+                      'test_compare',
+                      'test_bin_write_read',
+                      'test_packed_write_read']:
+        test_suite.addTest(t_io.TestFixFile(test_name))
+
+    return test_suite
+
+
 if __name__ == '__main__':
     # Main test runner script
     # Giving -v or --verbose as script argument print more information about the tests being run
@@ -69,6 +212,13 @@ if __name__ == '__main__':
     ENABLE_TEST_ALL = True
     ENABLE_TEST_FIXFMT = False
     ENABLE_TEST_FIXNUM = False
+    ENABLE_TEST_FIXSCALAR = False
+    ENABLE_TEST_FIXCOMPLEX = False
+    ENABLE_TEST_DSP = False
+    ENABLE_TEST_FUNCGEN = False
+    ENABLE_TEST_STREAM = False
+    ENABLE_TEST_EXPLORE = False
+    ENABLE_TEST_IO = False
 
     # define test runner and verbosity
     VERBOSITY_LEVEL = 1
@@ -88,12 +238,40 @@ if __name__ == '__main__':
         if ENABLE_TEST_ALL or ENABLE_TEST_FIXNUM:
             TEST_RESULT &= TEST_RUNNER.run(test_suite_fixnum()).wasSuccessful()
 
+        if ENABLE_TEST_ALL or ENABLE_TEST_FIXSCALAR:
+            TEST_RESULT &= TEST_RUNNER.run(test_suite_fixscalar()).wasSuccessful()
+
+        if ENABLE_TEST_ALL or ENABLE_TEST_FIXCOMPLEX:
+            TEST_RESULT &= TEST_RUNNER.run(test_suite_fixcomplex()).wasSuccessful()
+
+        if ENABLE_TEST_ALL or ENABLE_TEST_DSP:
+            TEST_RESULT &= TEST_RUNNER.run(test_suite_dsp()).wasSuccessful()
+
+        if ENABLE_TEST_ALL or ENABLE_TEST_FUNCGEN:
+            TEST_RESULT &= TEST_RUNNER.run(test_suite_funcgen()).wasSuccessful()
+
+        if ENABLE_TEST_ALL or ENABLE_TEST_STREAM:
+            TEST_RESULT &= TEST_RUNNER.run(test_suite_stream()).wasSuccessful()
+
+        if ENABLE_TEST_ALL or ENABLE_TEST_EXPLORE:
+            TEST_RESULT &= TEST_RUNNER.run(test_suite_explore()).wasSuccessful()
+
+        if ENABLE_TEST_ALL or ENABLE_TEST_IO:
+            TEST_RESULT &= TEST_RUNNER.run(test_suite_io()).wasSuccessful()
+
         print(f"Final test result: {'SUCCESS' if TEST_RESULT else 'FAIL'}")
 
     finally:
         # clean the namespace
         del t_fmt
         del t_num
+        del t_sca
+        del t_cpx
+        del t_dsp
+        del t_fgen
+        del t_str
+        del t_exp
+        del t_io
 
         # set path back to original one
         sys.path = ORIG_SYS_PATH.copy()
@@ -0,0 +1,404 @@
+"""Test dsp blocks features."""
+
+__author__ = "Samuele FAVAZZA"
+__copyright__ = "Copyright 2018, Samuele FAVAZZA"
+
+import contextlib
+import io
+import unittest as utst
+
+import numpy as np
+
+from pyphix import fix
+from pyphix import dsp
+
+
+def fir_reference(coeffs, samples, prod_cast, acc_cast, out_cast):
+    """Per-tap FIR reference model, each cast is a tuple (fmt, rnd, over)."""
+
+    out = []
+    zero = fix.FixScalar(0, samples.fmt)
+    for idx in range(len(samples)):
+        acc = None
+        for tap, coeff in enumerate(coeffs.iter_scalars()):
+            prod = (coeff * (samples.item(idx - tap) if idx >= tap else zero)).change_fix(*prod_cast)
+            acc = prod if acc is None else acc + prod
+        out.append(acc.change_fix(*acc_cast).change_fix(*out_cast).value)
+
+    return np.array(out)
+
+
+def fft_reference(frame, fft):
+    """Per-butterfly recursive decimation in time FFT reference model built on FixComplex operations."""
+
+    twiddles, size = fft.twiddles, fft.size
+    rot = fix.FixComplex(1j if fft.inverse else -1j, fix.FixFmt(True, 1, 0))
+
+    def transform(samples, stage):
+        if stage < 0:
+            return samples
+
+        radix, fimath = fft.radices[stage], fft.stage_fimath[stage]
+        span = len(samples) // radix
+        subs = [transform(samples[x::radix], stage - 1) for x in range(radix)]
+        out = [None] * len(samples)
+        for k in range(span):
+            prods = [subs[0][k]]
+            for grp in range(1, radix):
+                twiddle = twiddles[(grp * k * size // len(samples) * (-1 if fft.inverse else 1)) % size]
+                prods.append(subs[grp][k] * twiddle.change_fix(twiddle.fmt, *subs[grp][k].fimath))
+            for out_grp in range(radix):
+                acc = prods[0]
+                for grp in range(1, radix):
+                    prod = prods[grp]
+                    for _ in range((out_grp * grp * 4 // radix) % 4):
+                        prod = prod * rot.change_fix(rot.fmt, *prod.fimath)
+                    acc = acc + prod
+                shift = fft.scaling[stage]
+                if shift:
+                    acc = acc * fix.FixScalar(2**-shift, fix.FixFmt(False, 0, shift), *acc.fimath)
+                out[k + out_grp * span] = acc.change_fix(fft.data_fmt, *fimath)
+        return out
+
+    return [x.value[0] for x in transform([frame[x] for x in range(size)], len(fft.radices) - 1)]
+
+
+def biquad_reference(sos, samples, iir):
+    """Per-sample biquad cascade reference model built on FixScalar operations (single channel)."""
+
+    def calc(value):
+        """Return the operand with the fimath of the exact operations (avoid mismatch warnings)."""
+        return fix.FixScalar.from_raw(value.mant, value.fmt, fix.ERoundMethod.SYM_ZERO, fix.EOverMethod.WRAP)
+
+    out_cast, state_cast = (iir.out_fmt, ) + iir.out_fimath, (iir.state_fmt, ) + iir.state_fimath
+    samples = [calc(x) for x in samples.iter_scalars()]
+    for section in range(sos.shape[0]):
+        b_0, b_1, b_2, _, a_1, a_2 = [calc(sos.item(section, x)) for x in range(6)]
+        out = []
+        if iir.structure is dsp.EIirStructure.DF1:
+            x_1 = x_2 = fix.FixScalar(0, samples[0].fmt)
+            y_1 = y_2 = fix.FixScalar(0, iir.out_fmt)
+            for x_0 in samples:
+                y_0 = calc((b_0 * x_0 + b_1 * x_1 + b_2 * x_2 - a_1 * y_1 - a_2 * y_2).change_fix(*out_cast))
+                x_2, x_1, y_2, y_1 = x_1, x_0, y_1, y_0
+                out.append(y_0)
+        else:
+            s_1 = s_2 = fix.FixScalar(0, iir.state_fmt)
+            for x_0 in samples:
+                y_0 = calc((b_0 * x_0 + s_1).change_fix(*out_cast))
+                s_1 = calc((b_1 * x_0 - a_1 * y_0 + s_2).change_fix(*state_cast))
+                s_2 = calc((b_2 * x_0 - a_2 * y_0).change_fix(*state_cast))
+                out.append(y_0)
+        samples = out
+
+    return np.array([x.value for x in samples])
+
+
+def nco_reference(nco, num_samples, freq_mod, dither):
+    """Per-sample NCO reference model built on FixScalar operations, return the (cos, sin) values."""
+
+    acc, fcw = nco.phase, nco.freq
+    trunc_bits = nco.acc_fmt.bit_length - nco.phase_bits
+    out = []
+    for idx in range(num_samples):
+        dith_mant = (acc.mant + (int(dither[idx]) << (trunc_bits - nco.dither_bits))) % 2**nco.acc_fmt.bit_length
+        phase = (dith_mant >> trunc_bits) / 2**nco.phase_bits
+        out.append([np.cos(2 * np.pi * phase), np.sin(2 * np.pi * phase)])
+        incr = fcw if freq_mod is None else fcw + freq_mod.item(idx)
+        acc = (acc + incr).change_fix(nco.acc_fmt, 'SymZero', 'Wrap')
+
+    return np.array(out).T
+
+
+class TestFirFilter(utst.TestCase):
+    """Test FIR filter."""
+
+    rand_generator = np.random.RandomState(122)       # make tests repeatible
+    coeffs = fix.FixNum(rand_generator.uniform(-.9, .9, 9), fix.FixFmt(True, 0, 11))
+    samples = fix.FixNum(rand_generator.uniform(-.9, .9, 200), fix.FixFmt(True, 0, 15))
+
+    prod_cast = (fix.FixFmt(True, 0, 14), 'ConvEven', 'Wrap')
+    acc_cast = (fix.FixFmt(True, 1, 12), 'Floor', 'Sat')
+    out_cast = (fix.FixFmt(True, 0, 9), 'SymInf', 'Sat')
+
+    def test_full_precision(self):
+        """DESCR: Test full precision FIR filter against floating point convolution."""
+
+        out_fix = dsp.FirFilter(self.coeffs).process(self.samples)
+
+        # exact result, format grows by the guard bits
+        self.assertEqual(out_fix.fmt.tuplefmt, (True, 5, 26))
+        np.testing.assert_array_equal(out_fix.value,
+                                      np.convolve(self.samples.value, self.coeffs.value)[:len(self.samples)])
+
+    def test_quantized(self):
+        """DESCR: Test quantized FIR filter against per-tap reference model."""
+
+        fir = dsp.FirFilter(self.coeffs, self.prod_cast[0], self.acc_cast[0], self.out_cast[0],
+                            *(self.prod_cast[1:] + self.acc_cast[1:] + self.out_cast[1:]))
+        out_fix = fir.process(self.samples)
+
+        self.assertEqual(out_fix.fmt, self.out_cast[0])
+        self.assertEqual(out_fix.fimath, (fix.ERoundMethod.SYM_INF, fix.EOverMethod.SAT))
+        np.testing.assert_array_equal(out_fix.value, fir_reference(self.coeffs, self.samples, self.prod_cast,
+                                                                   self.acc_cast, self.out_cast))
+
+    def test_streaming(self):
+        """DESCR: Test block processing is identical to one-shot processing."""
+
+        fir = dsp.FirFilter(self.coeffs, self.prod_cast[0], block_size=16)
+        exp_fix = dsp.FirFilter(self.coeffs, self.prod_cast[0]).process(self.samples)
+
+        out_vec = np.concatenate([fir.process(chunk).value for chunk in self.samples.iter_chunks(37)] +
+                                 [fir.process(self.samples[:0]).value])
+        np.testing.assert_array_equal(out_vec, exp_fix.value)
+
+        # state is cleared by reset
+        fir.reset()
+        np.testing.assert_array_equal(fir.process(self.samples).value, exp_fix.value)
+
+        # input format cannot change between blocks
+        with self.assertRaises(ValueError):
+            fir.process(self.samples.change_fix(fix.FixFmt(True, 0, 14)))
+
+    def test_coeffs_fimath(self):
+        """DESCR: Test non-default coefficient round and overflow methods produce no operator warning."""
+
+        coeffs = fix.FixNum(self.coeffs.value, self.coeffs.fmt, 'Floor', 'Sat')
+        for prod_fmt in (None, self.prod_cast[0]):
+            fir = dsp.FirFilter(coeffs, prod_fmt, block_size=16)
+            exp_fix = dsp.FirFilter(self.coeffs, prod_fmt).process(self.samples)
+
+            stdout = io.StringIO()
+            with contextlib.redirect_stdout(stdout):
+                out_vec = np.concatenate([fir.process(chunk).value for chunk in self.samples.iter_chunks(37)])
+
+            self.assertEqual(stdout.getvalue(), "")
+            np.testing.assert_array_equal(out_vec, exp_fix.value)
+
+
+class TestFft(utst.TestCase):
+    """Test FFT engine."""
+
+    rand_generator = np.random.RandomState(122)       # make tests repeatible
+    frames = rand_generator.uniform(-.7, .7, (3, 64)) + 1j * rand_generator.uniform(-.7, .7, (3, 64))
+
+    def test_precision(self):
+        """DESCR: Test FFT and IFFT against floating point transforms."""
+
+        in_fix = fix.FixComplex(self.frames, fix.FixFmt(True, 1, 30))
+        for radix in [2, 4]:
+            fft = dsp.Fft(64, fix.FixFmt(True, 1, 30), radix=radix, stage_rnd='ConvEven')
+            out_fix = fft.process(in_fix)
+            self.assertEqual(out_fix.fmt, in_fix.fmt)
+            np.testing.assert_array_equal(fft.exponent, [6, 6, 6])
+            np.testing.assert_allclose(out_fix.value * 64, np.fft.fft(in_fix.value), atol=1e-7)
+
+            ifft = dsp.Fft(64, fix.FixFmt(True, 1, 30), radix=radix, scaling='None', inverse=True)
+            np.testing.assert_allclose(ifft.process(out_fix).value, in_fix.value, atol=1e-7)
+
+        # 32 points radix-4: one radix-2 stage
+        fft = dsp.Fft(32, fix.FixFmt(True, 1, 30), fix.FixFmt(True, 2, 28), radix=4)
+        self.assertEqual(fft.radices, [2, 4, 4])
+        np.testing.assert_allclose(fft.process(in_fix[:, :32]).value * 32, np.fft.fft(in_fix.value[:, :32]),
+                                   atol=1e-7)
+
+        # twiddles ROM
+        fft = dsp.Fft(16, fix.FixFmt(True, 0, 7), twiddle_rnd='Floor')
+        np.testing.assert_array_equal(fft.twiddles.value, fix.FixComplex(
+            np.round(np.exp(-2j * np.pi * np.arange(16) / 16), 12), fix.FixFmt(True, 0, 7), 'Floor', 'Sat').value)
+        self.assertEqual(fft.twiddles.value[0], 1 - 2**-7)
+
+    def test_bit_true(self):
+        """DESCR: Test quantized FFT and IFFT against per-butterfly reference model."""
+
+        in_fix = fix.FixComplex(self.frames, fix.FixFmt(True, 0, 10), 'ConvEven', 'Sat')
+        for radix, size, scaling in [(2, 16, [1, 0, 1, 1]), (4, 64, [2, 1, 2]), (4, 32, [1, 1, 2])]:
+            for inverse in [False, True]:
+                fft = dsp.Fft(size, fix.FixFmt(True, 1, 9), fix.FixFmt(True, 1, 11), radix, scaling,
+                              ['NonSymPos', 'ConvEven', 'Floor', 'SymInf'][:len(scaling)],
+                              ['Sat', 'Wrap', 'Sat', 'Wrap'][:len(scaling)], 'ConvEven', inverse)
+                out_fix = fft.process(in_fix[:, :size])
+                self.assertEqual(out_fix.fimath, fft.stage_fimath[-1])
+                np.testing.assert_array_equal(fft.exponent, [sum(scaling)] * 3)
+                for idx in range(2):
+                    np.testing.assert_array_equal(out_fix.value[idx], fft_reference(in_fix[idx, :size], fft))
+
+    def test_scaling(self):
+        """DESCR: Test block floating point scaling and arguments validation."""
+
+        # frames with different amplitude get different exponents
+        in_fix = fix.FixComplex(self.frames * [[1], [.01], [.5]], fix.FixFmt(True, 0, 15), 'ConvEven', 'Sat')
+        fft = dsp.Fft(64, fix.FixFmt(True, 1, 16), radix=4, scaling='BFP', stage_rnd='ConvEven')
+        out_fix = fft.process(in_fix)
+        exponent = fft.exponent
+        self.assertTrue(exponent[0] > exponent[2] > exponent[1])
+        np.testing.assert_allclose(out_fix.value * 2.**exponent[:, None], np.fft.fft(in_fix.value),
+                                   atol=2.**(exponent.max() - 12))
+
+        # each frame is scaled independently
+        for idx in range(3):
+            np.testing.assert_array_equal(fft.process(in_fix[idx:idx + 1]).value[0], out_fix.value[idx])
+            self.assertEqual(fft.exponent[0], exponent[idx])
+
+        with self.assertRaises(ValueError):
+            dsp.Fft(48, fix.FixFmt(True, 1, 16))
+        with self.assertRaises(ValueError):
+            dsp.Fft(64, fix.FixFmt(True, 1, 16), radix=8)
+        with self.assertRaises(ValueError):
+            dsp.Fft(64, fix.FixFmt(True, 1, 16), radix=4, scaling=[1, 1])
+        with self.assertRaises(ValueError):
+            dsp.Fft(64, fix.FixFmt(True, 1, 16), stage_rnd=['Floor'] * 5)
+        with self.assertRaises(ValueError):
+            dsp.Fft(32, fix.FixFmt(True, 1, 16)).process(in_fix)
+        with self.assertRaises(ValueError):
+            dsp.Fft(64, fix.FixFmt(True, 1, 16), fix.FixFmt(False, 1, 16))
+
+
+class TestBiquadCascade(utst.TestCase):
+    """Test biquad cascade IIR filter."""
+
+    rand_generator = np.random.RandomState(122)       # make tests repeatible
+    sos = np.array([[.0675, .135, .0675, 1, -1.143, .4128],
+                    [.5, -.25, .5, 1, -1.4, .6],
+                    [1, 0, -1, 1, .3, .25]])
+    samples = rand_generator.uniform(-.9, .9, (300, 4))
+
+    def make_filters(self, sos_fix, structure):
+        """Create two identical quantized filters."""
+
+        return [dsp.BiquadCascade(sos_fix, fix.FixFmt(True, 2, 9), fix.FixFmt(True, 3, 11), structure,
+                                  'ConvEven', 'Sat', 'Floor', 'Wrap') for _ in range(2)]
+
+    def test_precision(self):
+        """DESCR: Test wide format filter against floating point recursion."""
+
+        sos_fix = fix.FixNum(self.sos, fix.FixFmt(True, 2, 40))
+        in_fix = fix.FixNum(self.samples[:, 0], fix.FixFmt(True, 0, 40))
+
+        exp_vec = in_fix.value
+        for b_0, b_1, b_2, _, a_1, a_2 in sos_fix.value:
+            out_vec, x_1, x_2, y_1, y_2 = [], 0, 0, 0, 0
+            for x_0 in exp_vec:
+                out_vec.append(b_0 * x_0 + b_1 * x_1 + b_2 * x_2 - a_1 * y_1 - a_2 * y_2)
+                x_2, x_1, y_2, y_1 = x_1, x_0, y_1, out_vec[-1]
+            exp_vec = np.array(out_vec)
+
+        for structure in ['DF1', 'DF2T']:
+            # mantissas beyond 64 bits
+            out_fix = dsp.BiquadCascade(sos_fix, fix.FixFmt(True, 4, 60), fix.FixFmt(True, 4, 64), structure,
+                                        'ConvEven').process(in_fix)
+            self.assertEqual(out_fix.fmt, fix.FixFmt(True, 4, 60))
+            np.testing.assert_allclose(out_fix.value, exp_vec, atol=1e-12)
+
+    def test_quantized(self):
+        """DESCR: Test quantized DF1 and DF2T filters against per-sample reference model."""
+
+        sos_fix = fix.FixNum(self.sos, fix.FixFmt(True, 1, 12))
+        in_fix = fix.FixNum(self.samples, fix.FixFmt(True, 0, 10), 'ConvEven', 'Sat')
+        for structure in ['DF1', 'DF2T']:
+            iir, iir_chan = self.make_filters(sos_fix, structure)
+            out_fix = iir.process(in_fix)
+            self.assertEqual(out_fix.shape, in_fix.shape)
+            self.assertEqual(out_fix.fimath, (fix.ERoundMethod.CONV_EVEN, fix.EOverMethod.SAT))
+            for chan in range(2):
+                exp_vec = biquad_reference(sos_fix, in_fix[:, chan], iir)
+                np.testing.assert_array_equal(out_fix.value[:, chan], exp_vec)
+                # single channel kernel
+                iir_chan.reset()
+                np.testing.assert_array_equal(iir_chan.process(in_fix[:, chan]).value, exp_vec)
+
+    def test_streaming(self):
+        """DESCR: Test filter banks and block processing."""
+
+        # one filter per channel
+        bank_sos = self.sos[:, :, None] * [1, .5, .25, 1]
+        bank_sos[:, 3] = 1
+        sos_fix = fix.FixNum(bank_sos, fix.FixFmt(True, 1, 12))
+        in_fix = fix.FixNum(self.samples, fix.FixFmt(True, 0, 10))
+        for structure in ['DF1', 'DF2T']:
+            iir = self.make_filters(sos_fix, structure)[0]
+            exp_fix = iir.process(in_fix)
+            for chan in range(4):
+                iir_chan = dsp.BiquadCascade(sos_fix[:, :, chan].copy(), iir.out_fmt, iir.state_fmt, structure,
+                                             'ConvEven', 'Sat', 'Floor', 'Wrap')
+                np.testing.assert_array_equal(iir_chan.process(in_fix[:, chan]).value, exp_fix.value[:, chan])
+
+            iir.reset()
+            out_vec = np.concatenate([iir.process(chunk).value for chunk in in_fix.iter_chunks(37)] +
+                                     [iir.process(in_fix[:0]).value])
+            np.testing.assert_array_equal(out_vec, exp_fix.value)
+
+            # input format and channels cannot change between blocks
+            with self.assertRaises(ValueError):
+                iir.process(in_fix.change_fix(fix.FixFmt(True, 0, 9)))
+            with self.assertRaises(ValueError):
+                iir.process(in_fix[:, :2])
+
+        with self.assertRaises(ValueError):
+            dsp.BiquadCascade(fix.FixNum(self.sos[:, :5], fix.FixFmt(True, 1, 12)), fix.FixFmt(True, 2, 9))
+        with self.assertRaises(ValueError):
+            dsp.BiquadCascade(fix.FixNum(self.sos * .5, fix.FixFmt(True, 1, 12)), fix.FixFmt(True, 2, 9))
+
+
+class TestNco(utst.TestCase):
+    """Test numerically controlled oscillator."""
+
+    out_fmt = fix.FixFmt(True, 1, 14)
+
+    def test_bit_true(self):
+        """DESCR: Test NCO against per-sample phase accumulator reference model."""
+
+        freq_mod = fix.FixNum(np.sin(np.arange(500) / 20) * .01, fix.FixFmt(True, 0, 20))
+        for freq, acc_bits, phase_bits, dither_bits, mod in [(.1234567, 32, 10, 0, None), (-.3, 24, 12, 6, None),
+                                                             (.01, 20, 9, 3, freq_mod), (.2, 70, 14, 8, None)]:
+            nco = dsp.Nco(freq, acc_bits, phase_bits, self.out_fmt, dither_bits=dither_bits, phase=.75,
+                          rnd='ConvEven', seed=3)
+            self.assertEqual(nco.phase.value, .75)
+            dither = np.random.RandomState(3).randint(0, 2**dither_bits, 500, dtype=np.int64)
+            exp_vec = nco_reference(nco, 500, mod, dither)
+
+            cos_fix, sin_fix = nco.process(500, mod)
+            self.assertEqual(cos_fix.fmt, self.out_fmt)
+            np.testing.assert_array_equal(cos_fix.value, fix.FixNum(exp_vec[0], self.out_fmt, 'ConvEven', 'Sat').value)
+            np.testing.assert_array_equal(sin_fix.value, fix.FixNum(exp_vec[1], self.out_fmt, 'ConvEven', 'Sat').value)
+
+        # interpolated tables
+        nco = dsp.Nco(.1234567, 32, 18, self.out_fmt, 8, fix.FixFmt(True, 1, 20))
+        cos_fix, sin_fix = nco.process(1000)
+        exp_vec = np.exp(2j * np.pi * nco.freq.value * np.arange(1000))
+        np.testing.assert_allclose(cos_fix.value + 1j * sin_fix.value, exp_vec, atol=2e-4)
+
+    def test_streaming(self):
+        """DESCR: Test block generation, phase dithering and arguments validation."""
+
+        nco = dsp.Nco(.1234567, 32, 10, fix.FixFmt(True, 1, 20), dither_bits=4)
+        exp_fix = nco.process(1 << 14)
+        self.assertEqual(nco.phase.value, (nco.freq.value * (1 << 14)) % 1)
+        nco.reset()
+        for idx in range(2):
+            out_vec = np.concatenate([nco.process(x)[idx].value for x in [1000, 0, 5000, (1 << 14) - 6000]])
+            np.testing.assert_array_equal(out_vec, exp_fix[idx].value)
+            nco.reset()
+
+        # dithering breaks the phase truncation spurs
+        def sfdr(cos_fix, sin_fix):
+            spectrum = abs(np.fft.fft((cos_fix.value + 1j * sin_fix.value) * np.blackman(cos_fix.shape[0])))
+            peak = np.argmax(spectrum)
+            return spectrum[peak] / np.delete(spectrum, np.arange(peak - 8, peak + 9) % spectrum.shape[0]).max()
+
+        trunc_sfdr = sfdr(*dsp.Nco(.1234567, 32, 10, fix.FixFmt(True, 1, 20)).process(1 << 14))
+        self.assertGreater(sfdr(*exp_fix) / trunc_sfdr, 4)
+
+        with self.assertRaises(ValueError):
+            dsp.Nco(.1, 16, 17, self.out_fmt)
+        with self.assertRaises(ValueError):
+            dsp.Nco(.1, 16, 12, self.out_fmt, dither_bits=5)
+        with self.assertRaises(ValueError):
+            dsp.Nco(.1, 16, 12, self.out_fmt, addr_bits=13)
+        with self.assertRaises(ValueError):
+            nco.process(10, fix.FixNum(np.zeros(9), fix.FixFmt(True, 0, 20)))
+
+
+if __name__ == '__main__':
+    utst.main()
@@ -0,0 +1,80 @@
+"""Test word-length exploration features."""
+
+__author__ = "Samuele FAVAZZA"
+__copyright__ = "Copyright 2018, Samuele FAVAZZA"
+
+import unittest as utst
+
+import numpy as np
+
+from pyphix import fix
+from pyphix import explore
+
+
+def quantize(in_vec, fmt, rnd, over):
+    """Plain quantization of the input."""
+
+    return fix.FixNum(in_vec, fmt, rnd, over)
+
+
+def gain(in_vec, fmt, rnd, over):
+    """Quantized input multiplied by a constant gain, output in input format."""
+
+    gain_fix = fix.FixNum(.7, fix.FixFmt(False, 0, 8), rnd, over)
+    return fix.FixNum(in_vec, fmt, rnd, over).mult(gain_fix, fmt, rnd, over)
+
+
+class TestSweep(utst.TestCase):
+    """Test parameter sweep runner."""
+
+    rand_generator = np.random.RandomState(122)       # make tests repeatible
+    in_vec = rand_generator.uniform(-1, 1, 5000)
+    formats = [fix.FixFmt(True, 0, x) for x in range(6, 14)]
+
+    def test_quantization(self):
+        """DESCR: Test error statistics of the plain quantization."""
+
+        results = explore.sweep(quantize, self.in_vec, self.formats, rnd=['ConvEven', 'Floor'], over='Sat', workers=2)
+
+        self.assertEqual(len(results), 2 * len(self.formats))
+        self.assertEqual([(x.fmt, x.rnd, x.over) for x in results[:2]],
+                         [(self.formats[0], fix.ERoundMethod.CONV_EVEN, fix.EOverMethod.SAT),
+                          (self.formats[0], fix.ERoundMethod.FLOOR, fix.EOverMethod.SAT)])
+
+        for res in results:
+            exp_out = fix.FixNum(self.in_vec, res.fmt, res.rnd, res.over).value
+            self.assertAlmostEqual(res.max_error, np.max(np.abs(exp_out - self.in_vec)))
+            self.assertAlmostEqual(res.mean_error, np.mean(exp_out - self.in_vec))
+            self.assertAlmostEqual(res.sqnr, 10 * np.log10(np.mean(self.in_vec**2) / res.rms_error**2))
+
+        # about 6 dB per bit
+        conv_sqnr = np.array([x.sqnr for x in results[::2]])
+        np.testing.assert_allclose(np.diff(conv_sqnr), 6.02, atol=.3)
+        # floor rounding is biased
+        self.assertTrue(all(x.mean_error < -.4 * 2.**-x.fmt.frac_bits for x in results[1::2]))
+
+        self.assertIn('SQNR[dB]', explore.format_table(results))
+        self.assertEqual(len(explore.format_table(results).split('\n')), len(results) + 1)
+
+    def test_reference(self):
+        """DESCR: Test sweep against a reference output, in process and with a process pool."""
+
+        ref_out = .7 * self.in_vec
+        serial_res = explore.sweep(gain, self.in_vec, self.formats, ['SymZero'], ['Wrap', 'Sat'],
+                                   ref_out=ref_out, workers=1)
+        pool_res = explore.sweep(gain, self.in_vec, self.formats, ['SymZero'], ['Wrap', 'Sat'],
+                                 ref_out=ref_out, workers=3)
+        self.assertEqual(serial_res, pool_res)
+
+        # lambdas are allowed running in process only
+        self.assertEqual(explore.sweep(lambda x, *args: x, self.in_vec, self.formats[:1], workers=1)[0].sqnr,
+                         np.inf)
+
+        with self.assertRaises(ValueError):
+            explore.sweep(quantize, self.in_vec, [(True, 0, 7)])
+        with self.assertRaises(ValueError):
+            explore.sweep(quantize, self.in_vec, self.formats, workers=0)
+
+
+if __name__ == '__main__':
+    utst.main()
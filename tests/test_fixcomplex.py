@@ -0,0 +1,168 @@
+"""Test FixComplex class features."""
+
+__author__ = "Samuele FAVAZZA"
+__copyright__ = "Copyright 2018, Samuele FAVAZZA"
+
+import unittest as utst
+
+import numpy as np
+
+from pyphix import fix
+
+
+class TestFixComplexMethods(utst.TestCase):
+    """Test FixComplex class methods."""
+
+    # define commons
+    fmt_a = fix.FixFmt(True, 1, 10)
+    fmt_b = fix.FixFmt(True, 0, 7)
+
+    rand_generator = np.random.RandomState(122)       # make tests repeatible
+    vec_a = rand_generator.uniform(-2, 2, 100) + 1j * rand_generator.uniform(-2, 2, 100)
+    vec_b = rand_generator.uniform(-1, 1, 100) + 1j * rand_generator.uniform(-1, 1, 100)
+    # include the minimum values
+    vec_a[:2] = [-2 - 2j, -2 + 0j]
+    vec_b[:2] = [-1 - 1j, -1j]
+
+    test_a_fix = fix.FixComplex(vec_a, fmt_a, 'ConvEven', 'Sat')
+    test_b_fix = fix.FixComplex(vec_b, fmt_b, 'ConvEven', 'Sat')
+
+    def test_quantization(self):
+        """DESCR: Test FixComplex construction and views."""
+
+        real_fix = fix.FixNum(self.vec_a.real, self.fmt_a, 'ConvEven', 'Sat')
+        imag_fix = fix.FixNum(self.vec_a.imag, self.fmt_a, 'ConvEven', 'Sat')
+
+        self.assertEqual(self.test_a_fix.shape, (100, ))
+        self.assertEqual(len(self.test_a_fix), 100)
+        self.assertEqual(self.test_a_fix.fimath, (fix.ERoundMethod.CONV_EVEN, fix.EOverMethod.SAT))
+        np.testing.assert_array_equal(self.test_a_fix.real.value, real_fix.value)
+        np.testing.assert_array_equal(self.test_a_fix.imag.value, imag_fix.value)
+        np.testing.assert_array_equal(self.test_a_fix.value, real_fix.value + 1j * imag_fix.value)
+
+        # other constructors
+        np.testing.assert_array_equal(fix.FixComplex.from_parts(real_fix, imag_fix).value, self.test_a_fix.value)
+        np.testing.assert_array_equal(fix.FixComplex.from_raw([[1, -2], [3, 4]], fix.FixFmt(True, 2, 1)).value,
+                                      [.5 - 1j, 1.5 + 2j])
+        self.assertEqual(fix.FixComplex(.5 - .25j, self.fmt_b).shape, (1, ))
+        self.assertEqual(fix.FixComplex.from_raw([1, -2], self.fmt_b).shape, (1, ))
+        with self.assertRaises(ValueError):
+            fix.FixComplex.from_parts(real_fix, imag_fix.change_fix(self.fmt_b))
+        with self.assertRaises(ValueError):
+            fix.FixComplex.from_raw([1, 2, 3], self.fmt_b)
+
+        # re-quantization
+        exp_value = fix.FixNum(real_fix, self.fmt_b, 'Floor', 'Wrap').value + \
+            1j * fix.FixNum(imag_fix, self.fmt_b, 'Floor', 'Wrap').value
+        np.testing.assert_array_equal(fix.FixComplex(self.test_a_fix, self.fmt_b, 'Floor', 'Wrap').value, exp_value)
+        np.testing.assert_array_equal(self.test_a_fix.change_fix(self.fmt_b, 'Floor', 'Wrap').value, exp_value)
+
+        # views share the mantissa buffer
+        test_fix = self.test_a_fix.copy()
+        test_view = test_fix[10:20]
+        test_view.real[0] = fix.FixNum(1, self.fmt_a)
+        self.assertEqual(test_fix.value[10], 1 + 1j * self.test_a_fix.imag.value[10])
+        self.assertEqual(test_fix[3].value, self.test_a_fix.value[3])
+        self.assertEqual(self.test_a_fix.value[10], self.test_a_fix.copy().value[10])
+
+        # indices never reach the interleaved [real, imag] axis
+        test_mat = fix.FixComplex(self.vec_a.reshape(4, 5, 5), self.fmt_a, 'ConvEven', 'Sat')
+        exp_mat = self.test_a_fix.value.reshape(4, 5, 5)
+        np.testing.assert_array_equal(test_mat[..., 0].value, exp_mat[..., 0])
+        np.testing.assert_array_equal(test_mat[1, ..., 2].value, exp_mat[1, ..., 2])
+        np.testing.assert_array_equal(test_mat[..., None, 3].value, exp_mat[..., None, 3])
+        self.assertEqual(test_mat[0, 1, 0].value, exp_mat[0, 1, 0])
+        with self.assertRaises(IndexError):
+            test_mat[0, 1, 0, 1]       # pylint: disable=pointless-statement
+        with self.assertRaises(IndexError):
+            test_mat[..., 0, ...]      # pylint: disable=pointless-statement
+
+    def test_operations(self):
+        """DESCR: Test FixComplex arithmetic operations."""
+
+        exp_prod = self.test_a_fix.value * self.test_b_fix.value
+
+        # full precision results are exact
+        test_fix = self.test_a_fix * self.test_b_fix
+        self.assertEqual(test_fix.fmt, fix.FixFmt(True, 2, 17))
+        np.testing.assert_array_equal(test_fix.value[1:], exp_prod[1:])
+        np.testing.assert_array_equal(self.test_a_fix.mult(self.test_b_fix, three_mult=True).value, test_fix.value)
+        # the sum of the minimum values products saturates
+        self.assertEqual(test_fix.value[0], (4 - 2**-17) * 1j)
+        np.testing.assert_array_equal((self.test_a_fix + self.test_b_fix).value,
+                                      self.test_a_fix.value + self.test_b_fix.value)
+        np.testing.assert_array_equal((self.test_a_fix - self.test_b_fix).value,
+                                      self.test_a_fix.value - self.test_b_fix.value)
+        # negated minimum values saturate
+        max_b = self.fmt_b.maxvalue()
+        np.testing.assert_array_equal((-self.test_b_fix).value, np.minimum(-self.test_b_fix.value.real, max_b) +
+                                      1j * np.minimum(-self.test_b_fix.value.imag, max_b))
+
+        # quantized products: same as the hand coded four multiplications and two additions
+        out_fmt, prod_fmt = fix.FixFmt(True, 1, 8), fix.FixFmt(True, 1, 9)
+        a_re, a_im, b_re, b_im = self.test_a_fix.real, self.test_a_fix.imag, self.test_b_fix.real, self.test_b_fix.imag
+        exp_re = a_re.mult(b_re, prod_fmt, 'NonSymPos', 'Wrap').sub(a_im.mult(b_im, prod_fmt, 'NonSymPos', 'Wrap'),
+                                                                    out_fmt, 'SymInf', 'Sat')
+        exp_im = a_re.mult(b_im, prod_fmt, 'NonSymPos', 'Wrap').add(a_im.mult(b_re, prod_fmt, 'NonSymPos', 'Wrap'),
+                                                                    out_fmt, 'SymInf', 'Sat')
+        test_fix = self.test_a_fix.mult(self.test_b_fix, out_fmt, 'SymInf', 'Sat', prod_fmt, 'NonSymPos', 'Wrap')
+        self.assertEqual(test_fix.fmt, out_fmt)
+        self.assertEqual(test_fix.fimath, (fix.ERoundMethod.SYM_INF, fix.EOverMethod.SAT))
+        np.testing.assert_array_equal(test_fix.value, exp_re.value + 1j * exp_im.value)
+
+        # 3-multiplier variant, pre-adders are exact
+        prod_fmt = fix.FixFmt(True, 2, 9)
+        k_1 = b_re.mult(a_re + a_im, prod_fmt, 'Floor', 'Wrap')
+        k_2 = a_re.mult(b_im - b_re, prod_fmt, 'Floor', 'Wrap')
+        k_3 = a_im.mult(b_re + b_im, prod_fmt, 'Floor', 'Wrap')
+        test_fix = self.test_a_fix.mult(self.test_b_fix, prod_fmt=prod_fmt, prod_rnd='Floor', three_mult=True)
+        self.assertEqual(test_fix.fmt, fix.FixFmt(True, 3, 9))
+        np.testing.assert_array_equal(test_fix.value[1:], ((k_1 - k_3).value + 1j * (k_1 + k_2).value)[1:])
+        # the exact (-1) * (-4) product wraps in the product format
+        self.assertEqual(test_fix.value[0], -4j)
+
+        # real operands
+        gain_fix = fix.FixNum(self.vec_b.real, self.fmt_b, 'ConvEven', 'Sat')
+        test_fix = self.test_a_fix * gain_fix
+        np.testing.assert_array_equal(test_fix.value[1:], (self.test_a_fix.value * gain_fix.value)[1:])
+        # minimum values product saturates as in FixNum
+        self.assertEqual(test_fix.value[0], (2 - 2**-17) * (1 + 1j))
+        test_fix = self.test_a_fix * fix.FixScalar(-.5, self.fmt_b, 'ConvEven', 'Sat')
+        self.assertEqual(test_fix.fmt, fix.FixFmt(True, 1, 17))
+        np.testing.assert_array_equal(test_fix.value, -.5 * self.test_a_fix.value)
+
+        # conjugate and magnitude squared
+        test_fix = self.test_b_fix.conj()
+        self.assertEqual(test_fix.fmt, self.fmt_b)
+        np.testing.assert_array_equal(test_fix.value, self.test_b_fix.value.real +
+                                      1j * np.minimum(-self.test_b_fix.value.imag, max_b))
+        self.assertEqual(test_fix.value[0], -1 + max_b * 1j)
+
+        test_fix = self.test_b_fix.mag2()
+        self.assertEqual(test_fix.fmt, fix.FixFmt(False, 1, 14))
+        np.testing.assert_array_equal(test_fix.value[1:], self.test_b_fix.value.real[1:]**2 +
+                                      self.test_b_fix.value.imag[1:]**2)
+        self.assertEqual(test_fix.value[0], 2 - 2**-14)
+        test_fix = self.test_a_fix.mag2(fix.FixFmt(False, 4, 3), 'Floor')
+        np.testing.assert_array_equal(test_fix.value[1:], np.floor(
+            (self.test_a_fix.value.real[1:]**2 + self.test_a_fix.value.imag[1:]**2) * 8) / 8)
+        self.assertEqual(test_fix.value[0], 8 - 2**-3)
+
+    def test_wide_mantissa(self):
+        """DESCR: Test FixComplex exactness on formats wider than 64 bits."""
+
+        fmt = fix.FixFmt(True, 10, 40)
+        test_fix = fix.FixComplex.from_raw([[(1 << 45) + 1, -(1 << 44) + 3], [-1, 1 << 49]], fmt)
+        test_int = [((1 << 45) + 1) - 1j * ((1 << 44) - 3), -1 + 1j * (1 << 49)]
+
+        prod_fix = test_fix.mult(test_fix, three_mult=True)
+        self.assertEqual(prod_fix.fmt, fix.FixFmt(True, 21, 80))
+        exp_re = [int(x.real)**2 - int(x.imag)**2 for x in test_int]
+        exp_im = [2 * int(x.real) * int(x.imag) for x in test_int]
+        self.assertEqual(list(prod_fix.real.iter_raw()), exp_re)
+        self.assertEqual(list(prod_fix.imag.iter_raw()), exp_im)
+        self.assertEqual(list(test_fix.mag2().iter_raw()), [int(x.real)**2 + int(x.imag)**2 for x in test_int])
+
+
+if __name__ == '__main__':
+    utst.main()
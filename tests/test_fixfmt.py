@@ -1,13 +1,10 @@
 """Test FixFmt features."""
 
+import pickle
 import unittest as utst
-import importlib as imp
 
 from pyphix import fix
 
-# reload module to be sure last changes are taken into account
-imp.reload(fix)
-
 
 class TestFixFmtMethods(utst.TestCase):
     """Test FixFmt features."""
@@ -67,6 +64,32 @@ class TestFixFmtMethods(utst.TestCase):
         self.assertTrue(self.fmt.maxvalue() in self.fmt)
         self.assertTrue(self.fmt.minvalue() in self.fmt)
 
+    def test_interning(self):
+        """DESCR: Test formats are interned, hashable and immutable."""
+
+        # same object for same format
+        self.assertIs(fix.FixFmt(True, 21, self.CONVERT_TO_INT), fix.FixFmt(True, 21, self.CONVERT_TO_INT))
+        self.assertIs(pickle.loads(pickle.dumps(self.fmt)), fix.FixFmt(*self.fmt.tuplefmt))
+        self.assertNotEqual(self.fmt, fix.FixFmt(False, 21, self.CONVERT_TO_INT))
+
+        # usable as dictionary key
+        fmt_dict = {self.fmt: 'a', fix.FixFmt(False, 1, 1): 'b'}
+        self.assertEqual(fmt_dict[fix.FixFmt(*self.fmt.tuplefmt)], 'a')
+
+        # immutable
+        with self.assertRaises(AttributeError):
+            self.fmt.int_bits = 3
+
+        # wrong types are still rejected
+        with self.assertRaises(ValueError):
+            fix.FixFmt(1, 21, self.CONVERT_TO_INT)
+        with self.assertRaises(ValueError):
+            fix.FixFmt(True, 21.0, self.CONVERT_TO_INT)
+
+        # derived constants
+        self.assertEqual(self.fmt.intrange, (self.fmt.minvalue('int'), self.fmt.maxvalue('int')))
+        self.assertEqual(self.fmt.scale, 2**self.CONVERT_TO_INT)
+
 
 if __name__ == '__main__':
     utst.main()
@@ -4,16 +4,13 @@ __author__ = "Samuele FAVAZZA"
 __copyright__ = "Copyright 2018, Samuele FAVAZZA"
 
 import unittest as utst
-import importlib as imp
+from concurrent.futures import ThreadPoolExecutor
 
 import numpy as np
 from numpy import bitwise_and as np_and
 
 from pyphix import fix
 
-# reload module to be sure last changes are taken into account
-imp.reload(fix)
-
 
 class TestFixRoundOverMethods(utst.TestCase):
     """Test FixNum features."""
@@ -122,6 +119,11 @@ class TestFixRoundOverMethods(utst.TestCase):
             np.testing.assert_array_equal(over_exp_signed[key],
                                           over_fix_signed[key].value)
 
+            # in place overflow on integer mantissa
+            tmp_mant = np.array(over_pattern_signed * 2**self.s_4.frac_bits, dtype=np.int64)
+            self.assertIs(over_fix_signed[key]._over(tmp_mant, out=tmp_mant), tmp_mant)  # pylint: disable=protected-access
+            np.testing.assert_array_equal(over_exp_signed[key], tmp_mant / 2**self.s_4.frac_bits)
+
     def test_known_unsigned_overflow(self):
         """DESCR: Test overflow methods on unsigned values."""
 
@@ -148,6 +150,42 @@ class TestFixRoundOverMethods(utst.TestCase):
             np.testing.assert_array_equal(over_exp_unsigned[key],
                                           over_fix_unsigned[key].value)
 
+    def test_round_table(self):
+        """DESCR: Test round methods against the README round table."""
+
+        fmt = fix.FixFmt(True, 4, 5)
+        tst_pattern = [7.296875, 2.325, -1.078125, -1.08125]
+        tst_exp = {'SymInf': [7.3125, 2.3125, -1.09375, -1.09375],
+                   'SymZero': [7.28125, 2.3125, -1.0625, -1.09375],
+                   'NonSymPos': [7.3125, 2.3125, -1.0625, -1.09375],
+                   'NonSymNeg': [7.28125, 2.3125, -1.09375, -1.09375],
+                   'ConvEven': [7.3125, 2.3125, -1.0625, -1.09375],
+                   'ConvOdd': [7.28125, 2.3125, -1.09375, -1.09375],
+                   'Floor': [7.28125, 2.3125, -1.09375, -1.09375],
+                   'Ceil': [7.3125, 2.34375, -1.0625, -1.0625]}
+
+        for key in tst_exp:
+            tst_fix = fix.FixNum(tst_pattern, fmt, key)
+            np.testing.assert_array_equal(tst_fix.value, tst_exp[key], err_msg=key)
+
+            # remainders just above half always round to nearest, whatever the tie rule
+            np.testing.assert_array_equal(fix.FixNum([2.55 / 32, -2.55 / 32], fmt, key).intfmt,
+                                          [2, -3 & fmt.mask] if key == 'Floor' else
+                                          [3, -2 & fmt.mask] if key == 'Ceil' else
+                                          [3, -3 & fmt.mask], err_msg=key)
+
+            # integer domain rounding gives the same results
+            np.testing.assert_array_equal(
+                fix.FixNum(tst_pattern, fix.FixFmt(True, 4, 12)).change_fix(fmt, key).value,
+                fix.FixNum(fix.FixNum(tst_pattern, fix.FixFmt(True, 4, 12)).value, fmt, key).value,
+                err_msg=key)
+
+            # result written into caller buffer
+            out_buf = np.empty(4, dtype=np.int64)
+            ret_buf = tst_fix._round(np.array(tst_pattern) * 2**fmt.frac_bits, out=out_buf)  # pylint: disable=protected-access
+            self.assertIs(ret_buf, out_buf)
+            np.testing.assert_array_equal(out_buf / 2**fmt.frac_bits, tst_exp[key], err_msg=key)
+
     @staticmethod
     def test_change_fix():
         """DESCR: Test fimath change."""
@@ -214,6 +252,19 @@ class TestFixNumMethods(utst.TestCase):
         exp_int_vec = [1, 989, 1571, 1152, 0, 1024]
         np.testing.assert_array_equal(src_fix_vec.intfmt, exp_int_vec)
 
+        # bulk formatting
+        np.testing.assert_array_equal(src_fix_vec.strfmt('hex', prefix=False),
+                                      [x[2:].encode('ascii') for x in exp_hex_vec])
+        self.assertEqual(src_fix_vec.bytesfmt('bin', sep=b' '),
+                         ''.join([x + ' ' for x in exp_bin_vec]).encode('ascii'))
+        with self.assertRaises(ValueError):
+            src_fix_vec.strfmt('int')
+
+        # wide format
+        wide_fix_vec = fix.FixNum(src_vec, fix.FixFmt(True, 3, 70))
+        np.testing.assert_array_equal(wide_fix_vec.hexfmt,
+                                      ['0x' + format(x, '019x') for x in wide_fix_vec.intfmt])
+
     def test_container_methods(self):
         """DESCR: Test FixNum container behavior."""
 
@@ -244,6 +295,21 @@ class TestFixNumMethods(utst.TestCase):
         self.assertEqual(test_fix_vec[1, 1], fix.FixNum(1000, self.s3_7))
         np.testing.assert_array_equal(test_fix_vec.value, fix.FixNum(random_vec, self.s3_7).value)
 
+        # slices are views, writes go through to the parent
+        row_view = test_fix_vec[1]
+        row_copy = test_fix_vec[1].copy()
+        row_view[2:] = fix.FixNum([-1.5, 0.25], fix.FixFmt(True, 4, 2))
+        random_vec[1, 2:] = [-1.5, 0.25]
+        np.testing.assert_array_equal(test_fix_vec.value, fix.FixNum(random_vec, self.s3_7).value)
+        self.assertFalse(np.array_equal(row_copy.value, row_view.value))
+        test_fix_vec[1, 3] = 0.5
+        self.assertEqual(row_view[3], fix.FixNum(0.5, self.s3_7))
+
+        # advanced indexing returns a copy
+        sel_fix = test_fix_vec[[0, 1], [0, 0]]
+        sel_fix[0] = 0
+        self.assertEqual(test_fix_vec[0, 0], fix.FixNum(random_vec[0, 0], self.s3_7))
+
     def test_generator(self):
         """DESCR: Test FixNum generator feature."""
 
@@ -258,6 +324,15 @@ class TestFixNumMethods(utst.TestCase):
         for idx, fix_element in enumerate(test_fix):
             self.assertEqual(fix_element, test_fix[idx])
 
+        # nested iterations are independent
+        self.assertEqual(sum(1 for _ in test_fix for _ in test_fix), len(test_fix)**2)
+
+        # raw mantissas and chunks
+        self.assertEqual(list(test_fix.iter_raw(chunk_size=7)), list(test_fix._mant))  # pylint: disable=protected-access
+        tmp_chunks = list(test_fix.iter_chunks(30))
+        self.assertEqual([len(x) for x in tmp_chunks], [30, 30, 30, 10])
+        np.testing.assert_array_equal(np.concatenate([x.value for x in tmp_chunks]), test_fix.value)
+
     def test_addsub(self):
         """DESCR: Test FixNum addition and subtraction operations."""
 
@@ -346,6 +421,142 @@ class TestFixNumMethods(utst.TestCase):
         # verify full format is as expected
         self.assertEqual(self.test_a_fix.mult(self.test_b_fix).fmt.tuplefmt, fmt_mult_full.tuplefmt)
 
+    def test_from_raw(self):
+        """DESCR: Test FixNum fast constructor and full precision results."""
+
+        raw_mant = np.array([1, -3, 511, -512], dtype=np.int64)
+        raw_fix = fix.FixNum.from_raw(raw_mant, self.s3_7)
+
+        # no copy, no quantization
+        self.assertTrue(np.shares_memory(raw_fix._mant, raw_mant))  # pylint: disable=protected-access
+        np.testing.assert_array_equal(raw_fix.value, raw_mant / 2**self.s3_7.frac_bits)
+        self.assertEqual(fix.FixNum.from_raw(5, self.s3_7).shape, (1, ))
+
+        # signed minimum squared does not fit the full precision format and wraps
+        min_fix = fix.FixNum(self.fmt_a.minvalue(), self.fmt_a)
+        np.testing.assert_array_equal((min_fix * min_fix).value, [-2**(2 * self.fmt_a.int_bits)])
+        # unsigned difference wraps
+        np.testing.assert_array_equal((self.test_b_fix[1] - self.test_b_fix[0]).intfmt,
+                                      [(self.test_b_int[1] - self.test_b_int[0]) & fix.FixFmt(False, 6, 2).mask])
+        # exact cast shares no memory with the source
+        self.assertFalse(np.shares_memory(self.test_a_fix.change_fix(self.fmt_a)._mant,  # pylint: disable=protected-access
+                                          self.test_a_fix._mant))  # pylint: disable=protected-access
+
+    def test_mac(self):
+        """DESCR: Test FixNum multiply-accumulate, dot product and sum."""
+
+        test_mat_fix = fix.FixNum(np.reshape(self.test_a_int[:100], (4, 25)) / 2**self.fmt_a.frac_bits,
+                                  self.fmt_a)
+        test_vec_fix = self.test_b_fix[:25]
+        int_mat = np.reshape(self.test_a_int[:100], (4, 25))
+
+        # dot: exact integer result, format grows by the guard bits
+        dot_fix = test_mat_fix.dot(test_vec_fix)
+        self.assertEqual(dot_fix.fmt.tuplefmt, (True, self.fmt_a.int_bits + self.fmt_b.int_bits + 5,
+                                                self.fmt_a.frac_bits + self.fmt_b.frac_bits))
+        np.testing.assert_array_equal(dot_fix.value, np.dot(int_mat, self.test_b_int[:25]) /
+                                      2**(self.fmt_a.frac_bits + self.fmt_b.frac_bits))
+        np.testing.assert_array_equal(test_mat_fix.dot(test_vec_fix, out_fmt=self.s3_7, out_rnd='ConvEven').value,
+                                      dot_fix.change_fix(self.s3_7, 'ConvEven').value)
+
+        # sum
+        for axis in [None, 0, 1, (0, 1)]:
+            sum_fix = fix.sum(test_mat_fix, axis=axis)
+            np.testing.assert_array_equal(sum_fix.value, np.reshape(np.sum(int_mat, axis=axis), -1) /
+                                          2**self.fmt_a.frac_bits)
+        self.assertEqual(fix.sum(test_mat_fix, axis=1).fmt.int_bits, self.fmt_a.int_bits + 5)
+
+        # mac: single quantization, acc format and fimath kept
+        acc_fix = fix.FixNum(np.zeros(25), fix.FixFmt(True, 6, 4), 'ConvEven', 'Sat')
+        for row_fix in test_mat_fix:
+            exp_fix = (acc_fix + row_fix[0] * test_vec_fix).change_fix(acc_fix.fmt, 'ConvEven', 'Sat')
+            acc_fix = fix.FixNum.mac(acc_fix, row_fix[0], test_vec_fix)
+            np.testing.assert_array_equal(acc_fix.value, exp_fix.value)
+        self.assertEqual(acc_fix.fimath, (fix.ERoundMethod.CONV_EVEN, fix.EOverMethod.SAT))
+
+    def test_wide_mantissa(self):
+        """DESCR: Test FixNum exactness on formats wider than 64 bits."""
+
+        fmt = fix.FixFmt(True, 10, 50)
+        test_int = [(1 << 52) + 1, -(1 << 52) + 3, 1, -1]
+        test_fix = fix.FixNum(np.array(test_int, dtype=np.int64) / 2**fmt.frac_bits, fmt)
+
+        # the full precision product requires more than 53 bits (float64 mantissa)
+        exp_mult_full_int = [(x * x) & test_fix.mult(test_fix).fmt.mask for x in test_int]
+        self.assertEqual(list(test_fix.mult(test_fix).intfmt), exp_mult_full_int)
+
+        np.testing.assert_array_equal(test_fix.mult(test_fix).value,
+                                      [float(x * x) / 2**(2 * fmt.frac_bits) for x in test_int])
+
+        # accumulate and cast back
+        exp_acc_int = [(2 * x * x) >> (2 * fmt.frac_bits - 51) for x in test_int]
+        acc_fix = (test_fix * test_fix + test_fix * test_fix).change_fix(fix.FixFmt(True, 22, 100), 'Floor')
+        np.testing.assert_array_equal(acc_fix.change_fix(fix.FixFmt(True, 22, 51), 'Floor').intfmt,
+                                      [x & fix.FixFmt(True, 22, 51).mask for x in exp_acc_int])
+
+        # np.int64 mantissas requantized to formats wider than 64 bits
+        narrow_fix = fix.FixNum([1.5, -2.25], fix.FixFmt(True, 4, 20))
+        for over in ['Sat', 'Wrap']:
+            wide_fix = narrow_fix.change_fix(fix.FixFmt(True, 70, 2), 'SymZero', over)
+            self.assertEqual(list(wide_fix.intfmt), [6, (-9) & wide_fix.fmt.mask])
+            np.testing.assert_array_equal(fix.FixNum(narrow_fix, fix.FixFmt(True, 70, 10), 'SymZero', over).value,
+                                          [1.5, -2.25])
+            np.testing.assert_array_equal(fix.FixNum([7.5], fix.FixFmt(False, 3, 57)).change_fix(
+                fix.FixFmt(False, 9, 55), 'SymZero', over).value, [7.5])
+        self.assertEqual(list(narrow_fix.change_fix(fix.FixFmt(False, 70, 2), 'SymZero', 'Sat').intfmt), [6, 0])
+        self.assertEqual(list(narrow_fix.change_fix(fix.FixFmt(False, 70, 2), 'SymZero', 'Wrap').intfmt),
+                         [6, 2**72 - 9])
+
+        # out of range floats on formats close to 63 bits, the scaled values do not fit a np.int64
+        fmt = fix.FixFmt(True, 4, 58)
+        test_fix = fix.FixNum([10., 1e6, -1e6, -3.5], fmt, 'SymInf', 'Sat')
+        self.assertEqual(list(test_fix.intfmt), [10 << 58, 2**62 - 1, 2**62, (-7 << 57) & fmt.mask])
+        test_fix = fix.FixNum([1e6 + .5, -1e6 - 3.5], fmt, 'SymInf', 'Wrap')
+        self.assertEqual(list(test_fix.intfmt), [1 << 57, (-7 << 57) & fmt.mask])
+        self.assertEqual(list(fix.FixNum([1e6, -3.], fix.FixFmt(False, 4, 59), 'SymInf', 'Sat').intfmt),
+                         [2**63 - 1, 0])
+        test_fix = fix.FixNum([10., -10.], fix.FixFmt(True, 0, 62), 'SymZero', 'Sat')
+        self.assertEqual(list(test_fix.intfmt), [2**62 - 1, 2**62])
+        test_fix[:] = [-1e9, 1e9]
+        self.assertEqual(list(test_fix.intfmt), [2**62, 2**62 - 1])
+        self.assertEqual(test_fix[0].fmt, fix.FixFmt(True, 0, 62))
+
+    def test_parallel(self):
+        """DESCR: Test chunked multi-thread execution is bit-identical to the serial one."""
+
+        in_vec = self.rand_generator.uniform(-3, 3, (37, 29))
+        in_fmt, out_fmt = fix.FixFmt(True, 1, 14), fix.FixFmt(True, 2, 9)
+
+        def run_ops():
+            a_fix = fix.FixNum(in_vec, in_fmt, 'ConvEven', 'Sat')
+            b_fix = fix.FixNum(in_vec[::-1], fix.FixFmt(False, 1, 6), 'ConvEven', 'Sat')
+            return [a_fix, b_fix, a_fix.change_fix(out_fmt, 'SymInf', 'Wrap'),
+                    a_fix.add(b_fix), a_fix.sub(b_fix[0], out_fmt), a_fix.mult(a_fix, out_fmt, 'Floor', 'Sat'),
+                    b_fix - b_fix, fix.FixNum(in_vec[0, 0], in_fmt)]
+
+        exp_fix_list = run_ops()
+        prev_settings = fix.set_parallel(4, 100)
+        try:
+            self.assertEqual(prev_settings, (1, 65536))
+            for test_fix, exp_fix in zip(run_ops(), exp_fix_list):
+                self.assertEqual(test_fix.fmt, exp_fix.fmt)
+                np.testing.assert_array_equal(test_fix.intfmt, exp_fix.intfmt)
+
+            # concurrent callers share the pool while it is replaced
+            def run_and_reconfigure(idx):
+                fix.set_parallel(3 + idx % 2, 100)
+                return run_ops()
+
+            with ThreadPoolExecutor(max_workers=4) as callers:
+                for test_fix_list in callers.map(run_and_reconfigure, range(16)):
+                    for test_fix, exp_fix in zip(test_fix_list, exp_fix_list):
+                        np.testing.assert_array_equal(test_fix.intfmt, exp_fix.intfmt)
+        finally:
+            fix.set_parallel(*prev_settings)
+
+        with self.assertRaises(ValueError):
+            fix.set_parallel(0)
+
     def test_logic_operations(self):
         """DESCR: Test FixNum logic operations."""
 
@@ -0,0 +1,90 @@
+"""Test FixScalar features."""
+
+__author__ = "Samuele FAVAZZA"
+__copyright__ = "Copyright 2018, Samuele FAVAZZA"
+
+import unittest as utst
+
+import numpy as np
+
+from pyphix import fix
+
+
+class TestFixScalarMethods(utst.TestCase):
+    """Test FixScalar against FixNum behavior."""
+
+    # define formats
+    fmt_a = fix.FixFmt(True, 2, 7)
+    fmt_b = fix.FixFmt(False, 5, 2)
+    fmt_out = fix.FixFmt(True, 3, 3)
+
+    # test values (include min/max and ties)
+    rand_generator = np.random.RandomState(122)       # make tests repeatible
+    test_a_vec = np.append([fmt_a.minvalue(), fmt_a.maxvalue(), -1.5 / 2**7, 2.5 / 2**7],
+                           rand_generator.uniform(-5, 5, 50))
+    test_b_vec = np.append([fmt_b.minvalue(), fmt_b.maxvalue(), 1.5 / 4, 35],
+                           rand_generator.uniform(-1, 40, 50))
+
+    def test_quantization(self):
+        """DESCR: Test round and overflow methods match FixNum ones."""
+
+        for rnd in fix.ERoundMethod:
+            for over in fix.EOverMethod:
+                exp_fix = fix.FixNum(self.test_a_vec, self.fmt_out, rnd, over)
+                tst_val = [fix.FixScalar(x, self.fmt_out, rnd, over).value for x in self.test_a_vec]
+                np.testing.assert_array_equal(tst_val, exp_fix.value, err_msg=str((rnd, over)))
+
+                # integer domain
+                src_fix = fix.FixNum(self.test_a_vec, self.fmt_a)
+                tst_val = [x.change_fix(self.fmt_out, rnd, over).value for x in src_fix.iter_scalars()]
+                np.testing.assert_array_equal(tst_val, src_fix.change_fix(self.fmt_out, rnd, over).value,
+                                              err_msg=str((rnd, over)))
+
+        # python integers are exact
+        self.assertEqual(fix.FixScalar(2**60 + 1, fix.FixFmt(True, 62, 10)).mant, (2**60 + 1) << 10)
+
+    def test_operations(self):
+        """DESCR: Test operations match FixNum ones."""
+
+        fix_a = fix.FixNum(self.test_a_vec, self.fmt_a)
+        fix_b = fix.FixNum(self.test_b_vec, self.fmt_b)
+
+        for op_name in ['add', 'sub', 'mult']:
+            exp_full = getattr(fix_a, op_name)(fix_b)
+            exp_cast = getattr(fix_a, op_name)(fix_b, out_fmt=self.fmt_out, out_rnd='ConvEven', out_over='Sat')
+
+            for idx, (sca_a, sca_b) in enumerate(zip(fix_a.iter_scalars(), fix_b.iter_scalars())):
+                tst_full = getattr(sca_a, op_name)(sca_b)
+                self.assertEqual(tst_full.fmt.tuplefmt, exp_full.fmt.tuplefmt)
+                self.assertEqual(tst_full.intfmt, exp_full.intfmt[idx], msg=op_name)
+                self.assertEqual(getattr(sca_a, op_name)(sca_b, out_fmt=self.fmt_out, out_rnd='ConvEven',
+                                                         out_over='Sat').value,
+                                 exp_cast.value[idx], msg=op_name)
+
+        np.testing.assert_array_equal([(-x).value for x in fix_a.iter_scalars()], (-fix_a).value)
+
+    def test_fixnum_interop(self):
+        """DESCR: Test mixed FixScalar/FixNum operations and representations."""
+
+        fix_a = fix.FixNum(self.test_a_vec, self.fmt_a)
+        sca_b = fix.FixScalar(3.25, self.fmt_b)
+
+        # mixed operations return FixNum
+        self.assertTrue(isinstance(fix_a + sca_b, fix.FixNum))
+        np.testing.assert_array_equal((fix_a * sca_b).value, (fix_a * fix.FixNum(3.25, self.fmt_b)).value)
+        np.testing.assert_array_equal((sca_b - fix_a).value, (fix.FixNum(3.25, self.fmt_b) - fix_a).value)
+
+        # element access
+        self.assertEqual(fix_a.item(3), fix.FixScalar(self.test_a_vec[3], self.fmt_a))
+        self.assertEqual(fix.FixScalar(fix_a[3], self.fmt_a), fix_a.item(3))
+        self.assertTrue(sca_b > fix_a.item(0))
+        self.assertTrue(sca_b == 3.25)
+
+        # representations
+        self.assertEqual(fix_a.item(0).hexfmt, fix_a.hexfmt[0])
+        self.assertEqual(fix_a.item(0).binfmt, fix_a.binfmt[0])
+        self.assertEqual(fix_a.item(0).intfmt, fix_a.intfmt[0])
+
+
+if __name__ == '__main__':
+    utst.main()
@@ -0,0 +1,184 @@
+"""Test function generators features."""
+
+__author__ = "Samuele FAVAZZA"
+__copyright__ = "Copyright 2018, Samuele FAVAZZA"
+
+import unittest as utst
+
+import numpy as np
+
+from pyphix import fix
+from pyphix import funcgen
+
+
+def cordic_reference(x_mant, y_mant, z_mant, cordic, vectoring):
+    """Per-sample CORDIC reference model on python integers (wrapping registers), return the (x, y, z)
+    mantissas."""
+
+    def wrap(value, fmt):
+        return (value + 2**(fmt.bit_length - 1)) % 2**fmt.bit_length - 2**(fmt.bit_length - 1)
+
+    atan = [fix.FixScalar(np.arctan(2.**-x), cordic.angle_fmt, cordic.rnd).mant for x in range(cordic.iterations)]
+    half_pi = fix.FixScalar(np.pi / 2, cordic.angle_fmt, cordic.rnd).mant
+
+    if vectoring and x_mant < 0:
+        x_mant, y_mant, z_mant = (y_mant, -x_mant, half_pi) if y_mant >= 0 else (-y_mant, x_mant, -half_pi)
+    elif not vectoring and z_mant > half_pi:
+        x_mant, y_mant, z_mant = -y_mant, x_mant, z_mant - half_pi
+    elif not vectoring and z_mant < -half_pi:
+        x_mant, y_mant, z_mant = y_mant, -x_mant, z_mant + half_pi
+    x_mant, y_mant, z_mant = wrap(x_mant, cordic.data_fmt), wrap(y_mant, cordic.data_fmt), wrap(z_mant,
+                                                                                                 cordic.angle_fmt)
+
+    for idx in range(cordic.iterations):
+        direction = 1 if (y_mant < 0 if vectoring else z_mant >= 0) else -1
+        x_mant, y_mant, z_mant = (wrap(x_mant - direction * (y_mant >> idx), cordic.data_fmt),
+                                  wrap(y_mant + direction * (x_mant >> idx), cordic.data_fmt),
+                                  wrap(z_mant - direction * atan[idx], cordic.angle_fmt))
+
+    return x_mant, y_mant, z_mant
+
+
+class TestCordic(utst.TestCase):
+    """Test CORDIC engine."""
+
+    rand_generator = np.random.RandomState(122)       # make tests repeatible
+    angles = rand_generator.uniform(-np.pi, np.pi, 1000)
+    coords = rand_generator.uniform(-.6, .6, (2, 1000))
+    data_fmt = fix.FixFmt(True, 1, 16)
+    angle_fmt = fix.FixFmt(True, 2, 16)
+
+    def test_precision(self):
+        """DESCR: Test rotation and vectoring modes against floating point functions."""
+
+        cordic = funcgen.Cordic(18, self.data_fmt, self.angle_fmt, 'ConvEven')
+        angle_fix = fix.FixNum(self.angles, self.angle_fmt)
+        x_fix, y_fix = [fix.FixNum(x, self.data_fmt) for x in self.coords]
+
+        cos_fix, sin_fix = cordic.sincos(angle_fix)
+        self.assertEqual(cos_fix.fmt, self.data_fmt)
+        np.testing.assert_allclose(cos_fix.value, np.cos(angle_fix.value), atol=2e-4)
+        np.testing.assert_allclose(sin_fix.value, np.sin(angle_fix.value), atol=2e-4)
+
+        exp_val = (x_fix.value + 1j * y_fix.value) * np.exp(1j * angle_fix.value)
+        x_rot, y_rot = cordic.rotate(x_fix, y_fix, angle_fix)
+        np.testing.assert_allclose(x_rot.value + 1j * y_rot.value, exp_val, atol=2e-4)
+        x_rot, y_rot = cordic.rotate(x_fix, y_fix, angle_fix, gain_comp=False)
+        np.testing.assert_allclose(x_rot.value + 1j * y_rot.value, exp_val * cordic.gain, atol=2e-4)
+
+        mag_fix, angle_out = cordic.vector(x_fix, y_fix)
+        self.assertEqual(angle_out.fmt, self.angle_fmt)
+        np.testing.assert_allclose(mag_fix.value, np.hypot(x_fix.value, y_fix.value), atol=2e-4)
+        # the angle resolution degrades with the vector magnitude
+        np.testing.assert_allclose(angle_out.value, np.arctan2(y_fix.value, x_fix.value), atol=2e-3)
+
+        # all the quadrants boundaries
+        angle_fix = fix.FixNum(np.pi * np.arange(-4, 5) / 4, self.angle_fmt)
+        cos_fix, sin_fix = cordic.sincos(angle_fix)
+        np.testing.assert_allclose(cos_fix.value, np.cos(angle_fix.value), atol=2e-4)
+        np.testing.assert_allclose(sin_fix.value, np.sin(angle_fix.value), atol=2e-4)
+        _, angle_out = cordic.vector(cos_fix, sin_fix)
+        np.testing.assert_allclose(np.exp(1j * angle_out.value), np.exp(1j * angle_fix.value), atol=2e-4)
+
+    def test_bit_true(self):
+        """DESCR: Test rotation and vectoring modes against per-sample reference model."""
+
+        for data_fmt, angle_fmt, rnd in [(fix.FixFmt(True, 1, 10), fix.FixFmt(True, 2, 12), 'SymZero'),
+                                         (fix.FixFmt(True, 2, 40), fix.FixFmt(True, 3, 40), 'ConvEven')]:
+            cordic = funcgen.Cordic(12, data_fmt, angle_fmt, rnd)
+            angle_fix = fix.FixNum(self.angles[:200], angle_fmt, rnd)
+            x_fix, y_fix = [fix.FixNum(x[:200], data_fmt, rnd) for x in self.coords]
+
+            x_rot, y_rot = cordic.rotate(x_fix, y_fix, angle_fix, gain_comp=False)
+            mag_fix, angle_out = cordic.vector(x_fix, y_fix, gain_comp=False)
+            for idx in range(200):
+                x_mant, y_mant, _ = cordic_reference(x_fix.item(idx).mant, y_fix.item(idx).mant,
+                                                     angle_fix.item(idx).mant, cordic, False)
+                self.assertEqual(x_rot.item(idx).mant, x_mant)
+                self.assertEqual(y_rot.item(idx).mant, y_mant)
+
+                x_mant, _, z_mant = cordic_reference(x_fix.item(idx).mant, y_fix.item(idx).mant, 0, cordic, True)
+                self.assertEqual(mag_fix.item(idx).mant, x_mant)
+                self.assertEqual(angle_out.item(idx).mant, z_mant)
+
+        with self.assertRaises(ValueError):
+            funcgen.Cordic(0, self.data_fmt, self.angle_fmt)
+        with self.assertRaises(ValueError):
+            funcgen.Cordic(16, fix.FixFmt(False, 1, 16), self.angle_fmt)
+        with self.assertRaises(ValueError):
+            funcgen.Cordic(16, self.data_fmt, self.angle_fmt).rotate(x_fix, y_fix[:10], angle_fix)
+
+
+class TestLut(utst.TestCase):
+    """Test look-up table function generators."""
+
+    rand_generator = np.random.RandomState(122)       # make tests repeatible
+    samples = rand_generator.uniform(-1, 1, 1000)
+
+    def test_functions(self):
+        """DESCR: Test LUT based functions against floating point functions."""
+
+        out_fmt = fix.FixFmt(True, 1, 14)
+        angle_fix = fix.FixNum(self.samples * 4, fix.FixFmt(True, 2, 14))
+        np.testing.assert_allclose(funcgen.sin(angle_fix, out_fmt).value, np.sin(angle_fix.value), atol=1e-4)
+        np.testing.assert_allclose(funcgen.cos(angle_fix, out_fmt, 9, fix.FixFmt(True, 1, 20), 'ConvEven').value,
+                                   np.cos(angle_fix.value), atol=1e-4)
+
+        y_fix, x_fix = [fix.FixNum(x, fix.FixFmt(True, 0, 15)) for x in [self.samples, self.samples[::-1]]]
+        out_fix = funcgen.atan2(y_fix, x_fix, fix.FixFmt(True, 2, 14))
+        np.testing.assert_allclose(out_fix.value, np.arctan2(y_fix.value, x_fix.value), atol=1e-4)
+        zero = fix.FixNum([0, 0, 0, 0], fix.FixFmt(True, 0, 15))
+        axes = fix.FixNum([.5, -.5, 0, 0], fix.FixFmt(True, 0, 15))
+        np.testing.assert_allclose(funcgen.atan2(zero, axes, fix.FixFmt(True, 2, 14)).value,
+                                   [0, np.pi, 0, 0], atol=1e-4)
+        np.testing.assert_allclose(funcgen.atan2(axes, zero, fix.FixFmt(True, 2, 14)).value,
+                                   [np.pi / 2, -np.pi / 2, 0, 0], atol=1e-4)
+
+        value_fix = fix.FixNum(abs(self.samples) * 100, fix.FixFmt(False, 7, 10))
+        out_fix = funcgen.sqrt(value_fix, fix.FixFmt(False, 4, 14), 10, fix.FixFmt(False, 1, 20))
+        np.testing.assert_allclose(out_fix.value, np.sqrt(value_fix.value), atol=1e-4)
+        with self.assertRaises(ValueError):
+            funcgen.sqrt(fix.FixNum(self.samples, fix.FixFmt(True, 0, 10)), fix.FixFmt(False, 4, 14))
+
+        value_fix = fix.FixNum(self.samples * 100, fix.FixFmt(True, 7, 10))
+        value_fix = value_fix[value_fix.value != 0]
+        out_fix = funcgen.reciprocal(value_fix, fix.FixFmt(True, 8, 16), 10, fix.FixFmt(False, 2, 18))
+        np.testing.assert_allclose(out_fix.value, 1 / value_fix.value, rtol=1e-4, atol=2**-16)
+        out_fix = funcgen.reciprocal(fix.FixNum([0, 2**-10], fix.FixFmt(True, 7, 10)), fix.FixFmt(True, 8, 16))
+        np.testing.assert_array_equal(out_fix.value, [fix.FixFmt(True, 8, 16).maxvalue()] * 2)
+
+    def test_interpolation(self):
+        """DESCR: Test LUT interpolation against per-sample reference model and table caching."""
+
+        in_fmt, table_fmt, out_fmt = fix.FixFmt(True, 0, 12), fix.FixFmt(False, 2, 10), fix.FixFmt(False, 2, 12)
+        in_fix = fix.FixNum(self.samples, in_fmt)
+        for interp in [True, False]:
+            lut = funcgen.Lut(np.exp, in_fmt, 5, table_fmt, out_fmt, (-.5, .5), 'ConvEven', interp=interp)
+            bounds = np.linspace(-.5, .5, 33)
+            np.testing.assert_array_equal(lut.table.value, fix.FixNum(np.exp(bounds), table_fmt, 'ConvEven').value)
+
+            # per-sample interpolation with exact float arithmetic
+            table, step = lut.table.value, 1 / 32
+            exp_val = []
+            for value in np.clip(in_fix.value, -.5, .5):
+                addr = min(int((value + .5) // step), 31)
+                frac = (value + .5 - addr * step) / step if interp else 0
+                exp_val.append(table[addr] + (table[addr + 1] - table[addr]) * frac)
+            np.testing.assert_array_equal(lut.process(in_fix).value,
+                                          fix.FixNum(np.array(exp_val), out_fmt, 'ConvEven', 'Sat').value)
+
+        # tables are computed once per generator parameters
+        lut = funcgen.Lut(np.exp, in_fmt, 5, table_fmt, out_fmt, (-.5, .5), 'ConvEven')
+        self.assertIs(lut._table, funcgen.Lut(np.exp, in_fmt, 5, table_fmt, None, (-.5, .5), 'ConvEven')._table)  # pylint: disable=protected-access
+        self.assertIsNot(lut._table, funcgen.Lut(np.exp, in_fmt, 6, table_fmt)._table)  # pylint: disable=protected-access
+
+        with self.assertRaises(ValueError):
+            funcgen.Lut(np.exp, in_fmt, 14, table_fmt)
+        with self.assertRaises(ValueError):
+            funcgen.Lut(np.exp, in_fmt, 4, table_fmt, in_range=(-.5, .25))
+        with self.assertRaises(ValueError):
+            funcgen.Lut(np.exp, in_fmt, 4, table_fmt, in_range=(0, 2**-13))
+        with self.assertRaises(ValueError):
+            funcgen.Lut(1, in_fmt, 4, table_fmt)
+        with self.assertRaises(ValueError):
+            lut.process(fix.FixNum(self.samples, fix.FixFmt(True, 0, 10)))
@@ -0,0 +1,301 @@
+"""Test fix-point file features."""
+
+__author__ = "Samuele FAVAZZA"
+__copyright__ = "Copyright 2018, Samuele FAVAZZA"
+
+import os
+import tempfile
+import unittest as utst
+
+import numpy as np
+
+from pyphix import fix
+from pyphix import io as fio
+
+
+class TestFixFile(utst.TestCase):
+    """Test FixFile write and read methods."""
+
+    # prepare example data
+    data1 = np.linspace(2, 3, 49)
+    data2 = list(range(0, 49))
+    data3 = fix.FixNum(np.linspace(-.2, .24, 49), fix.FixFmt(True, 0, 8), 'SymInf', 'Wrap')
+    data4 = [int(x*10) % 2 == 0 for x in data1]
+    data5 = fix.FixNum(np.linspace(-3, 3, 49), fix.FixFmt(True, 40, 20))
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def make_file(self):
+        """Create the file object under test."""
+
+        return fio.FixFile() \
+            .add_column('data1', 'float', self.data1) \
+            .add_column('data2', 'int', self.data2) \
+            .add_column('data3', 'fix', self.data3) \
+            .add_column('data4', 'bool', self.data4) \
+            .add_column('data5', 'fix', self.data5)
+
+    def assert_file_equal(self, obj_file, obj_read_back):
+        """Compare header and columns of two file objects."""
+
+        self.assertEqual(obj_file.get_header(True), obj_read_back.get_header(True))
+        for col_name, col_type in obj_read_back.get_header(True):
+            exp_col, test_col = obj_file.get_column(col_name), obj_read_back.get_column(col_name)
+            if col_type == 'fix':
+                self.assertEqual(exp_col.fmt, test_col.fmt)
+                np.testing.assert_array_equal(exp_col.value, test_col.value)
+            else:
+                np.testing.assert_array_equal(np.array(exp_col), np.array(test_col))
+
+    def test_text_write_read(self):
+        """DESCR: Test text (nsf) file write and read."""
+
+        obj_file = self.make_file()
+        file_path = os.path.join(self.tmp_dir.name, 'test.nsf')
+        obj_file.write(file_path)
+
+        obj_read_back = fio.FixFile()
+        obj_read_back.read(file_path)
+        self.assert_file_equal(obj_file, obj_read_back)
+
+    def test_stream_write(self):
+        """DESCR: Test streaming text (nsf) file writer."""
+
+        obj_file = self.make_file()
+        file_path = os.path.join(self.tmp_dir.name, 'test.nsf')
+        header = [('data1', 'float'), ('data2', 'int'), ('data3', self.data3.fmt), ('data4', 'bool'),
+                  ('data5', self.data5.fmt)]
+
+        # unknown number of samples, blocks by name and in header order
+        with fio.FixFile.open_writer(file_path, header) as writer:
+            writer.write_block({'data1': self.data1[:10], 'data2': self.data2[:10], 'data3': self.data3[:10],
+                                'data4': self.data4[:10], 'data5': self.data5[:10]})
+            writer.write_block([self.data1[10:10], self.data2[10:10], self.data3[10:10], self.data4[10:10],
+                                self.data5[10:10]])
+            writer.write_block([self.data1[10:], self.data2[10:], self.data3[10:], self.data4[10:],
+                                self.data5[10:]])
+
+        obj_read_back = fio.FixFile()
+        obj_read_back.read(file_path)
+        self.assert_file_equal(obj_file, obj_read_back)
+
+        # streamed and one-shot files are identical
+        with open(file_path, 'rb') as f:
+            stream_lines = f.read().split(b'\n')
+        obj_file.write(file_path)
+        with open(file_path, 'rb') as f:
+            write_lines = f.read().split(b'\n')
+        self.assertEqual(stream_lines[0].split(), write_lines[0].split())
+        self.assertEqual(stream_lines[1:], write_lines[1:])
+        self.assertEqual(write_lines[3], b'2.0 0 0x1cd 1 0x1fffffffffd00000')
+
+        # wrong blocks
+        with self.assertRaises(ValueError):
+            with fio.FixFile.open_writer(file_path, header, 49) as writer:
+                writer.write_block([self.data1, self.data2, self.data3, self.data4, self.data5[1:]])
+        with self.assertRaises(ValueError):
+            with fio.FixFile.open_writer(file_path, header[:3], 49) as writer:
+                writer.write_block([self.data1, self.data2, self.data5])
+        with self.assertRaises(ValueError):
+            with fio.FixFile.open_writer(file_path, header, 50) as writer:
+                writer.write_block([self.data1, self.data2, self.data3, self.data4, self.data5])
+        # errors raised in the with block are not replaced by the sample count check
+        with self.assertRaises(KeyError):
+            with fio.FixFile.open_writer(file_path, header, 49) as writer:
+                writer.write_block([self.data1[:10], self.data2[:10], self.data3[:10], self.data4[:10],
+                                    self.data5[:10]])
+                raise KeyError('user error')
+        self.assertTrue(writer._f.closed)  # pylint: disable=protected-access
+        with self.assertRaises(ValueError):
+            fio.FixFile.open_writer(file_path, [('data1', 'complex')])
+        with self.assertRaises(KeyError):
+            fio.FixFile.open_writer(file_path, [('data1', 'int'), ('data1', 'bool')])
+
+    def test_iter_blocks(self):
+        """DESCR: Test block by block text (nsf) file reading."""
+
+        obj_file = self.make_file()
+        file_path = os.path.join(self.tmp_dir.name, 'test.nsf')
+        obj_file.write(file_path)
+
+        blocks = list(fio.FixFile.iter_blocks(file_path, 10))
+        self.assertEqual([len(x['data1']) for x in blocks], [10, 10, 10, 10, 9])
+        self.assertEqual(list(blocks[0].keys()), obj_file.get_header())
+        for col_name, col_type in obj_file.get_header(True):
+            exp_col = obj_file.get_column(col_name)
+            if col_type == 'fix':
+                self.assertTrue(all(x[col_name].fmt == exp_col.fmt for x in blocks))
+                np.testing.assert_array_equal(np.concatenate([x[col_name].value for x in blocks]), exp_col.value)
+            else:
+                np.testing.assert_array_equal(np.concatenate([x[col_name] for x in blocks]), np.array(exp_col))
+
+        # hand written file: wide mantissas, decimal and out of range values, legacy booleans, blank lines
+        wide_fmt = fix.FixFmt(True, 40, 30)
+        with open(file_path, 'w') as f:
+            f.write("nsf 3 4\n'wide' 'short' 'flag'\n(True,40,30) (True,1,2) 'bool'\n"
+                    "0x3fffffffffffffffffff 0x7 True\n"
+                    "0x1 5   False\n\n"
+                    "-3 0xF 1\r\n"
+                    "0x400000000000000000 0x1A 0\n\n")
+        obj_read_back = fio.FixFile()
+        obj_read_back.read(file_path)
+        self.assertEqual(obj_read_back.get_column('wide').fmt, wide_fmt)
+        self.assertEqual(list(obj_read_back.get_column('wide').iter_raw()), [-1, 1, -3, -(1 << 70)])
+        np.testing.assert_array_equal(obj_read_back.get_column('short').value, [1.75, 1.25, -.25, -1.5])
+        np.testing.assert_array_equal(obj_read_back.get_column('flag'), [True, False, True, False])
+
+        # wrong files
+        for file_content in ["nsf 1 2\n'a'\n'int'\n1\n2\n3\n",
+                             "nsf 1 2\n'a'\n'int'\n1\n",
+                             "nsf 2 2\n'a' 'b'\n'int' 'int'\n1 2\n3\n",
+                             "nsf 2 1\n'a' 'b'\n'int'\n1 2\n",
+                             "nsf 1 1\n'a'\n(True,1,2)\n0xg\n",
+                             "nsb 1 1\n'a'\n'int'\n1\n"]:
+            with open(file_path, 'w') as f:
+                f.write(file_content)
+            with self.assertRaises(ValueError):
+                list(fio.FixFile.iter_blocks(file_path, 1))
+
+    def test_compare(self):
+        """DESCR: Test comparison of files against golden results."""
+
+        golden_path = os.path.join(self.tmp_dir.name, 'golden.nsf')
+        dut_path = os.path.join(self.tmp_dir.name, 'dut.nsf')
+        self.make_file().write(golden_path)
+
+        # identical files
+        results = fio.compare(golden_path, golden_path, blockSize=8)
+        self.assertEqual(list(results.keys()), self.make_file().get_header())
+        self.assertTrue(all(x.numSamples == 49 and x.numMismatch == 0 and x.mismatches == []
+                            for x in results.values()))
+
+        # corrupt some samples
+        dut_file = self.make_file()
+        dut_file.get_column('data2')[[3, 20, 21]] = [-1, 0, 25]
+        dut_file.get_column('data4')[48] = not self.data4[48]
+        dut_fix = dut_file.get_column('data3').copy()
+        dut_fix[[5, 40]] = fix.FixNum([.125, -.125], dut_fix.fmt)
+        dut_file.remove_column('data3').add_column('data3', 'fix', dut_fix)
+        dut_file.write(dut_path)
+
+        results = fio.compare(dut_path, golden_path, maxMismatch=2, blockSize=8)
+        self.assertEqual(results['data2'], fio.ColumnCompare('data2', 49, 3, 20, [(3, -1, 3), (20, 0, 20)]))
+        self.assertEqual(results['data4'], fio.ColumnCompare('data4', 49, 1, 1, [(48, 0, 1)]))
+        exp_mant = list(self.data3[[5, 40]].iter_raw())
+        self.assertEqual(results['data3'], fio.ColumnCompare('data3', 49, 2, max(abs(32 - exp_mant[0]),
+                                                                                   abs(-32 - exp_mant[1])),
+                                                             [(5, 32, exp_mant[0]), (40, -32, exp_mant[1])]))
+        self.assertEqual(results['data1'].numMismatch, 0)
+        self.assertIn('data2: 3/49 mismatches, max error 20', fio.format_report(results))
+
+        # golden FixNum, errors in the finest LSB
+        fine_fix = self.data3.change_fix(fix.FixFmt(True, 1, 10))
+        results = fio.compare(dut_path, fine_fix, columns='data3')
+        self.assertEqual(list(results.keys()), ['data3'])
+        self.assertEqual(results['data3'].mismatches, [(5, 128, 4 * exp_mant[0]), (40, -128, 4 * exp_mant[1])])
+        results = fio.compare(dut_path, {'data5': self.data5, 'data2': self.data2})
+        self.assertEqual((results['data5'].numMismatch, results['data2'].numMismatch), (0, 3))
+
+        # blank lines in the data section do not misalign the compared blocks
+        with open(golden_path, 'rb') as f:
+            lines = f.readlines()
+        for idx in [-3, -10, -10, -25]:
+            lines.insert(idx, b'\n')
+        with open(dut_path, 'wb') as f:
+            f.writelines(lines)
+        self.assertEqual([len(x['data2']) for x in fio.FixFile.iter_blocks(dut_path, 4)], [4] * 12 + [1])
+        results = fio.compare(dut_path, {'data2': self.data2, 'data3': self.data3}, blockSize=4)
+        self.assertEqual((results['data2'].numMismatch, results['data3'].numMismatch), (0, 0))
+        results = fio.compare(dut_path, golden_path, blockSize=4)
+        self.assertTrue(all(x.numSamples == 49 and x.numMismatch == 0 for x in results.values()))
+
+        with self.assertRaises(ValueError):
+            fio.compare(dut_path, fine_fix)
+        with self.assertRaises(ValueError):
+            fio.compare(dut_path, {'data3': fine_fix[1:]})
+        with self.assertRaises(ValueError):
+            fio.compare(dut_path, {'data3': self.data2})
+        with self.assertRaises(KeyError):
+            fio.compare(dut_path, {'missing': self.data2})
+        fio.FixFile().add_column('data2', 'int', self.data2[1:]).write(golden_path)
+        with self.assertRaises(ValueError):
+            fio.compare(dut_path, golden_path, blockSize=8)
+
+    def test_bin_write_read(self):
+        """DESCR: Test binary (nsb) file write and memory mapped read."""
+
+        obj_file = self.make_file()
+        file_path = os.path.join(self.tmp_dir.name, 'test.nsb')
+        obj_file.write_bin(file_path)
+
+        with open(file_path, 'rb') as f:
+            self.assertEqual(f.readline(), b'nsb 5 49\n')
+
+        obj_read_back = fio.FixFile()
+        obj_read_back.read_bin(file_path)
+        self.assert_file_equal(obj_file, obj_read_back)
+
+        # columns are read-only views of the file
+        with self.assertRaises(ValueError):
+            obj_read_back.get_column('data3')[0] = fix.FixNum(0, fix.FixFmt(True, 0, 8))
+        self.assertFalse(obj_read_back.get_column('data1').flags.writeable)
+
+        # empty columns
+        obj_file = fio.FixFile().add_column('empty', 'fix', fix.FixNum([], fix.FixFmt(False, 3, 2)))
+        obj_file.write_bin(file_path)
+        obj_read_back.read_bin(file_path)
+        self.assert_file_equal(obj_file, obj_read_back)
+
+        # too wide mantissa
+        with self.assertRaises(ValueError):
+            fio.FixFile().add_column('wide', 'fix', fix.FixNum([1], fix.FixFmt(True, 30, 40))).write_bin(file_path)
+
+        # wrong file type
+        self.make_file().write(file_path)
+        with self.assertRaises(ValueError):
+            obj_read_back.read_bin(file_path)
+
+
+    def test_packed_write_read(self):
+        """DESCR: Test packed (nsz) file write and read."""
+
+        obj_file = self.make_file()
+        file_path = os.path.join(self.tmp_dir.name, 'test.nsz')
+
+        for compression in [None, 'zlib', 'lzma']:
+            for delta in [False, True]:
+                obj_file.write_packed(file_path, compression, delta)
+                obj_read_back = fio.FixFile()
+                obj_read_back.read_packed(file_path)
+                self.assert_file_equal(obj_file, obj_read_back)
+
+        # exact bit length per sample
+        obj_file.write_packed(file_path)
+        with open(file_path, 'rb') as f:
+            header = [f.readline() for _ in range(4)]
+            self.assertEqual(header[3], b"(64,False,None,392) (7,False,None,43) (9,False,None,56) "
+                                        b"(1,False,None,7) (61,False,None,374)\n")
+            self.assertEqual(len(f.read()), 392 + 43 + 56 + 7 + 374)
+
+        # slowly changing signal
+        ramp_file = fio.FixFile().add_column('ramp', 'fix', fix.FixNum(np.arange(10000) / 2**12, fix.FixFmt(True, 3, 12)))
+        ramp_file.write_packed(file_path, 'zlib', True)
+        delta_size = os.path.getsize(file_path)
+        ramp_file.write_packed(file_path, 'zlib')
+        self.assertLess(delta_size, os.path.getsize(file_path))
+
+        with self.assertRaises(ValueError):
+            obj_file.write_packed(file_path, 'bz2')
+        with self.assertRaises(ValueError):
+            fio.FixFile().add_column('wide', 'fix', fix.FixNum([1], fix.FixFmt(True, 30, 40))).write_packed(file_path)
+        obj_file.write_bin(file_path)
+        with self.assertRaises(ValueError):
+            obj_read_back.read_packed(file_path)
+
+
+if __name__ == '__main__':
+    utst.main()
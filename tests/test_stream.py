@@ -0,0 +1,63 @@
+"""Test streaming pipeline features."""
+
+__author__ = "Samuele FAVAZZA"
+__copyright__ = "Copyright 2018, Samuele FAVAZZA"
+
+import unittest as utst
+
+import numpy as np
+
+from pyphix import fix
+from pyphix import dsp
+from pyphix import stream
+
+
+class TestPipeline(utst.TestCase):
+    """Test block processing pipeline."""
+
+    rand_generator = np.random.RandomState(122)       # make tests repeatible
+    capture = rand_generator.uniform(-1.2, 1.2, 1000)
+    coeffs = fix.FixNum(rand_generator.uniform(-.5, .5, 12), fix.FixFmt(True, 0, 11))
+
+    def make_pipeline(self):
+        """Create the pipeline under test."""
+
+        return stream.Pipeline(
+            stream.Quantize(fix.FixFmt(True, 0, 13), 'ConvEven', 'Sat'),
+            stream.Mult(fix.FixScalar(.75, fix.FixFmt(False, 0, 2))),
+            dsp.FirFilter(self.coeffs, fix.FixFmt(True, 0, 16), out_fmt=fix.FixFmt(True, 2, 14), out_over='Sat'),
+            stream.Add(fix.FixNum(-.125, fix.FixFmt(True, 0, 3)), out_fmt=fix.FixFmt(True, 2, 12)),
+            stream.Cast(fix.FixFmt(True, 1, 8), 'SymInf', 'Wrap'))
+
+    def test_blocks(self):
+        """DESCR: Test block processing is identical to one-shot processing."""
+
+        exp_fix = self.make_pipeline().process(self.capture)
+        self.assertEqual(exp_fix.fmt, fix.FixFmt(True, 1, 8))
+
+        chain = self.make_pipeline()
+        blocks = np.array_split(self.capture, [1, 2, 50, 51, 400, 990])
+        out_vec = np.concatenate([x.value for x in chain.run(iter(blocks))])
+        np.testing.assert_array_equal(out_vec, exp_fix.value)
+
+        # reset restores the initial state
+        chain.reset()
+        np.testing.assert_array_equal(chain.process(self.capture).value, exp_fix.value)
+
+    def test_stages(self):
+        """DESCR: Test stage validation."""
+
+        with self.assertRaises(ValueError):
+            stream.Pipeline(stream.Cast(fix.FixFmt(True, 1, 8)), 'not a stage')
+        with self.assertRaises(ValueError):
+            stream.Add(fix.FixNum([1, 2], fix.FixFmt(True, 2, 0)))
+        with self.assertRaises(TypeError):
+            stream.Stage()      # pylint: disable=abstract-class-instantiated
+
+        np.testing.assert_array_equal(
+            stream.Sub(fix.FixScalar(1, fix.FixFmt(False, 1, 0))).process(fix.FixNum(self.capture, fix.FixFmt(True, 1, 4))).value,
+            fix.FixNum(self.capture, fix.FixFmt(True, 1, 4)).sub(fix.FixNum(1, fix.FixFmt(False, 1, 0))).value)
+
+
+if __name__ == '__main__':
+    utst.main()